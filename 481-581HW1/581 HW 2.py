@@ -1,66 +1,47 @@
-import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+
+from hw581.parts import harmonic_grid, harmonic_modes
 
 # Konstanta dan pengaturan
 L = 4
 K = 1
-xspan = np.linspace(-L, L, 81)
+xspan = harmonic_grid(L)
 epsilon_n = 0
 d_epsilon = 0.2
-tol = 1e-6
 n_max = 5
 
-# Define Quantum Harmonik Oscilator
-def harmonic_shoot(y, x, epsilon):
-    return [y[1], (K * x**2 - epsilon) * y[0]]
-
-eigenfunction = []
-eigenvalue = []
-
-for n in range(n_max):
-    epsilon_guess = epsilon_n
-    d_epsilon = 0.2
-    for _ in range(1000):
-        phi0 = [1, np.sqrt(L**2 - epsilon_guess)]
-        y = odeint(harmonic_shoot, phi0, xspan, args=(epsilon_guess,))
+# Quantum Harmonik Oscilator: hw581.shooting.harmonic_shoot.  Each mode is
+# bracketed by stepping d_epsilon up from the previous one and refined with
+# Brent's method (hw581.parts.harmonic_modes).
 
-        phi_guess = y[-1, 1] + np.sqrt(L**2 - epsilon_guess) * y[-1, 0]
-        if abs(phi_guess) < tol:
-            print(f"eigenvalues for n {n}: {epsilon_guess}")
-            eigenvalue.append(epsilon_guess)
-            break
+# True shoots all modes together (hw581.shooting.harmonic_eigenvalues): one
+# batched RK4 pass over an epsilon grid brackets every mode, then all
+# brackets are refined at once
+batch_shooting = False
 
-        if (-1) ** (n) * phi_guess > 0:
-            epsilon_guess += d_epsilon
-        else:
-            epsilon_guess -= d_epsilon / 2
-            d_epsilon /= 2
 
-    norm = np.trapezoid(y[:, 0] ** 2, xspan)
-    normalized_eigenfunction = abs(y[:, 0]) / np.sqrt(norm)
-    epsilon_n = epsilon_guess + 0.1
-    eigenfunction.append(normalized_eigenfunction)
+def main():
+    answers = harmonic_modes(n_max, L, K, epsilon_n, d_epsilon, batch_shooting)
+    A1 = answers['A1']
+    A2 = answers['A2']
 
-eigenfunctions = np.column_stack(eigenfunction)
-eigenvalues = np.array(eigenvalue)
+    print("Eigenfunctions (Fungsi Eigen):")
+    print(A1)
+    print("Eigenvalues (Nilai Eigen):")
+    print(A2)
+    print(A1 [1,2])
 
-A1 = eigenfunctions
-A2 = eigenvalues
+    plt.figure(figsize=(10, 6))
+    for i in range(n_max):
+        plt.plot(xspan, A1[:,i], label=f'phi_{i+1}')
 
-print("Eigenfunctions (Fungsi Eigen):")
-print(A1)
-print("Eigenvalues (Nilai Eigen):")
-print(A2)
-print(A1 [1,2])
+    plt.legend()
+    plt.title('Fungsi Eigen Osilator Harmonik Kuantum')
+    plt.xlabel('x')
+    plt.ylabel('phi_n(x)')
+    plt.grid(True)
+    plt.show()
 
-plt.figure(figsize=(10, 6))
-for i in range(n_max):
-    plt.plot(xspan, eigenfunctions[:,i], label=f'phi_{i+1}')
 
-plt.legend()
-plt.title('Fungsi Eigen Osilator Harmonik Kuantum')
-plt.xlabel('x')
-plt.ylabel('phi_n(x)')
-plt.grid(True)
-plt.show()
+if __name__ == '__main__':
+    main()
@@ -1,328 +1,193 @@
-#=================================== PART A =====================================
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import odeint
 
-L = 4  
-K = 1
-xspan = np.linspace(-L, L, 81)
-epsilon_n = 0
-d_epsilon = 0.2
-tol = 1e-6
-n_max = 5
+from hw581.cache import ResultCache
+from hw581.parts import (convergence_slopes, harmonic_grid, harmonic_modes, hermite_errors,
+                         hw3_finite_difference, hw3_nonlinear, hw3_step_sizes)
 
-def harmonic_shoot(y, x, epsilon):
-    return [y[1], (K * x**2 - epsilon) * y[0]]
+# True shoots all modes together in part A (hw581.shooting.harmonic_eigenvalues):
+# one batched RK4 pass over an epsilon grid brackets every mode, then all
+# brackets are refined at once
+batch_shooting = False
 
-eigenfunction = []
-eigenvalue = []
+# Solves are stored in the result cache (hw581.cache.ResultCache, under
+# $XDG_CACHE_HOME/hw581 or $HW581_CACHE_DIR) keyed by their inputs, so
+# re-running the script for plots and part E reloads them
+use_result_cache = True
 
-for n in range(n_max):
-    epsilon_guess = epsilon_n
-    d_epsilon = 0.2
-    for _ in range(1000):
-        phi0 = [1, np.sqrt(L**2 - epsilon_guess)]
-        y = odeint(harmonic_shoot, phi0, xspan, args=(epsilon_guess,)) 
-
-        phi_guess = y[-1, 1] + np.sqrt(L**2 - epsilon_guess) * y[-1, 0]
-        if abs(phi_guess) < tol:
-            eigenvalue.append(epsilon_guess)
-            break
-
-        if (-1) ** (n) * phi_guess > 0:
-            epsilon_guess += d_epsilon
-        else:
-            epsilon_guess -= d_epsilon / 2
-            d_epsilon /= 2
-
-    norm = np.trapezoid(y[:, 0] ** 2, xspan) 
-    normalized_eigenfunction = abs(y[:, 0]) / np.sqrt(norm)
-    epsilon_n = epsilon_guess + 0.1
-    eigenfunction.append(normalized_eigenfunction)
-
-eigenfunctions = np.column_stack(eigenfunction)
-eigenvalues = np.array(eigenvalue)
-
-A1 = eigenfunctions
-A2 = eigenvalues
-
-print("Eigenfunctions A1:")
-print(A1,"\n")
-print("Eigenvalues A2:")
-print(A2,"\n")
-
-
-#Plotting
-plt.figure(figsize=(10, 6))
-for i in range(n_max):
-    plt.plot(xspan, eigenfunctions[:,i], label=f'phi_{i+1}')  # Plot setiap fungsi eigen
-
-plt.legend()
-plt.title('Fungsi Eigen Osilator Harmonik Kuantum')
-plt.xlabel('x')
-plt.ylabel('phi_n(x)')
-plt.grid(True)
-plt.show()
-
-
-
-#=================================== PART B =====================================
-import numpy as np
-from scipy.sparse.linalg import eigs
-import matplotlib.pyplot as plt
-
-L = 4
-x = np.arange(-L, L + 0.1, 0.1)
-n = len(x)
-dx = x[1] - x[0]
-
-H = np.zeros((n - 2, n - 2))
 
-for j in range(n - 2):
-    H[j, j] = -2 - (dx**2) * x[j + 1]**2
-    if j < n - 3:
-        H[j + 1, j] = 1
-        H[j, j + 1] = 1
+def main():
+    results = ResultCache(enabled=use_result_cache)
 
-H[0, 0] = H[0, 0] + 4 / 3
-H[0, 1] = H[0, 1] - 1 / 3
-H[-1, -1] = H [-1, -1] + 4 / 3
-H[-1, -2] = H[-1, -2] - 1 / 3
+    #=================================== PART A =====================================
 
-eigvals, eigvecs = eigs(-H, k=5, which='SM')
-
-vals2 = np.vstack([4/3 * eigvecs[0,:] - 1/3 * eigvecs[1, :], eigvecs, 4/3 * eigvecs[-1, :] - 1/3 * eigvecs[-2, :]])
-
-eigenvecs = np.zeros((n, 5))
-eigenvals = np.zeros(5)
-
-for j in range (5):
-    norm = np.sqrt(np.trapezoid(vals2[:, j]**2, x))
-    eigenvecs[:, j] = np.abs(vals2[:, j] / norm)
-
-eigenvals = np.sort(eigvals[:5] / dx**2)
-
-A3 = eigenvecs
-A4 = eigenvals
-
-print("Eigenfunctions A3:")
-print(A3,"\n")
-print("Eigenvalues A4:")
-print(A4,"\n")
-
-# Plot eigenfunctions
-plt.figure(figsize=(10, 6))
-for j in range(5):
-    plt.plot(x, A3[:, j], label=f'Eigenfunction {j+1}')
-plt.xlabel('Position x')
-plt.ylabel('Amplitude')
-plt.title('Eigenfunctions')
-plt.legend()
-plt.grid(True)
-plt.show()
-
-
-
-#=================================== PART C =====================================
-import numpy as np
-from scipy.integrate import solve_ivp
-import matplotlib.pyplot as plt
+    L = 4
+    K = 1
+    xspan = harmonic_grid(L)
+    epsilon_n = 0
+    d_epsilon = 0.2
+    n_max = 5
+
+    # Each mode is bracketed by stepping d_epsilon up from the previous one
+    # and refined with Brent's method; every shot is kept, so no epsilon is
+    # integrated twice
+    answers = harmonic_modes(n_max, L, K, epsilon_n, d_epsilon, batch_shooting, cache=results)
+    A1 = answers['A1']
+    A2 = answers['A2']
+
+    print("Eigenfunctions A1:")
+    print(A1,"\n")
+    print("Eigenvalues A2:")
+    print(A2,"\n")
+
+
+    #Plotting
+    plt.figure(figsize=(10, 6))
+    for i in range(n_max):
+        plt.plot(xspan, A1[:,i], label=f'phi_{i+1}')  # Plot setiap fungsi eigen
+
+    plt.legend()
+    plt.title('Fungsi Eigen Osilator Harmonik Kuantum')
+    plt.xlabel('x')
+    plt.ylabel('phi_n(x)')
+    plt.grid(True)
+    plt.show()
 
 
-def hw3_rhs_c(x, y, epsilon, gamma):
-    return[y[1], (gamma * y[0]**2 + x**2 - epsilon) * y[0]]
-
-L = 2
-x = np.arange(-L, L + 0.1, 0.1)
-n = len(x)
-tol = 1e-4
-eigenvals_pos, eigenvals_neg = np.zeros(2), np.zeros(2)
-eigenvecs_pos, eigenvecs_neg = np.zeros((n, 2)), np.zeros((n, 2))
-
-for gamma in [0.05, -0.05]:
-    epsilon0, A = 0.1, 1e-6
-    for jmodes in range(2):
-        dA = 0.01
-        for jj in range(100):
-            epsilon, d_epsilon = epsilon0, 0.2
-            for j in range(100):
-                y0 = [A, np.sqrt(L**2 - epsilon) * A]
-                sol = solve_ivp(lambda x, y: hw3_rhs_c(x, y, epsilon, gamma), [x[0], x[-1]], y0, t_eval=x)
-                y_sol = sol.y.T
-                x_sol = sol.t
-
-                bc = y_sol[-1, 1] + np.sqrt(L**2 - epsilon) * y_sol[-1, 0]
-                if abs(bc) < tol:
-                    break
-                
-                if (-1)**(jmodes) * bc > 0:
-                    epsilon += d_epsilon
-                else:
-                    epsilon -= d_epsilon
-                    d_epsilon /= 2
-
-            area = np.trapezoid(y_sol[:, 0]**2, x_sol)
-            if abs(area - 1) < tol:
-                break
-            if area < 1:
-                A += dA
-            else:
-                A -= dA
-                dA /= 2
-            
-        epsilon0=epsilon+0.2
-        if gamma > 0:
-            eigenvals_pos[jmodes] = epsilon
-            eigenvecs_pos[:, jmodes] = np.abs(y_sol[:, 0])
-        else:
-            eigenvals_neg[jmodes] = epsilon
-            eigenvecs_neg[:, jmodes] = np.abs(y_sol[:, 0])
-
-A5 = eigenvecs_pos
-A6 = eigenvals_pos
-A7 = eigenvecs_neg
-A8 = eigenvals_neg
-
-print("A5 Eigenvalues for gamma = 0.05:\n", A5, "\n")
-print("A6 Eigenfunctions for gamma = 0.05:\n", A6, "\n")
-print("A7 Eigenvalues for gamma = -0.05:\n", A7, "\n")
-print("A8 Eigenfunctions for gamma = -0.05:\n", A8)
-
-# Plotting
-plt.figure(figsize=(12, 8))
-
-# Plot for gamma = 0.05
-plt.subplot(2, 1, 1)
-plt.plot(x, A5[:, 0], label=f'Mode 1, epsilon = {A6[0]:.4f}', linestyle='-', marker='o')
-plt.plot(x, A5[:, 1], label=f'Mode 2, epsilon = {A6[1]:.4f}', linestyle='--', marker='s')
-plt.title("Eigenfunctions for gamma = 0.05")
-plt.xlabel("x")
-plt.ylabel("Eigenfunction")
-plt.legend()
-
-# Plot for gamma = -0.05
-plt.subplot(2, 1, 2)
-plt.plot(x, A7[:, 0], label=f'Mode 1, epsilon = {A8[0]:.4f}', linestyle='-', marker='o')
-plt.plot(x, A7[:, 1], label=f'Mode 2, epsilon = {A8[1]:.4f}', linestyle='--', marker='s')
-plt.title("Eigenfunctions for gamma = -0.05")
-plt.xlabel("x")
-plt.ylabel("Eigenfunction")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
-
-
-
-#=================================== PART D =====================================
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
 
-def hw1_rhs_a(x, y, E):
-    return [y[1], (K * x**2 - E) * y[0]]
+    #=================================== PART B =====================================
+
+    L = 4
+    x = np.arange(-L, L + 0.1, 0.1)
+
+    # -H is tridiagonal apart from the 4/3, -1/3 boundary rows; a diagonal
+    # similarity makes it symmetric, so only its two diagonals are built and
+    # the five lowest modes come from a symmetric tridiagonal solver
+    answers = hw3_finite_difference(5, L, 0.1, cache=results)
+    A3 = answers['A3']
+    A4 = answers['A4']
+
+    print("Eigenfunctions A3:")
+    print(A3,"\n")
+    print("Eigenvalues A4:")
+    print(A4,"\n")
 
-# Parameters
-K = 1
-E = 1
-L = 2
-x_span = [-L, L]
-y0 = [1, np.sqrt(K * L**2 - 1)] 
+    # Plot eigenfunctions
+    plt.figure(figsize=(10, 6))
+    for j in range(5):
+        plt.plot(x, A3[:, j], label=f'Eigenfunction {j+1}')
+    plt.xlabel('Position x')
+    plt.ylabel('Amplitude')
+    plt.title('Eigenfunctions')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
 
-tolerances = [1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10]
-methods = ['RK45', 'RK23', 'Radau', 'BDF']
 
-average_step_sizes = {method: [] for method in methods}
-local_errors = {method: [] for method in methods}
 
-for method in methods:
-    for tol in tolerances:
-        option = {'rtol': tol, 'atol': tol}
-        sol = solve_ivp(hw1_rhs_a, x_span, y0, method=method, args=(E,), **option)
-        
-        step_sizes = np.diff(sol.t)
-        avg_step_size = np.mean(step_sizes)
-        average_step_sizes[method].append(avg_step_size)
+    #=================================== PART C =====================================
+
+    L = 2
+    x = np.arange(-L, L + 0.1, 0.1)
+    tol = 1e-4
 
-        errors = np.diff(sol.y[0])
-        local_error = np.mean(np.abs(errors))
-        local_errors[method].append(local_error)
+    # Newton on (epsilon, A) with the sensitivity equations integrated
+    # alongside, a few solve_ivp calls per mode (nonlinear_modes is the nested
+    # search).  Each gamma is independent; hw581.sweep runs them on a pool:
+    #   python -m hw581.sweep modes --gamma 0.05 -0.05 --solver newton
+    answers = hw3_nonlinear(0.05, L, tol, cache=results)
+    A5 = answers['A5']
+    A6 = answers['A6']
+    A7 = answers['A7']
+    A8 = answers['A8']
 
-Slope = []
-for method in methods:
-    slope, _ = np.polyfit(np.log(average_step_sizes[method]), np.log(tolerances), 1)
-    Slope.append(float(slope))
+    print("A5 Eigenvalues for gamma = 0.05:\n", A5, "\n")
+    print("A6 Eigenfunctions for gamma = 0.05:\n", A6, "\n")
+    print("A7 Eigenvalues for gamma = -0.05:\n", A7, "\n")
+    print("A8 Eigenfunctions for gamma = -0.05:\n", A8)
 
-A9 = Slope
+    # Plotting
+    plt.figure(figsize=(12, 8))
 
-print("A9:\n", A9)
+    # Plot for gamma = 0.05
+    plt.subplot(2, 1, 1)
+    plt.plot(x, A5[:, 0], label=f'Mode 1, epsilon = {A6[0]:.4f}', linestyle='-', marker='o')
+    plt.plot(x, A5[:, 1], label=f'Mode 2, epsilon = {A6[1]:.4f}', linestyle='--', marker='s')
+    plt.title("Eigenfunctions for gamma = 0.05")
+    plt.xlabel("x")
+    plt.ylabel("Eigenfunction")
+    plt.legend()
 
-# Plotting on a log-log scale
-plt.figure(figsize=(10, 6))
-for method in methods:
-    plt.loglog(average_step_sizes[method], tolerances, label=method, marker='o')
+    # Plot for gamma = -0.05
+    plt.subplot(2, 1, 2)
+    plt.plot(x, A7[:, 0], label=f'Mode 1, epsilon = {A8[0]:.4f}', linestyle='-', marker='o')
+    plt.plot(x, A7[:, 1], label=f'Mode 2, epsilon = {A8[1]:.4f}', linestyle='--', marker='s')
+    plt.title("Eigenfunctions for gamma = -0.05")
+    plt.xlabel("x")
+    plt.ylabel("Eigenfunction")
+    plt.legend()
 
-plt.ylabel("Tolerance")
-plt.xlabel("Average Step Size")
-plt.legend()
-plt.title("Convergence Study of Different Methods")
-plt.grid(True)
-plt.show()
+    plt.tight_layout()
+    plt.show()
 
 
 
-#===================================PART E ===========================================
+    #=================================== PART D =====================================
 
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import hermite
+    # Parameters
+    K = 1
+    E = 1
+    L = 2
 
+    tolerances = [1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10]
+    methods = ['RK45', 'RK23', 'Radau', 'BDF']
 
-L = 4
-x = np.arange(-L, L + 0.1, 0.1)
+    # Every (method, tol) run is stored in results (so use_result_cache applies)
+    # with nfev/njev/nlu, timing and the error against a tight reference, so
+    # only new cells are integrated.
+    # On a process pool: python -m hw581.convergence --workers 4
+    average_step_sizes = hw3_step_sizes(methods, tolerances, E, K, L, cache=results, log=print)
 
-def factorial(n):
-    result = 1
-    for i in range(1, n + 1):
-        result *= i
-    return result
+    A9 = convergence_slopes(average_step_sizes, tolerances)
 
-hermite = np.array([np.ones_like(x),
-    2 * x,
-    4 * x**2 - 2,
-    8 * x**3 - 12 * x,
-    16 * x**4 - 48 * x**2 + 12])
+    print("A9:\n", A9)
 
+    # Plotting on a log-log scale
+    plt.figure(figsize=(10, 6))
+    for method in methods:
+        plt.loglog(average_step_sizes[method], tolerances, label=method, marker='o')
+
+    plt.ylabel("Tolerance")
+    plt.xlabel("Average Step Size")
+    plt.legend()
+    plt.title("Convergence Study of Different Methods")
+    plt.grid(True)
+    plt.show()
 
-phi = np.zeros((len(x), 5))
-for j in range(5):
-    phi[:, j] = np.exp(-x**2 / 2) * hermite[j, :] / (np.sqrt(factorial(j) * 2**j * np.sqrt(np.pi)))
 
-ErrorA1 = np.zeros(5)
-ErrorA2 = np.zeros(5)
-ErrorA3 = np.zeros(5)
-ErrorA4 = np.zeros(5)
 
-#print (A1)
-print (A2)
-#print (A3)
-print (A4)
+    #===================================PART E ===========================================
+
+    #print (A1)
+    print (A2)
+    #print (A3)
+    print (A4)
 
-for j in range(5):
-    ErrorA1[j] = np.trapezoid((np.abs(A1[:, j]) - np.abs(phi[:, j]))**2, x)
-    ErrorA2[j] = 100 * abs(A2[j] - (2 * (j+1) - 1)) / (2 * (j+1) - 1)
-    ErrorA3[j] = np.trapezoid((np.abs(A3[:, j]) - np.abs(phi[:, j]))**2, x)
-    ErrorA4[j] = 100 * abs(A4[j] - (2 * (j+1) - 1)) / (2 * (j+1) - 1)
+    # Errors against the Hermite functions phi_n, in percent for the eigenvalues
+    answers = hermite_errors(A1, A2, A3, A4, L=4)
 
-# Menyimpan error hasil perhitungan
-A10 = ErrorA1
-A11 = ErrorA2
-A12 = ErrorA3
-A13 = ErrorA4
+    # Menyimpan error hasil perhitungan
+    A10 = answers['A10']
+    A11 = answers['A11']
+    A12 = answers['A12']
+    A13 = answers['A13']
+
+    # Menampilkan hasil
+    print("A10 :\n", A10)
+    print("A11 :\n", A11)
+    print("A12 :\n", A12)
+    print("A13 :\n", A13)
 
-# Menampilkan hasil
-print("A10 :\n", A10)
-print("A11 :\n", A11)
-print("A12 :\n", A12)
-print("A13 :\n", A13)
 
+if __name__ == '__main__':
+    main()
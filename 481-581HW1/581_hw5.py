@@ -1,316 +1,215 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import time
 import imageio.v2 as imageio
-from scipy.fftpack import fft, fft2, ifft2
-from scipy.integrate import solve_ivp
-from scipy.linalg import solve, solve_triangular, lu
-from scipy.sparse.linalg import bicgstab, gmres
-from scipy.sparse import spdiags
+from hw581.cache import ResultCache
+from hw581.parts import hw5_run, hw5_setup
 
 #============================PART A=========================================
 
-#+++++++++++++++ 1. Parameters
-tspan = np.arange(0, 4.5, 0.5)
-nu = 0.001
-Lx, Ly = 20, 20
+#+++++++++++++++ 1. Parameters, domain, initial condition and spectral k values
+# tspan = 0:0.5:4, nu = 0.001, a 64 x 64 grid on [-10, 10]^2, the Gaussian
+# w1 = exp(-X^2 - Y^2 / 20) and K = KX^2 + KY^2 with kx[0] = ky[0] = 1e-6
+# (hw581.parts.hw5_setup)
 nx, ny = 64, 64
-N = nx * ny
-
-#+++++++++++++++  2. Define spatial domain and initial conditions
-x2 = np.linspace(-Lx/2, Lx/2, nx + 1)
-x = x2[:nx]
-y2 = np.linspace(-Ly/2, Ly/2, ny + 1)
-y = y2[:ny]
-X, Y = np.meshgrid(x, y)
-
-w1 = (np.exp(-X**2 - (Y**2 / 20))).flatten()
-# w2 = -1 * (np.exp((-(X-0)**2 - ((Y+3)**2) / 20))).flatten()
-# w = w1+w2
-
-#+++++++++++++++  3. Define spectral k values
-kx = (2 * np.pi / Lx) * np.concatenate((np.arange(0, nx/2), np.arange(-nx/2, 0)))
-kx[0] = 1e-6
-ky = (2 * np.pi / Ly) * np.concatenate((np.arange(0, ny/2), np.arange(-ny/2, 0)))
-ky[0] = 1e-6
-KX, KY = np.meshgrid(kx, ky)
-K = KX**2 + KY**2
-
-#+++++++++++++++  4. Return Code from HW 4
-# Parameters
-m = 64
-L = 20
-dx = L / m
-n = m * m
-
-e0 = np.zeros(n)
-e1 = np.ones(n)
-e2 = np.copy(e1)
-e4 = np.copy(e0)
-
-for j in range(1, m+1):
-    e2[m*j - 1] = 0 
-    e4[m*j - 1] = 1
-
-# Adjusted vectors for diagonals
-e3 = np.zeros_like(e2)
-e3[1:n] = e2[0:n-1]
-e3[0] = e2[n-1]
-
-e5 = np.zeros_like(e4)
-e5[1:n] = e4[0:n-1]
-e5[0] = e4[n-1]
-
-# Construct Matrix a (Laplacian)
-diagonals_A = [e1, e1, e5, e2, -4 * e1, e3, e4, e1, e1]
-offsets_A = [-(n - m), -m, -m + 1, -1, 0, 1, m - 1, m, (n - m)]
-A = (spdiags(diagonals_A, offsets_A, n, n) / (dx**2)).toarray()
-
-# Construct Matrix C (Partial derivative with respect to y)
-diagonals_B = [e1, -e1, e1, -e1]
-offsets_B = [-(n - m),-m, m, (n - m)]
-B = (spdiags(diagonals_B, offsets_B, n, n) / (2 * dx)).toarray()
-
-# Construct Matrix b (Partial derivative with respect to x)
-diagonals_C = [e5, -e2, e3, -e4]
-offsets_C = [-m + 1, -1, 1, m - 1]
-C = (spdiags(diagonals_C, offsets_C, n, n) / (2 * dx)).toarray()
-
-A[0, 0] = 2
-
-#============================================================================================
-
-# Fast Fourier Transform (FFT)
-
-def spc_rhs(t, w, nx, ny, K, nu):
-    wtc = w.reshape((nx, ny))
-    wt = fft2(wtc)
-    psit = -wt / K
-    psi = np.real(ifft2(psit))
-    psi = psi.flatten()
-    rhs = nu * np.dot(A, w) - np.dot(B, psi) * np.dot(C, w) + np.dot(C, psi) * np.dot(B, w)
-    return rhs
-
-# Solution
-start_time = time.time()
-wtsol = solve_ivp(spc_rhs, (0, 4), w1, t_eval=tspan, method = 'RK45', args = (nx, ny, K, nu))
-A1 = wtsol.y
-end_time = time.time()
-
-fft_time = end_time - start_time
-
-print(A1)
-print(fft_time)
-
-# Plot the solution at each time step
-for j, t in enumerate(tspan):
-    wtc = A1[:, j].reshape((ny, nx)) 
-    wtc2 = A1[:, j].reshape((ny, nx)) 
-    plt.subplot(3, 3, j + 1)
-    plt.pcolor(x, y, wtc+wtc2, shading='auto', cmap='gnuplot')
-    # plt.pcolor(x, y, wtc2, shading='auto', cmap='gnuplot')
-    plt.title(f'Time: {t}')
-    plt.colorbar()
-
-plt.tight_layout()
-plt.show()
-
-#================================================================================
-
-# Direct Solver
-
-w_ds = (np.exp(-X**2 - (Y**2)/20)).flatten()
-
-def spc_rhs2(t, w_ds, nu, A, B, C):
-    psi = solve(A, w_ds)
-    rhs2 = nu * np.dot(A, w_ds) - np.dot(B, psi) * np.dot(C, w_ds) + np.dot(C, psi) * np.dot(B, w_ds)
-    return rhs2
-
-start_time = time.time()
-wtsol_ds = solve_ivp(spc_rhs2, (0, 4), w_ds, t_eval=tspan, method = 'RK45', args = (nu, A, B, C))
-A2 = wtsol_ds.y
-end_time = time.time()
-
-Ab_time = end_time - start_time
-
-print(A2)
-print(Ab_time)
-
-for j, t in enumerate(tspan):
-    w_ds = A2[:, j].reshape((ny, nx)) 
-    plt.subplot(3, 3, j + 1)
-    plt.pcolor(x, y, w_ds, shading='auto', cmap='gnuplot')
-    plt.title(f'Time: {t}')
-    plt.colorbar()
-
-plt.tight_layout()
-plt.show()
-
-# #================================================================================
-
-# LU Solver
-
-w_lu = (np.exp(-X**2 - (Y**2)/20)).flatten()
-
-P, L, U = lu(A)
-
-def spc_rhs_lu(t, w_lu, nu, A, B, C, P, L):
-    Pw = np.dot(P, w_lu)
-    foo = solve_triangular(L, Pw, lower=True)
-    psi = solve_triangular(U, foo)
-    rhs_lu = nu * np.dot(A, w_lu) - np.dot(B, psi) * np.dot(C, w_lu) + np.dot(C, psi) * np.dot(B, w_lu)
-    return rhs_lu
-
-start_time = time.time()
-wtsol_lu = solve_ivp(spc_rhs_lu, (0, 4), w_lu, t_eval=tspan, method = 'RK45', args = (nu, A, B, C, P, L))
-A3 = wtsol_lu.y
-end_time = time.time()
-
-LU_time = end_time - start_time
-
-print(A3)
-print(LU_time)
-
-for j, t in enumerate(tspan):
-    w_lu = A3[:, j].reshape((ny, nx)) 
-    plt.subplot(3, 3, j + 1)
-    plt.pcolor(x, y, w_lu, shading='auto', cmap='gnuplot')
-    plt.title(f'Time: {t}')
-    plt.colorbar()
-
-plt.tight_layout()
-plt.show()
-
-
-#============================================================================
-
-# BiCGSTAB Solver
-
-w_bicgstab = (np.exp(-X**2 - (Y**2)/20)).flatten()
-
-residuals_bic = []
-def bic_callback(residual_norm):
-    residuals_bic.append(residual_norm)
-
-def spc_rhs_bicgstab(t, w_bicgstab, nu, A, B, C):
-    psi, _ = bicgstab(A, w_bicgstab, rtol=1e-4, callback = bic_callback)
-    return nu * np.dot(A, w_bicgstab) - np.dot(B, psi) * np.dot(C, w_bicgstab) + np.dot(C, psi) * np.dot(B, w_bicgstab)
-
-start_time = time.time()
-wtsol_bicgstab = solve_ivp(spc_rhs_bicgstab, (0, 4), w_bicgstab, t_eval=tspan, method='RK45', args=(nu, A, B, C))
-A4 = wtsol_bicgstab.y
-end_time = time.time()
-
-bicgstab_t = end_time - start_time
-
-print(A4)
-print("Time to run BiCGSTAB : ", bicgstab_t)
-
-# +++++++++++++++ Plot the solution at each time step
-for j, t in enumerate(tspan):
-    wtc = A4[:, j].reshape((ny, nx))
-    wtc = np.nan_to_num(wtc, nan=0.0, posinf=np.max(wtc[np.isfinite(wtc)]), neginf=np.min(wtc[np.isfinite(wtc)]))
-    plt.subplot(3, 3, j + 1)
-    levels = np.linspace(np.min(wtc), np.max(wtc), 200)  # Pastikan level sesuai dengan data
-    plt.contourf(x, y, wtc, levels=levels, cmap='gist_earth')
-    plt.title(f'Time: {t:.2f}')
-    plt.colorbar()
-
-# Tata letak plot
-plt.tight_layout()
-plt.show()
-
-#===========================================================================
-
-# GMRES Solver
-w_gmres = (np.exp(-X**2 - (Y**2)/20)).flatten()
-
-residuals_gm = []
-def gm_callback(residual_norm):
-    residuals_gm.append(residual_norm)
-
-def spc_rhs_gmres(t, w_gmres, nu, A, B, C):
-    psi, _ = gmres(A, w_gmres, rtol=1e-6, callback = gm_callback)
-    return nu * np.dot(A, w_gmres) - np.dot(B, psi) * np.dot(C, w_gmres) + np.dot(C, psi) * np.dot(B, w_gmres)
-
-start_time = time.time()
-wtsol_gmres = solve_ivp(spc_rhs_gmres, (0, 4), w_gmres, t_eval=tspan, method='RK45', args=(nu, A, B, C))
-A5 = wtsol_gmres.y
-end_time = time.time()
-
-gmres_t = end_time - start_time
-
-print(A5)
-print("Time to run GMRES : ", gmres_t)
-
-# +++++++++++++++ Plot the solution at each time step
-for j, t in enumerate(tspan):
-    wtc = A5[:, j].reshape((ny, nx))
-    wtc = np.nan_to_num(wtc, nan=0.0, posinf=np.max(wtc[np.isfinite(wtc)]), neginf=np.min(wtc[np.isfinite(wtc)]))
-    plt.subplot(3, 3, j + 1)
-    levels = np.linspace(np.min(wtc), np.max(wtc), 200)  # Pastikan level sesuai dengan data
-    plt.contourf(x, y, wtc, levels=levels, cmap='cubehelix')
-    plt.title(f'Time: {t:.2f}')
-    plt.colorbar()
-
-# Tata letak plot
-plt.tight_layout()
-plt.show()
-
-#====================================================================================
-
-#times = [fft_time, Ab_time, LU_time, bicgstab_t, gmres_t]
-print("FFT solve time:", fft_time)
-print("A/b solve time:", Ab_time)
-print("LU solve time:", LU_time)
-print("BICGSTAB solve time:", bicgstab_t)
-print("GMRES solve time:", gmres_t)
-print("BICGSTAB iteration count:", len(residuals_bic))
-print("GMRES iteration count:", len(residuals_gm))
-
-
-
-
-
-
-
-
-
-
-
-
-
+Lx, Ly = 20, 20
+nu = 0.001
 
+#+++++++++++++++  2. Return Code from HW 4
+# A (Laplacian, with A[0, 0] = 2), B (d/dy) and C (d/dx) stay sparse, so every
+# product below is O(n).  'stencil' applies the same operators matrix-free.
+operator_mode = 'csr'
 
+# Every solve below is stored in the result cache (hw581.cache.ResultCache,
+# under $XDG_CACHE_HOME/hw581 or $HW581_CACHE_DIR) keyed by the solver, its
+# options, the grid and the initial condition, so re-running for plots
+# reloads them.  Each solve is timed inside the cached computation and the
+# time is stored with it, so the printed times are always those of the
+# solve, never of loading it back.
+use_result_cache = True
+
+# Set to a directory to stream each FFT snapshot to disk (hw581.trajectory);
+# .y is then a memory-mapped view instead of an in-memory array.
+trajectory_dir = None
+# The kernel computes spc_rhs in preallocated buffers (hw581.kernels), with
+# the A, B, C stencils applied in place; False integrates spc_rhs itself.
+use_rhs_kernel = True
+# 'BDF' or 'Radau' for stiff runs (large nu): FDVorticity gives them a sparse
+# Jacobian with psi frozen, so each Newton matrix is a sparse LU.
+fft_method = 'RK45'
 
+# FFT-preconditioned BiCGSTAB and GMRES, warm-started from the psi of the
+# previous RHS call.  Other preconditioners: 'ilu', 'jacobi' or None.
+bic_options = dict(preconditioner='fft', rtol=1e-4)
+gm_options = dict(preconditioner='fft', rtol=1e-6)
 
 
+def main():
+    setup = hw5_setup(nx, ny, Lx, Ly, nu)
+    tspan, x, y = setup['tspan'], setup['x'], setup['y']
+    results = ResultCache(enabled=use_result_cache)
+    run_options = dict(setup=setup, operator_mode=operator_mode, cache=results)
 
+    #============================================================================================
 
+    # Fast Fourier Transform (FFT)
 
+    # spc_rhs (hw581.vorticity): FFT streamfunction, HW 4 finite differences
+    run_fft = hw5_run('fft', method=fft_method, use_rhs_kernel=use_rhs_kernel,
+                      trajectory_dir=trajectory_dir, **run_options)
+    A1 = run_fft['y']
+    fft_time = run_fft['solve_time']
 
+    print(A1)
+    print(fft_time)
 
+    # Plot the solution at each time step
+    for j, t in enumerate(tspan):
+        wtc = A1[:, j].reshape((ny, nx))
+        wtc2 = A1[:, j].reshape((ny, nx))
+        plt.subplot(3, 3, j + 1)
+        plt.pcolor(x, y, wtc+wtc2, shading='auto', cmap='gnuplot')
+        # plt.pcolor(x, y, wtc2, shading='auto', cmap='gnuplot')
+        plt.title(f'Time: {t}')
+        plt.colorbar()
 
+    plt.tight_layout()
+    plt.show()
 
+    #================================================================================
+
+    # Pseudo-spectral Solver (every derivative taken with rfft2/irfft2)
 
+    run_sp = hw5_run('spectral', **run_options)
+    A_sp = run_sp['y']
+    spectral_time = run_sp['solve_time']
 
+    print(A_sp)
+    print(spectral_time)
 
+    #================================================================================
 
+    # Direct Solver
 
+    # Sparse LU of A, factored on first use and cached per (m, L, pin)
+    run_ds = hw5_run('direct', **run_options)
+    A2 = run_ds['y']
+    Ab_time = run_ds['solve_time']
 
+    print(A2)
+    print(Ab_time)
 
+    for j, t in enumerate(tspan):
+        w_ds = A2[:, j].reshape((ny, nx))
+        plt.subplot(3, 3, j + 1)
+        plt.pcolor(x, y, w_ds, shading='auto', cmap='gnuplot')
+        plt.title(f'Time: {t}')
+        plt.colorbar()
+
+    plt.tight_layout()
+    plt.show()
+
+    # #================================================================================
+
+    # LU Solver
+
+    # Same cached factorization as the direct solver, no refactoring here.
+    # SuperLU applies the row/column permutations and both triangular solves.
+    run_lu = hw5_run('lu', **run_options)
+    A3 = run_lu['y']
+    LU_time = run_lu['solve_time']
+
+    print(A3)
+    print(LU_time)
+
+    for j, t in enumerate(tspan):
+        w_lu = A3[:, j].reshape((ny, nx))
+        plt.subplot(3, 3, j + 1)
+        plt.pcolor(x, y, w_lu, shading='auto', cmap='gnuplot')
+        plt.title(f'Time: {t}')
+        plt.colorbar()
+
+    plt.tight_layout()
+    plt.show()
 
 
+    #============================================================================
 
+    # BiCGSTAB Solver
 
+    run_bic = hw5_run('bicgstab', **bic_options, **run_options)
+    A4 = run_bic['y']
+    bicgstab_t = run_bic['solve_time']
 
+    print(A4)
+    print("Time to run BiCGSTAB : ", bicgstab_t)
 
+    # +++++++++++++++ Plot the solution at each time step
+    for j, t in enumerate(tspan):
+        wtc = A4[:, j].reshape((ny, nx))
+        wtc = np.nan_to_num(wtc, nan=0.0, posinf=np.max(wtc[np.isfinite(wtc)]), neginf=np.min(wtc[np.isfinite(wtc)]))
+        plt.subplot(3, 3, j + 1)
+        levels = np.linspace(np.min(wtc), np.max(wtc), 200)  # Pastikan level sesuai dengan data
+        plt.contourf(x, y, wtc, levels=levels, cmap='gist_earth')
+        plt.title(f'Time: {t:.2f}')
+        plt.colorbar()
 
+    # Tata letak plot
+    plt.tight_layout()
+    plt.show()
 
+    #===========================================================================
 
+    # GMRES Solver
 
+    run_gm = hw5_run('gmres', **gm_options, **run_options)
+    A5 = run_gm['y']
+    gmres_t = run_gm['solve_time']
 
+    print(A5)
+    print("Time to run GMRES : ", gmres_t)
 
+    # +++++++++++++++ Plot the solution at each time step
+    for j, t in enumerate(tspan):
+        wtc = A5[:, j].reshape((ny, nx))
+        wtc = np.nan_to_num(wtc, nan=0.0, posinf=np.max(wtc[np.isfinite(wtc)]), neginf=np.min(wtc[np.isfinite(wtc)]))
+        plt.subplot(3, 3, j + 1)
+        levels = np.linspace(np.min(wtc), np.max(wtc), 200)  # Pastikan level sesuai dengan data
+        plt.contourf(x, y, wtc, levels=levels, cmap='cubehelix')
+        plt.title(f'Time: {t:.2f}')
+        plt.colorbar()
 
+    # Tata letak plot
+    plt.tight_layout()
+    plt.show()
 
+    #===========================================================================
 
+    # Multigrid Solver (V-cycles, red-black Gauss-Seidel, same pinned A)
+    run_mg = hw5_run('multigrid', cycle='V', **run_options)
+    A6 = run_mg['y']
+    mg_time = run_mg['solve_time']
+
+    print(A6)
+    print("Time to run Multigrid : ", mg_time)
+
+    #====================================================================================
+
+    # Single runs at 64^2 only. For repeated runs across grid sizes, with RHS
+    # counts, iterations, memory and error against FFT, use the benchmark:
+    #   python -m hw581.benchmark --sizes 64 128 256 512 1024 --plot bench.png
+    print("FFT solve time:", fft_time)
+    print("Pseudo-spectral solve time:", spectral_time)
+    print("A/b solve time:", Ab_time)
+    print("LU solve time:", LU_time)
+    print("BICGSTAB solve time:", bicgstab_t)
+    print("GMRES solve time:", gmres_t)
+    print("Multigrid solve time:", mg_time)
+    print("BICGSTAB iteration count:", sum(run_bic['iterations']))
+    print("GMRES iteration count:", sum(run_gm['iterations']))
+    print("BICGSTAB iterations per solve:", np.mean(run_bic['iterations']), "max", max(run_bic['iterations']))
+    print("GMRES iterations per solve:", np.mean(run_gm['iterations']), "max", max(run_gm['iterations']))
+    print("Multigrid cycles per solve:", np.mean(run_mg['cycles']), "max", max(run_mg['cycles']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Shared solver code for the 481/581 homework scripts.
+
+Submodules and the names below are imported on first attribute access
+(PEP 562), so ``import hw581`` is free and ``hw581.newton_raphson`` only
+loads :mod:`hw581.rootfind`.  ``python -m hw581`` runs single homework
+parts headless; see :mod:`hw581.parts`.
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'newton_raphson': 'rootfind',
+    'bisection': 'rootfind',
+    'newton_batch': 'rootfind',
+    'bisection_batch': 'rootfind',
+    'harmonic_shoot': 'shooting',
+    'harmonic_eigenvalues': 'shooting',
+    'nonlinear_modes': 'shooting',
+    'nonlinear_modes_newton': 'shooting',
+    'fd_eigenmodes': 'schrodinger',
+    'periodic_fd_matrices': 'operators',
+    'spc_rhs': 'vorticity',
+    'FDVorticity': 'vorticity',
+    'rhs_fourier': 'lambda_omega',
+    'LRS_2D': 'lambda_omega',
+    'LambdaOmegaFourier': 'lambda_omega',
+    'LambdaOmegaChebyshev': 'lambda_omega',
+    'cheb': 'chebyshev',
+    'ResultCache': 'cache',
+    'convergence_study': 'convergence',
+}
+
+_SUBMODULES = {
+    'benchmark', 'cache', 'chebyshev', 'convergence', 'ensemble', 'kernels', 'lambda_omega',
+    'multigrid', 'operators', 'parts', 'poisson', 'render', 'rootfind', 'schrodinger', 'shooting',
+    'spectral', 'sweep', 'trajectory', 'vorticity',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
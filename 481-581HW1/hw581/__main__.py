@@ -0,0 +1,47 @@
+"""``python -m hw581 HOMEWORK PART [PART ...]``: run homework parts headless."""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from hw581.parts import PARTS, run_part
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m hw581',
+                                     description="Compute single homework parts without plotting.")
+    parser.add_argument('homework', nargs='?', help="hw1 ... hw6")
+    parser.add_argument('parts', nargs='*', help="parts to run (default: all parts of the homework)")
+    parser.add_argument('--list', action='store_true', help="list the available parts and exit")
+    parser.add_argument('--out', default=None, help="save every answer to this .npz file")
+    parser.add_argument('--quiet', action='store_true', help="do not print the answers")
+    args = parser.parse_args(argv)
+
+    if args.list or args.homework is None:
+        for (homework, name), (_, description) in PARTS.items():
+            print(f"{homework:4} {name:10} {description}")
+        return 0
+
+    names = args.parts or [name for homework, name in PARTS if homework == args.homework]
+    if not names:
+        parser.error(f"unknown homework {args.homework!r}")
+    answers = {}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            result = run_part(args.homework, name)
+        except KeyError as error:
+            parser.error(error.args[0])
+        print(f"{args.homework} part {name}: {time.perf_counter() - start:.2f} s", file=sys.stderr)
+        answers.update(result)
+        if not args.quiet:
+            for key, value in result.items():
+                print(f"{key}:\n{value}\n")
+    if args.out:
+        np.savez(args.out, **answers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
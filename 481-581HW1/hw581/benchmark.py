@@ -0,0 +1,182 @@
+"""Scaling benchmark for the streamfunction solvers of 581_hw5.py.
+
+Every backend integrates the HW 5 Gaussian vortex with RK45 on each grid
+size, several times, and the results are written as JSON (plus an optional
+log-log scaling plot).  Run from the homework folder, e.g.::
+
+    python -m hw581.benchmark --sizes 64 128 256 --repeat 3 --out bench.json --plot bench.png
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from hw581.poisson import clear_poisson_cache
+from hw581.spectral import SpectralVorticity
+from hw581.vorticity import FDVorticity
+
+BACKENDS = ['fft', 'direct', 'bicgstab', 'gmres', 'multigrid', 'spectral']
+REFERENCE = 'fft'
+# Written to the report: the reference is not the script's spc_rhs, whose
+# K[0, 0] is regularised to 2e-12 instead of dropping the mean of psi
+REFERENCE_DESCRIPTION = ("'fft' backend: FDVorticity finite differences with psi from "
+                         "hw581.poisson.FFTPoisson (zero mode of psi set to zero)")
+
+
+def initial_vorticity(m, L):
+    x = np.linspace(-L / 2, L / 2, m + 1)[:m]
+    X, Y = np.meshgrid(x, x)
+    return np.exp(-X**2 - Y**2 / 20).ravel()
+
+
+def build_rhs(backend, m, L, nu):
+    if backend == 'spectral':
+        return SpectralVorticity(m, m, L, L, nu)
+    return FDVorticity(m, L, nu, psi_solver=backend)
+
+
+def _solver_iterations(rhs):
+    solver = getattr(rhs, 'psi_solver', None)
+    if hasattr(solver, 'iterations'):
+        return int(sum(solver.iterations))
+    if hasattr(solver, 'cycles'):
+        return int(sum(solver.cycles))
+    return None
+
+
+def run_case(backend, m, L=20, nu=0.001, t_end=1.0):
+    """Set up and integrate one backend once; return timings, counts and the final field."""
+    # Start every case cold so the direct solver pays for its factorization
+    clear_poisson_cache()
+    start = time.perf_counter()
+    rhs = build_rhs(backend, m, L, nu)
+    setup_time = time.perf_counter() - start
+
+    w0 = initial_vorticity(m, L)
+    start = time.perf_counter()
+    sol = solve_ivp(rhs, (0, t_end), w0, t_eval=[t_end], method='RK45')
+    solve_time = time.perf_counter() - start
+
+    return {
+        'setup_time': setup_time,
+        'solve_time': solve_time,
+        'nfev': int(sol.nfev),
+        'iterations': _solver_iterations(rhs),
+        'success': bool(sol.success),
+    }, sol.y[:, -1]
+
+
+def peak_memory(backend, m, L=20, nu=0.001, t_end=1.0):
+    tracemalloc.start()
+    try:
+        run_case(backend, m, L, nu, t_end)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(sizes, backends=BACKENDS, repeat=3, L=20, nu=0.001, t_end=1.0,
+                  measure_memory=True, log=print):
+    """Run every backend on every size and return a JSON-ready dictionary.
+
+    Each record holds the per-repeat setup and solve times, the RK45 RHS
+    count, the total Krylov iterations (multigrid cycles for ``'multigrid'``),
+    the traced peak memory and the relative max error of the final field
+    against the ``'fft'`` backend at the same size.  That reference is
+    :class:`hw581.vorticity.FDVorticity` with
+    :class:`hw581.poisson.FFTPoisson`, not ``spc_rhs`` of 581_hw5.py with
+    its regularised ``K``; the report says so under ``config['reference']``.
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+    results = []
+    for m in sizes:
+        finals = {}
+        for backend in backends:
+            runs = []
+            for _ in range(repeat):
+                stats, final = run_case(backend, m, L, nu, t_end)
+                runs.append(stats)
+            finals[backend] = final
+            record = {
+                'backend': backend,
+                'm': m,
+                'n': m * m,
+                'setup_time': [r['setup_time'] for r in runs],
+                'solve_time': [r['solve_time'] for r in runs],
+                'nfev': runs[-1]['nfev'],
+                'iterations': runs[-1]['iterations'],
+                'success': all(r['success'] for r in runs),
+                'peak_memory': peak_memory(backend, m, L, nu, t_end) if measure_memory else None,
+            }
+            results.append(record)
+            log(f"{backend:>10} {m:>5}^2  solve {min(record['solve_time']):.4f} s"
+                f"  nfev {record['nfev']}  iterations {record['iterations']}")
+
+        if REFERENCE in finals:
+            ref = finals[REFERENCE]
+            for record in results:
+                if record['m'] == m:
+                    err = np.max(np.abs(finals[record['backend']] - ref)) / np.max(np.abs(ref))
+                    record['error_vs_fft'] = float(err)
+
+    return {
+        'config': {'sizes': list(sizes), 'backends': list(backends), 'repeat': repeat,
+                   'L': L, 'nu': nu, 't_end': t_end, 'method': 'RK45',
+                   'reference': REFERENCE_DESCRIPTION if REFERENCE in backends else None,
+                   'python': platform.python_version(), 'numpy': np.__version__},
+        'results': results,
+    }
+
+
+def plot_scaling(report, path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7, 5))
+    for backend in report['config']['backends']:
+        rows = [r for r in report['results'] if r['backend'] == backend]
+        n = [r['n'] for r in rows]
+        t = [min(r['setup_time']) + min(r['solve_time']) for r in rows]
+        ax.loglog(n, t, marker='o', label=backend)
+    ax.set_xlabel('Grid points N')
+    ax.set_ylabel('Setup + solve time (s)')
+    ax.set_title('Streamfunction solver scaling')
+    ax.grid(True, which='both')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256])
+    parser.add_argument('--backends', nargs='+', default=BACKENDS, choices=BACKENDS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--t-end', type=float, default=1.0)
+    parser.add_argument('--nu', type=float, default=0.001)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--out', default='poisson_benchmark.json')
+    parser.add_argument('--plot', default=None, help='write a scaling plot to this file')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    report = run_benchmark(args.sizes, args.backends, args.repeat, nu=args.nu,
+                           t_end=args.t_end, measure_memory=not args.no_memory)
+    if report['config']['reference']:
+        print(f"error_vs_fft is relative to the {report['config']['reference']}")
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.plot:
+        plot_scaling(report, args.plot)
+
+
+if __name__ == '__main__':
+    main()
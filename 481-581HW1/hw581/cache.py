@@ -0,0 +1,202 @@
+"""Content-addressed on-disk cache for expensive solves.
+
+An entry is keyed by the SHA-256 of a solver name and its inputs --
+parameters, grids and initial-condition arrays are hashed by value, dtype
+and shape -- and stored as one compressed ``.npz`` file.  A result may be
+an array, a scalar, or tuples, lists and dicts of those; it comes back in
+the same structure.  Reading an entry marks it as recently used, and once
+the directory grows past ``max_bytes`` the least recently used entries are
+deleted.  Unless a directory is given, entries go to
+:func:`default_directory`, outside the working tree.
+
+The key holds only what the caller passes, not the solver's code: pass
+every input that changes the result, and bump :data:`CACHE_VERSION` (or
+``clear()``) after changing a solver.  An entry that cannot be read back
+(truncated, corrupt, or deleted by another process) counts as a miss and
+is removed, so the result is simply computed again.
+"""
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+from scipy.sparse import issparse
+
+# Part of every key, so bumping it invalidates all stored entries
+CACHE_VERSION = 2
+
+# Returned by ResultCache.get when there is no usable entry (None is a valid result)
+MISS = object()
+
+
+def default_directory():
+    """``$HW581_CACHE_DIR``, else ``hw581`` under ``$XDG_CACHE_HOME`` (default ``~/.cache``)."""
+    directory = os.environ.get('HW581_CACHE_DIR')
+    if directory:
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'hw581')
+
+
+def _feed(h, value):
+    # Type-tagged canonical bytes of value; numbers hash by value, so 64 and 64.0 match
+    if value is None or isinstance(value, (bool, np.bool_)):
+        h.update(f'<{value!r}>'.encode())
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        h.update(f'<n {float(value)!r}>'.encode())
+    elif isinstance(value, (complex, np.complexfloating)):
+        h.update(f'<c {complex(value)!r}>'.encode())
+    elif isinstance(value, str):
+        h.update(f'<s {len(value)}>'.encode() + value.encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f'<a {value.dtype.str} {value.shape}>'.encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif issparse(value):
+        value = value.tocsr()
+        h.update(f'<sparse {value.shape}>'.encode())
+        for part in (value.data, value.indices, value.indptr):
+            _feed(h, part)
+    elif isinstance(value, (list, tuple)):
+        h.update(f'<l {len(value)}>'.encode())
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, dict):
+        h.update(f'<d {len(value)}>'.encode())
+        for k in sorted(value):
+            _feed(h, str(k))
+            _feed(h, value[k])
+    else:
+        raise TypeError(f"cannot hash a {type(value).__name__} for the result cache")
+
+
+def _encode(value, arrays):
+    if isinstance(value, np.ndarray):
+        name = f'a{len(arrays)}'
+        arrays[name] = value
+        return {'array': name}
+    if isinstance(value, dict):
+        return {'dict': {str(k): _encode(v, arrays) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {type(value).__name__: [_encode(v, arrays) for v in value]}
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {'value': value}
+    raise TypeError(f"cannot store a {type(value).__name__} in the result cache")
+
+
+def _decode(node, data):
+    if 'array' in node:
+        return data[node['array']]
+    if 'dict' in node:
+        return {k: _decode(v, data) for k, v in node['dict'].items()}
+    if 'list' in node:
+        return [_decode(v, data) for v in node['list']]
+    if 'tuple' in node:
+        return tuple(_decode(v, data) for v in node['tuple'])
+    return node['value']
+
+
+class ResultCache:
+    """Compressed results under ``directory``, evicted least recently used past ``max_bytes``.
+
+    ``fetch(name, compute, **inputs)`` is the usual entry point: it returns
+    the stored result for ``(name, inputs)`` or calls ``compute()`` and
+    stores what it returns.  With ``enabled=False`` every fetch computes
+    and nothing touches the disk: ``get`` always misses and ``put`` stores
+    nothing.
+    """
+
+    def __init__(self, directory=None, max_bytes=512 * 2**20, enabled=True):
+        self.directory = default_directory() if directory is None else directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def key(self, name, **inputs):
+        h = hashlib.sha256()
+        _feed(h, [CACHE_VERSION, name, inputs])
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.npz')
+
+    def get(self, key):
+        """Stored result for ``key``, or :data:`MISS`."""
+        if not self.enabled:
+            return MISS
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+            structure = json.loads(str(arrays.pop('__structure__')))
+            result = _decode(structure, arrays)
+            os.utime(path)  # mtime is the last use, for eviction
+        except FileNotFoundError:
+            return MISS
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+            self._remove(path)
+            return MISS
+        return result
+
+    def put(self, key, result):
+        if not self.enabled:
+            return
+        arrays = {}
+        arrays['__structure__'] = np.array(json.dumps(_encode(result, arrays)))
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+        self._evict()
+
+    def fetch(self, name, compute, **inputs):
+        if not self.enabled:
+            return compute()
+        key = self.key(name, **inputs)
+        result = self.get(key)
+        if result is MISS:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if file.endswith('.npz'):
+                    path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @property
+    def size(self):
+        """Bytes used by the stored entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        # Another process may have removed it first
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
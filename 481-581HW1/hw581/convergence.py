@@ -0,0 +1,163 @@
+"""Convergence studies of ``solve_ivp`` methods, run on a pool and cached on disk.
+
+A study is the grid ``problems x methods x tolerances`` (``rtol = atol =
+tol`` as in part D of 581_hw3.py).  Every cell records ``nfev``, ``njev``,
+``nlu``, the number and mean size of the steps, the time spent in
+``solve_ivp`` and the error against a reference solution on a fixed grid of
+check points.  Cells are stored in a :class:`hw581.cache.ResultCache`, keyed
+by the problem, the method, the tolerance and the reference settings, so
+re-running a study with one more tolerance or method only integrates the
+new cells.
+"""
+import functools
+import inspect
+import time
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from hw581.cache import MISS, ResultCache
+from hw581.sweep import SweepStore, _run_task, run_sweep
+
+
+def hw1_rhs_a(x, y, E, K):
+    return [y[1], (K * x**2 - E) * y[0]]
+
+
+def harmonic_problem(E=1, K=1, L=2):
+    """Part D of 581_hw3.py: the HW 1 oscillator shot from ``x = -L`` with ``eps = E``."""
+    return {'fun': hw1_rhs_a, 't_span': (-L, L), 'y0': [1, np.sqrt(K * L**2 - 1)], 'args': (E, K)}
+
+
+# Problem name -> function of keyword parameters returning the solve_ivp inputs
+PROBLEMS = {'harmonic': harmonic_problem}
+
+
+def _complete(problem):
+    # Fill in the problem's defaults so equal problems get equal cache keys
+    defaults = {name: p.default for name, p in
+                inspect.signature(PROBLEMS[problem['problem']]).parameters.items()}
+    return dict(defaults, **problem)
+
+
+def _problem(params):
+    problem_params = {k: v for k, v in params.items() if k not in ('problem', 'method', 'tol')}
+    return PROBLEMS[params['problem']](**problem_params)
+
+
+def _check_points(t_span, n_check):
+    return np.linspace(t_span[0], t_span[1], n_check)
+
+
+def convergence_task(params, reference=None, n_check=41):
+    """Integrate one cell; ``params`` holds ``problem`` (and its parameters), ``method`` and ``tol``.
+
+    ``reference`` is the reference solution on the ``n_check`` check
+    points, shape ``(n_check, len(y0))``; without it only the check-point
+    values are returned (that is how the reference itself is computed).
+    """
+    problem = _problem(params)
+    tol = params['tol']
+    start = time.perf_counter()
+    sol = solve_ivp(problem['fun'], problem['t_span'], problem['y0'], method=params['method'],
+                    args=problem['args'], rtol=tol, atol=tol, dense_output=True)
+    solve_time = time.perf_counter() - start
+
+    values = sol.sol(_check_points(problem['t_span'], n_check)).T
+    steps = np.diff(sol.t)
+    result = {'nfev': int(sol.nfev), 'njev': int(sol.njev), 'nlu': int(sol.nlu),
+              'n_steps': len(steps), 'mean_step': float(np.mean(steps)),
+              'solve_time': solve_time, 'success': bool(sol.success)}
+    if reference is None:
+        result['values'] = values
+    else:
+        error = np.abs(values - np.asarray(reference))
+        result['error'] = float(np.max(error))
+        result['final_error'] = float(np.max(error[-1]))
+    return result
+
+
+def convergence_study(problems, methods, tolerances, cache=None,
+                      reference_method='DOP853', reference_tol=1e-13, n_check=41,
+                      max_workers=None, log=print):
+    """Run (or load) every cell of ``problems x methods x tolerances``.
+
+    ``problems`` is a list of dicts with a ``problem`` name from
+    :data:`PROBLEMS` and its parameters, e.g. ``[{'problem': 'harmonic',
+    'E': 1}]``.  The reference of each problem is itself a cached cell at
+    ``reference_tol`` with ``reference_method``.  Missing cells run through
+    :func:`hw581.sweep.run_sweep` (``max_workers=1`` runs them in this
+    process, which is quicker for small problems than starting a pool).
+    ``cache`` is a :class:`hw581.cache.ResultCache` (pass a disabled one to
+    run every cell), a cache directory, or ``None`` for the default
+    directory.  Returns a :class:`hw581.sweep.SweepStore` of every cell;
+    failed cells are kept out of the cache so they run again next time.
+    """
+    if not isinstance(cache, ResultCache):
+        cache = ResultCache(cache)
+    settings = {'reference_method': reference_method, 'reference_tol': reference_tol,
+                'n_check': n_check}
+    store = SweepStore()
+
+    for problem in map(_complete, problems):
+        ref_params = dict(problem, method=reference_method, tol=reference_tol)
+        reference = cache.fetch('convergence reference',
+                                lambda: convergence_task(ref_params, n_check=n_check)['values'],
+                                n_check=n_check, **ref_params)
+
+        cells = [dict(problem, method=method, tol=tol) for method in methods for tol in tolerances]
+        missing = []
+        for params in cells:
+            result = cache.get(cache.key('convergence', **params, **settings))
+            if result is MISS:
+                missing.append(params)
+            else:
+                store.add(params, result, 'cached')
+        log(f"{problem}: {len(cells) - len(missing)} cached, {len(missing)} to run")
+        if not missing:
+            continue
+
+        task = functools.partial(convergence_task, reference=reference, n_check=n_check)
+        if max_workers == 1:
+            new = SweepStore()
+            for params in missing:
+                new.add(*_run_task(task, params))
+        else:
+            new = run_sweep(task, missing, max_workers, log=log)
+        for params, result, status in zip(new.params, new.results, new.status):
+            if status == 'ok':
+                cache.put(cache.key('convergence', **params, **settings), result)
+            store.add(params, result, status)
+    return store
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a cached solve_ivp convergence study.")
+    parser.add_argument('--problem', default='harmonic', choices=sorted(PROBLEMS))
+    parser.add_argument('--methods', nargs='+', default=['RK45', 'RK23', 'Radau', 'BDF'])
+    parser.add_argument('--tolerances', type=float, nargs='+',
+                        default=[1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10])
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--no-cache', action='store_true', help='run every cell, store nothing')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default=None, help='also save the study as a SweepStore .npz')
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache_dir, enabled=not args.no_cache)
+    store = convergence_study([{'problem': args.problem}], args.methods, args.tolerances,
+                              cache, max_workers=args.workers)
+    print(f"{'method':>8} {'tol':>8} {'nfev':>6} {'njev':>5} {'nlu':>5} {'time [s]':>9} {'error':>9}")
+    for params, result, status in zip(store.params, store.results, store.status):
+        if status == 'error':
+            print(f"{params['method']:>8} {params['tol']:8.0e} failed")
+            continue
+        print(f"{params['method']:>8} {params['tol']:8.0e} {result['nfev']:6d} {result['njev']:5d} "
+              f"{result['nlu']:5d} {result['solve_time']:9.4f} {result['error']:9.2e}")
+    if args.out:
+        store.save(args.out)
+
+
+if __name__ == '__main__':
+    main()
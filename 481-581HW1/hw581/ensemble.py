@@ -0,0 +1,183 @@
+"""Integrate many initial conditions of one system as a single batch.
+
+``fun(t, W)`` takes and returns arrays of shape ``(K, N)``, one row per
+ensemble member, so each stage is one vectorised evaluation (for the
+vorticity solvers, one batch of FFTs) instead of K separate ones.
+
+Batching saves the per-call overhead of ``fun`` and of the integrator, so
+it pays for many members on small grids and not otherwise.  Measured on
+:class:`hw581.spectral.SpectralVorticity` against a loop of ``solve_ivp``
+(t = 0..4): 64 members on 32^2 run 2.1x faster and 16 on 64^2 1.2x, but
+4 members on 64^2 and any ensemble on 128^2 take as long as the loop, or
+up to 15% longer.
+"""
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+# Dormand-Prince 5(4), the pair used by solve_ivp's RK45
+_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+_SAFETY = 0.9
+_MIN_FACTOR = 0.2
+_MAX_FACTOR = 10
+
+
+def _error_norms(err, y, y_new, rtol, atol):
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return np.sqrt(np.mean((err / scale)**2, axis=-1))
+
+
+def _initial_steps(fun, t0, y0, f0, rtol, atol):
+    # solve_ivp's starting-step heuristic, one value per member
+    scale = atol + rtol * np.abs(y0)
+    d0 = np.sqrt(np.mean((y0 / scale)**2, axis=-1))
+    d1 = np.sqrt(np.mean((f0 / scale)**2, axis=-1))
+    h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+    f1 = fun(t0 + h0, y0 + h0[:, np.newaxis] * f0)
+    d2 = np.sqrt(np.mean(((f1 - f0) / scale)**2, axis=-1)) / h0
+    d12 = np.maximum(d1, d2)
+    h1 = np.where(d12 <= 1e-15, np.maximum(1e-6, h0 * 1e-3),
+                  (0.01 / np.maximum(d12, 1e-300))**(1 / 5))
+    return np.minimum(100 * h0, h1)
+
+
+def _rk45_step(fun, t, y, f, h):
+    hc = h[:, np.newaxis]
+    k = [f]
+    for i in range(1, 6):
+        dy = sum(a * ki for a, ki in zip(_A[i], k))
+        k.append(fun(t + _C[i] * h, y + hc * dy))
+    y_new = y + hc * sum(b * ki for b, ki in zip(_B, k) if b != 0)
+    f_new = fun(t + h, y_new)
+    k.append(f_new)
+    err = hc * sum(e * ki for e, ki in zip(_E, k) if e != 0)
+    return y_new, f_new, err
+
+
+def integrate_ensemble(fun, W0, t_eval, method='RK45', rtol=1e-3, atol=1e-6, dt=None,
+                       max_batch=None):
+    """Integrate every row of ``W0`` from ``t_eval[0]`` and sample at ``t_eval``.
+
+    ``method='RK45'`` is the Dormand-Prince pair of ``solve_ivp`` with the same
+    error norm, but every member keeps its own time and step size.  Each
+    batched stage only evaluates the members that have not reached
+    ``t_eval[-1]``, and ``fun`` gets their times as an array of shape
+    ``(K_active,)`` (autonomous systems simply ignore it).  ``method='RK4'``
+    takes fixed steps of ``dt`` for all members, with a scalar ``t``.  Steps
+    are shortened to land exactly on the ``t_eval`` points.
+
+    ``fun`` is called on at most ``max_batch`` members at a time (default:
+    all of them in one call), to bound the size of the temporaries of very
+    large ensembles.
+
+    Returns an ``OptimizeResult`` with ``t``, ``y`` of shape ``(K, N, len(t_eval))``
+    and per-member ``nfev``, ``n_steps`` and ``n_rejected``.  ``y[k]``
+    agrees with ``solve_ivp(...).y`` for member k to the tolerances; with
+    only the two end points in ``t_eval`` the RK45 steps are the same as
+    ``solve_ivp``'s, which interpolates at output times instead of landing
+    on them.  ``nfev[k]`` counts the RHS evaluations of member k, as
+    ``solve_ivp``'s ``nfev`` does; ``n_calls`` is the number of (batched)
+    calls of ``fun``.
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    W = np.array(W0, dtype=float)
+    if W.ndim == 1:
+        W = W[np.newaxis, :]
+    if method not in ('RK45', 'RK4'):
+        raise ValueError(f"unknown ensemble method {method!r}")
+    if method == 'RK4' and dt is None:
+        raise ValueError("method='RK4' needs a step size dt")
+
+    if max_batch is None:
+        max_batch = W.shape[0]
+
+    n_calls = 0
+
+    def counted(t, y):
+        nonlocal n_calls
+        if len(y) <= max_batch:
+            n_calls += 1
+            return fun(t, y)
+        out = np.empty_like(y)
+        for i in range(0, len(y), max_batch):
+            chunk = slice(i, i + max_batch)
+            n_calls += 1
+            out[chunk] = fun(t if np.ndim(t) == 0 else t[chunk], y[chunk])
+        return out
+
+    n_members = W.shape[0]
+    Y = np.empty(W.shape + (len(t_eval),))
+    Y[..., 0] = W
+    n_steps = np.zeros(n_members, dtype=int)
+    n_rejected = np.zeros(n_members, dtype=int)
+
+    if method == 'RK4':
+        t = t_eval[0]
+        for j, t_next in enumerate(t_eval[1:], start=1):
+            while t < t_next:
+                h = min(dt, t_next - t)
+                k1 = counted(t, W)
+                k2 = counted(t + h / 2, W + h / 2 * k1)
+                k3 = counted(t + h / 2, W + h / 2 * k2)
+                k4 = counted(t + h, W + h * k3)
+                W = W + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+                t = t_next if h == t_next - t else t + h
+                n_steps += 1
+            Y[..., j] = W
+        return OptimizeResult(t=t_eval, y=Y, nfev=4 * n_steps, n_calls=n_calls, n_steps=n_steps,
+                              n_rejected=n_rejected, success=True, message='')
+
+    t = np.full(n_members, t_eval[0])
+    nxt = np.ones(n_members, dtype=int)  # index of each member's next output
+    f = counted(t, W)
+    h = _initial_steps(counted, t, W, f, rtol, atol)
+
+    retry = np.zeros(n_members, dtype=bool)  # last attempt was rejected
+    active = np.arange(n_members)
+    while active.size:
+        ta, Wa, fa = t[active], W[active], f[active]
+        to_output = t_eval[nxt[active]] - ta
+        h_step = np.minimum(h[active], to_output)
+
+        W_new, f_new, err = _rk45_step(counted, ta, Wa, fa, h_step)
+        err_norm = _error_norms(err, Wa, W_new, rtol, atol)
+        ok = err_norm < 1
+
+        with np.errstate(divide='ignore'):
+            factor = np.where(err_norm == 0, _MAX_FACTOR, _SAFETY * err_norm**-0.2)
+        # As in solve_ivp, a step accepted after a rejection does not grow h
+        grow = np.where(retry[active], np.minimum(1, factor), np.minimum(_MAX_FACTOR, factor))
+        shrink = np.maximum(_MIN_FACTOR, factor)
+        # A step cut short by an output time says nothing about h, keep it
+        full = h_step == h[active]
+        h[active] = np.where(ok, np.where(full, h_step * grow, h[active]), h_step * shrink)
+
+        acc = active[ok]
+        landed = h_step[ok] == to_output[ok]
+        t[acc] = np.where(landed, t_eval[nxt[acc]], ta[ok] + h_step[ok])
+        W[acc] = W_new[ok]
+        f[acc] = f_new[ok]
+        n_steps[acc] += 1
+        n_rejected[active[~ok]] += 1
+        retry[active] = ~ok
+
+        for k in acc[landed]:
+            Y[k, :, nxt[k]] = W[k]
+            nxt[k] += 1
+        active = active[nxt[active] < len(t_eval)]
+
+    # Two evaluations to start (f0 and the initial-step probe), then six per
+    # attempted step (FSAL), the same count as solve_ivp's RK45
+    nfev = 2 + 6 * (n_steps + n_rejected)
+    return OptimizeResult(t=t_eval, y=Y, nfev=nfev, n_calls=n_calls, n_steps=n_steps,
+                          n_rejected=n_rejected, success=True, message='')
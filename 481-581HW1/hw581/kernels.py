@@ -0,0 +1,259 @@
+"""Preallocated RHS kernels for ``rhs_fourier``, ``LRS_2D`` and ``spc_rhs``.
+
+Each kernel sizes its scratch arrays and FFT output buffers once, in
+``__init__``.  A call then works only through in-place ufuncs and the
+``out=`` arguments of the 1D ``numpy.fft`` transforms and ``numpy.dot``, and returns
+a view of one reused output array, so a steady-state call allocates nothing of
+grid size (only a few array headers for views).  :func:`allocated_bytes`
+measures this.
+
+The returned array is overwritten by the next call.  ``solve_ivp`` keeps
+earlier evaluations (for the starting step and after a rejected step), so
+pass ``copy_output=True`` there: each call then makes one copy of the
+result instead of all the temporaries of the script functions.  Callers
+that manage their own storage can pass ``out=`` instead.
+"""
+import tracemalloc
+
+import numpy as np
+
+
+def allocated_bytes(fun, *args, warmup=1):
+    """Peak bytes allocated during one call of ``fun(*args)``.
+
+    ``warmup`` calls are made first so one-off costs (FFT plans, lazy
+    buffers) are not counted.  NumPy reports its array data to
+    ``tracemalloc``, so every temporary shows up in the peak even if it is
+    freed before the call returns.
+    """
+    for _ in range(warmup):
+        fun(*args)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fun(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak - before
+
+
+# numpy's fft2/rfft2/irfft2 do not honour ``out=`` over two axes (the second
+# pass allocates), so the 2D transforms are two 1D passes through ``work``.
+
+def _fft2_into(a, work, out, inverse=False):
+    transform = np.fft.ifft if inverse else np.fft.fft
+    transform(a, axis=-1, out=work)
+    return transform(work, axis=-2, out=out)
+
+
+def _rfft2_into(a, work, out):
+    np.fft.rfft(a, axis=-1, out=work)
+    return np.fft.fft(work, axis=-2, out=out)
+
+
+def _irfft2_into(a, work, out):
+    np.fft.ifft(a, axis=-2, out=work)
+    return np.fft.irfft(work, n=out.shape[-1], axis=-1, out=out)
+
+
+class _Kernel:
+    """Output handling shared by the kernels; subclasses define ``_compute``."""
+
+    def __init__(self, size, dtype, copy_output):
+        self.copy_output = copy_output
+        self.out = np.empty(size, dtype=dtype)
+
+    def __call__(self, t, y, out=None):
+        if out is None:
+            out = self.out
+        self._compute(y, out)
+        return out.copy() if self.copy_output else out
+
+    rhs = __call__
+
+
+class FourierLambdaOmegaKernel(_Kernel):
+    """``rhs_fourier`` of 581_hw6.py on the complex ``hstack([fft2(u), fft2(v)])`` state.
+
+    ``K`` is the script's ``KX**2 + KY**2`` (with its regularised zero mode),
+    so the result matches ``rhs_fourier(t, uv_hat, K, N, nx, ny)``.
+    """
+
+    def __init__(self, K, D1=0.1, D2=0.1, beta=1, copy_output=False):
+        self.ny, self.nx = K.shape
+        self.beta = beta
+        super().__init__(2 * K.size, complex, copy_output)
+        self.linear = -np.stack([D1 * K, D2 * K]).astype(complex)
+        self.uv = np.empty((2,) + K.shape, dtype=complex)
+        self.reaction = np.empty_like(self.uv)
+        self.a2 = np.empty(K.shape, dtype=complex)
+        self.lam = np.empty_like(self.a2)
+        self.om = np.empty_like(self.a2)
+        self.tmp = np.empty_like(self.a2)
+        self.work = np.empty_like(self.uv)
+
+    def _compute(self, uv_hat, out):
+        shape = (2, self.ny, self.nx)
+        uv_hat = uv_hat.reshape(shape)
+        out = out.reshape(shape)
+        U, V = self.uv
+        a2, lam, om, tmp = self.a2, self.lam, self.om, self.tmp
+        react_u, react_v = self.reaction
+
+        _fft2_into(uv_hat, self.work, self.uv, inverse=True)
+        np.multiply(U, U, out=a2)
+        np.multiply(V, V, out=tmp)
+        a2 += tmp
+        np.subtract(1, a2, out=lam)
+        np.multiply(a2, -self.beta, out=om)
+
+        np.multiply(lam, U, out=react_u)
+        np.multiply(om, V, out=tmp)
+        react_u -= tmp
+        np.multiply(om, U, out=react_v)
+        np.multiply(lam, V, out=tmp)
+        react_v += tmp
+
+        _fft2_into(self.reaction, self.work, out)
+        # The reaction buffer is free again, reuse it for the diffusion
+        np.multiply(self.linear, uv_hat, out=self.reaction)
+        out += self.reaction
+
+
+class ChebyshevLambdaOmegaKernel(_Kernel):
+    """``LRS_2D`` of 581_hw6.py: ``hstack([u, v])`` on the Chebyshev grid.
+
+    ``Dxx`` is the 1D second-derivative matrix; the 2D Laplacian is applied
+    in tensor form, ``Dxx @ U + U @ Dxx.T`` (see :mod:`hw581.chebyshev`).
+    """
+
+    def __init__(self, Dxx, D1=0.1, D2=0.1, beta=1, copy_output=False):
+        self.n = Dxx.shape[0]
+        self.N2 = self.n**2
+        self.beta = beta
+        super().__init__(2 * self.N2, float, copy_output)
+        self.Dxx = np.ascontiguousarray(Dxx)
+        self.DxxT = np.ascontiguousarray(Dxx.T)
+        self.D1, self.D2 = D1, D2
+        self.a2 = np.empty(self.N2)
+        self.lam = np.empty_like(self.a2)
+        self.om = np.empty_like(self.a2)
+        self.tmp = np.empty_like(self.a2)
+
+    def _laplacian(self, U, out, coefficient):
+        tmp = self.tmp.reshape(self.n, self.n)
+        np.dot(self.Dxx, U, out=out)
+        np.dot(U, self.DxxT, out=tmp)
+        out += tmp
+        out *= coefficient
+
+    def _compute(self, uv, out):
+        grid = (self.n, self.n)
+        uv = uv.reshape(2, self.N2)
+        out = out.reshape(2, self.N2)
+        u, v = uv
+        out_u, out_v = out
+        a2, lam, om, tmp = self.a2, self.lam, self.om, self.tmp
+
+        self._laplacian(u.reshape(grid), out_u.reshape(grid), self.D1)
+        self._laplacian(v.reshape(grid), out_v.reshape(grid), self.D2)
+
+        np.multiply(u, u, out=a2)
+        np.multiply(v, v, out=tmp)
+        a2 += tmp
+        np.subtract(1, a2, out=lam)
+        np.multiply(a2, -self.beta, out=om)
+
+        np.multiply(lam, u, out=tmp)
+        out_u += tmp
+        np.multiply(om, v, out=tmp)
+        out_u -= tmp
+        np.multiply(om, u, out=tmp)
+        out_v += tmp
+        np.multiply(lam, v, out=tmp)
+        out_v += tmp
+
+
+class VorticityKernel(_Kernel):
+    """``spc_rhs`` of 581_hw5.py: FFT streamfunction, finite-difference advection.
+
+    ``psi = real(ifft2(-fft2(w) / K))`` is computed with real transforms
+    (``K`` is the script's full ``(ny, nx)`` array) and ``A``, ``B``, ``C``
+    are the HW 4 stencils of :func:`hw581.operators.periodic_fd_matrices`,
+    applied with slices into preallocated fields instead of sparse products.
+    """
+
+    def __init__(self, K, nu, L, pin=2.0, copy_output=False):
+        self.ny, self.nx = K.shape
+        self.m = self.nx
+        self.nu = nu
+        self.dx = L / self.m
+        self.pin = pin
+        super().__init__(K.size, float, copy_output)
+        nxr = self.nx // 2 + 1
+        # complex, so the in-place product does not go through a cast buffer
+        self.minus_K_inv = (-1 / K[:, :nxr]).astype(complex)
+        self.w_hat = np.empty((self.ny, nxr), dtype=complex)
+        self.work = np.empty_like(self.w_hat)
+        self.psi = np.empty(K.shape)
+        self.dx_w = np.empty(K.shape)
+        self.dy_w = np.empty(K.shape)
+        self.dx_psi = np.empty(K.shape)
+        self.dy_psi = np.empty(K.shape)
+        self.tmp = np.empty(K.shape)
+
+    @staticmethod
+    def _sum_neighbours(W, out, axis, sign):
+        # out = W shifted by -1 plus sign * W shifted by +1 along axis (periodic)
+        op = np.add if sign > 0 else np.subtract
+        if axis == 1:
+            # 2D column slices make the ufunc buffer, so run over the flat
+            # arrays (right away from the edges) and redo the two edge columns
+            op(W.reshape(-1)[2:], W.reshape(-1)[:-2], out=out.reshape(-1)[1:-1])
+            op(W[:, 1], W[:, -1], out=out[:, 0])
+            op(W[:, 0], W[:, -2], out=out[:, -1])
+        else:
+            op(W[2:], W[:-2], out=out[1:-1])
+            op(W[1], W[-1], out=out[0])
+            op(W[0], W[-2], out=out[-1])
+
+    def _gradient(self, W, dx_out, dy_out):
+        scale = 1 / (2 * self.dx)
+        self._sum_neighbours(W, dx_out, 1, -1)
+        dx_out *= scale
+        self._sum_neighbours(W, dy_out, 0, -1)
+        dy_out *= scale
+
+    def _compute(self, w, out):
+        W = w.reshape(self.ny, self.nx)
+        out = out.reshape(self.ny, self.nx)
+        tmp = self.tmp
+
+        _rfft2_into(W, self.work, self.w_hat)
+        self.w_hat *= self.minus_K_inv
+        _irfft2_into(self.w_hat, self.work, self.psi)
+
+        # nu * A @ w, with A[0, 0] pinned as in the script
+        self._sum_neighbours(W, out, 1, 1)
+        self._sum_neighbours(W, tmp, 0, 1)
+        out += tmp
+        np.multiply(W, 4, out=tmp)
+        out -= tmp
+        out *= 1 / self.dx**2
+        if self.pin is not None:
+            out[0, 0] += (self.pin + 4 / self.dx**2) * W[0, 0]
+        out *= self.nu
+
+        # - (B @ psi) * (C @ w) + (C @ psi) * (B @ w)
+        self._gradient(W, self.dx_w, self.dy_w)
+        self._gradient(self.psi, self.dx_psi, self.dy_psi)
+        np.multiply(self.dy_psi, self.dx_w, out=tmp)
+        out -= tmp
+        np.multiply(self.dx_psi, self.dy_w, out=tmp)
+        out += tmp
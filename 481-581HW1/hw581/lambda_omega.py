@@ -0,0 +1,261 @@
+"""Lambda-omega reaction-diffusion system of HW 6 on a periodic box.
+
+    u_t = lambda(A) u - omega(A) v + D1 lap(u)
+    v_t = omega(A) u + lambda(A) v + D2 lap(v),    A^2 = u^2 + v^2
+
+with ``lambda(A) = 1 - A^2`` and ``omega(A) = -beta A^2``.  The complex Fourier
+state is the one of 581_hw6.py: ``hstack([fft2(u).ravel(), fft2(v).ravel()])``.
+Since u and v are real, :meth:`LambdaOmegaFourier.rhs_real` instead carries
+only the ``rfft2`` half spectra, packed as a real vector.
+:class:`LambdaOmegaChebyshev` is the Chebyshev part of the script, on the
+state ``hstack([u.ravel(), v.ravel()])``.  :func:`rhs_fourier` and
+:func:`LRS_2D` are the script's own right-hand sides.
+"""
+import numpy as np
+from scipy.fft import fft2, ifft2, irfft2, rfft2
+from scipy.sparse import bmat, diags, identity
+
+from hw581.chebyshev import FastDiagonalization, chebyshev_laplacian
+
+
+def lambda_omega(A_squared, beta=1):
+    lambda_A = 1 - A_squared
+    omega_A = -beta * A_squared
+    return lambda_A, omega_A
+
+
+def rhs_fourier(t, uv_hat, K, N, nx, ny, D1=0.1, D2=0.1, beta=1):
+    """``rhs_fourier`` of 581_hw6.py, with ``D1``, ``D2`` and ``beta`` as arguments."""
+    u_hat0 = uv_hat[0:N].reshape((nx, ny))
+    v_hat0 = uv_hat[N:].reshape((nx, ny))
+    U = ifft2(u_hat0)
+    V = ifft2(v_hat0)
+    lambda_A, omega_A = lambda_omega(U**2 + V**2, beta)
+    U_rhs = (-D1 * K * u_hat0 + fft2(lambda_A * U - omega_A * V)).reshape(N)
+    V_rhs = (-D2 * K * v_hat0 + fft2(omega_A * U + lambda_A * V)).reshape(N)
+    return np.hstack([U_rhs, V_rhs])
+
+
+def LRS_2D(t, uv, L, N2, D1, D2, beta=1):
+    """Chebyshev RHS of 581_hw6.py on ``hstack([u.ravel(), v.ravel()])``; ``L`` is the 2D Laplacian."""
+    u, v = uv[:N2], uv[N2:]
+    lambda_A, omega_A = lambda_omega(u**2 + v**2, beta)
+    U_rhs = D1 * (L @ u) + lambda_A * u - omega_A * v
+    V_rhs = D2 * (L @ v) + omega_A * u + lambda_A * v
+    return np.hstack([U_rhs, V_rhs])
+
+
+class LambdaOmegaFourier:
+    """Spectral lambda-omega solver with an RK45 RHS and an ETDRK4 stepper."""
+
+    def __init__(self, nx, ny, Lx, Ly, D1=0.1, D2=0.1, beta=1):
+        self.nx, self.ny = nx, ny
+        self.N = nx * ny
+        self.beta = beta
+        kx = (2 * np.pi / Lx) * np.concatenate((np.arange(0, nx / 2), np.arange(-nx / 2, 0)))
+        ky = (2 * np.pi / Ly) * np.concatenate((np.arange(0, ny / 2), np.arange(-ny / 2, 0)))
+        KX, KY = np.meshgrid(kx, ky)
+        self.K = KX**2 + KY**2
+        # Diagonal linear part for (u_hat, v_hat) stacked along axis 0
+        self.linear = -np.stack([D1 * self.K, D2 * self.K])
+        self._etd_cache = {}
+
+        # Hermitian half: the first nx // 2 + 1 columns of K
+        self.nxr = nx // 2 + 1
+        self.linear_half = self.linear[..., :self.nxr].copy()
+
+    def _split(self, uv_hat):
+        return np.reshape(uv_hat, (2, self.ny, self.nx))
+
+    def nonlinear(self, uv_hat):
+        """Fourier transform of the reaction terms, shape ``(2, ny, nx)``."""
+        U, V = ifft2(uv_hat)
+        A_squared = U**2 + V**2
+        lambda_A, omega_A = lambda_omega(A_squared, self.beta)
+        return fft2(np.stack([lambda_A * U - omega_A * V, omega_A * U + lambda_A * V]))
+
+    def rhs(self, t, uv_hat):
+        uv_hat = self._split(uv_hat)
+        return (self.linear * uv_hat + self.nonlinear(uv_hat)).ravel()
+
+    __call__ = rhs
+
+    def pack(self, u, v):
+        """Real state vector holding ``rfft2(u)`` and ``rfft2(v)``."""
+        return np.ascontiguousarray(rfft2(np.stack([u, v]))).view(float).ravel()
+
+    def unpack(self, y):
+        """``(u, v)`` in physical space from a packed real state."""
+        return irfft2(self._half(y), s=(self.ny, self.nx))
+
+    def _half(self, y):
+        return np.ascontiguousarray(y).view(complex).reshape(2, self.ny, self.nxr)
+
+    def full_state(self, y):
+        """Packed real state to the complex ``hstack`` layout of 581_hw6.py."""
+        return fft2(self.unpack(y)).ravel()
+
+    def rhs_real(self, t, y):
+        """Same system as :meth:`rhs` on the packed real half-spectrum state.
+
+        Two ``irfft2`` and one batched ``rfft2`` per call on real data, and
+        ``solve_ivp`` integrates a real vector about half the size.
+        """
+        uv_half = self._half(y)
+        U, V = irfft2(uv_half, s=(self.ny, self.nx))
+        A_squared = U**2 + V**2
+        lambda_A, omega_A = lambda_omega(A_squared, self.beta)
+        reaction = rfft2(np.stack([lambda_A * U - omega_A * V, omega_A * U + lambda_A * V]))
+        return (self.linear_half * uv_half + reaction).view(float).ravel()
+
+    def etdrk4_coefficients(self, h, n_contour=32):
+        """``exp(hL)``, ``exp(hL/2)`` and the ETDRK4 phi-function weights for step ``h``.
+
+        The phi-functions are averaged over a circle in the complex plane
+        (Kassam and Trefethen) so they stay accurate where ``hL`` is near 0.
+        """
+        coeffs = self._etd_cache.get(h)
+        if coeffs is not None:
+            return coeffs
+        c = h * self.linear
+        r = np.exp(1j * np.pi * (np.arange(1, n_contour + 1) - 0.5) / n_contour)
+        LR = c[..., np.newaxis] + r
+        eLR = np.exp(LR)
+        Q = h * np.real(np.mean((np.exp(LR / 2) - 1) / LR, axis=-1))
+        f1 = h * np.real(np.mean((-4 - LR + eLR * (4 - 3 * LR + LR**2)) / LR**3, axis=-1))
+        f2 = h * np.real(np.mean((2 + LR + eLR * (-2 + LR)) / LR**3, axis=-1))
+        f3 = h * np.real(np.mean((-4 - 3 * LR - LR**2 + eLR * (4 - LR)) / LR**3, axis=-1))
+        coeffs = (np.exp(c), np.exp(c / 2), Q, f1, f2, f3)
+        self._etd_cache[h] = coeffs
+        return coeffs
+
+    def etdrk4_step(self, v, h):
+        E, E2, Q, f1, f2, f3 = self.etdrk4_coefficients(h)
+        Nv = self.nonlinear(v)
+        a = E2 * v + Q * Nv
+        Na = self.nonlinear(a)
+        b = E2 * v + Q * Na
+        Nb = self.nonlinear(b)
+        c = E2 * a + Q * (2 * Nb - Nv)
+        Nc = self.nonlinear(c)
+        return E * v + Nv * f1 + 2 * (Na + Nb) * f2 + Nc * f3
+
+    def etdrk4(self, uv_hat0, t_eval, dt):
+        """Integrate with ETDRK4 and return snapshots at ``t_eval`` as ``(2N, T)``.
+
+        Between two output times the step is ``dt`` shortened just enough to
+        land on the output exactly; the diffusion is integrated exactly, so
+        ``dt`` is limited by the reaction terms only.
+        """
+        t_eval = np.asarray(t_eval, dtype=float)
+        v = np.array(self._split(uv_hat0), dtype=complex)
+        out = np.empty((2 * self.N, len(t_eval)), dtype=complex)
+        out[:, 0] = v.ravel()
+        for j in range(1, len(t_eval)):
+            span = t_eval[j] - t_eval[j - 1]
+            n_steps = max(1, int(np.ceil(span / dt - 1e-9)))
+            h = span / n_steps
+            for _ in range(n_steps):
+                v = self.etdrk4_step(v, h)
+            out[:, j] = v.ravel()
+        return out
+
+
+class LambdaOmegaChebyshev:
+    """Chebyshev lambda-omega solver with an RK45 RHS and IMEX steppers.
+
+    The Laplacian is the Dirichlet ``Dxx`` of 581_hw6.py in tensor form.
+    Its eigenvalues grow like N^4, which is what limits RK45; the IMEX
+    schemes treat diffusion implicitly (solved by fast diagonalization) and
+    only the reaction explicitly, so ``dt`` is set by the reaction.
+    """
+
+    def __init__(self, N, length, D1=0.1, D2=0.1, beta=1, method='matrix'):
+        self.n = N + 1
+        self.N2 = self.n**2
+        self.D1, self.D2 = D1, D2
+        self.beta = beta
+        self.laplacian = chebyshev_laplacian(N, length, method)
+        self.x = self.laplacian.x
+        self._fast_diag = None
+
+    def _split(self, uv):
+        return np.reshape(uv, (2, self.n, self.n))
+
+    def reaction(self, UV):
+        U, V = UV
+        A_squared = U**2 + V**2
+        lambda_A, omega_A = lambda_omega(A_squared, self.beta)
+        return np.stack([lambda_A * U - omega_A * V, omega_A * U + lambda_A * V])
+
+    def rhs(self, t, uv):
+        UV = self._split(uv)
+        lap = self.laplacian.apply(UV)
+        lap[0] *= self.D1
+        lap[1] *= self.D2
+        return (lap + self.reaction(UV)).ravel()
+
+    __call__ = rhs
+
+    def jac(self, t, uv):
+        """Exact sparse Jacobian of :meth:`rhs`, for ``method='BDF'`` or ``'Radau'``.
+
+        The diffusion blocks are ``D1 L`` and ``D2 L`` with the sparse
+        Laplacian; the reaction adds a diagonal to each of the four blocks.
+        """
+        u, v = np.reshape(uv, (2, self.N2))
+        A_squared = u**2 + v**2
+        lambda_A, omega_A = lambda_omega(A_squared, self.beta)
+        fu_u = lambda_A - 2 * u**2 + 2 * self.beta * u * v
+        fu_v = -2 * u * v - omega_A + 2 * self.beta * v**2
+        fv_u = omega_A - 2 * self.beta * u**2 - 2 * u * v
+        fv_v = lambda_A - 2 * self.beta * u * v - 2 * v**2
+        L = self.laplacian.sparse()
+        return bmat([[self.D1 * L + diags(fu_u), diags(fu_v)],
+                     [diags(fv_u), self.D2 * L + diags(fv_v)]], format='csc')
+
+    @property
+    def jac_sparsity(self):
+        """Nonzero pattern of :meth:`jac`: the Laplacian blocks plus four diagonals."""
+        L = abs(self.laplacian.sparse())
+        I = identity(self.N2, format='csr')
+        return (bmat([[L + I, I], [I, L + I]], format='csc') != 0).astype(np.int8)
+
+    def _implicit_solve(self, F, a, h):
+        # (a - h D lap) U = F for u and v
+        if self._fast_diag is None:
+            self._fast_diag = FastDiagonalization(self.laplacian.Dxx)
+        return np.stack([self._fast_diag.solve(F[0], a, h * self.D1),
+                         self._fast_diag.solve(F[1], a, h * self.D2)])
+
+    def imex(self, uv0, t_eval, dt, scheme='SBDF2'):
+        """Integrate with IMEX-Euler or SBDF2 and return snapshots at ``t_eval`` as ``(2 N2, T)``.
+
+        ``scheme='euler'`` is ``(1 - h D lap) u1 = u0 + h R(u0)``; ``'SBDF2'``
+        is ``(3 - 2h D lap) u2 = 4 u1 - u0 + 2h (2 R(u1) - R(u0))``, started with
+        one IMEX-Euler step.  Steps are ``dt`` shortened to land on each output
+        time; SBDF2 restarts with an Euler step whenever that changes ``h``.
+        """
+        if scheme not in ('euler', 'SBDF2'):
+            raise ValueError(f"unknown IMEX scheme {scheme!r}")
+        t_eval = np.asarray(t_eval, dtype=float)
+        UV = np.array(self._split(uv0), dtype=float)
+        out = np.empty((2 * self.N2, len(t_eval)))
+        out[:, 0] = UV.ravel()
+        previous = None  # (UV, R(UV), h) of the last step, for SBDF2
+        for j in range(1, len(t_eval)):
+            span = t_eval[j] - t_eval[j - 1]
+            n_steps = max(1, int(np.ceil(span / dt - 1e-9)))
+            h = span / n_steps
+            for _ in range(n_steps):
+                R = self.reaction(UV)
+                if scheme == 'SBDF2' and previous is not None and previous[2] == h:
+                    UV_old, R_old = previous[:2]
+                    F = 4 * UV - UV_old + 2 * h * (2 * R - R_old)
+                    UV_new = self._implicit_solve(F, 3.0, 2 * h)
+                else:
+                    UV_new = self._implicit_solve(UV + h * R, 1.0, h)
+                previous = (UV, R, h)
+                UV = UV_new
+            out[:, j] = UV.ravel()
+        return out
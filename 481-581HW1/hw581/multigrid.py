@@ -0,0 +1,164 @@
+"""Geometric multigrid for the doubly periodic 5-point Laplacian.
+
+The grid is coarsened by two in each direction while ``m`` stays even and
+above ``coarsest``; the last level is solved directly.  Smoothing is red-black
+Gauss-Seidel, restriction is full weighting and prolongation is bilinear, all
+with periodic wrap-around.  Fields are m x m arrays laid out like the HW 4
+vectors (``w.reshape(m, m)``).
+"""
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, splu
+
+from hw581.operators import periodic_fd_matrices
+
+
+def _neighbours(u):
+    return (np.roll(u, 1, axis=0) + np.roll(u, -1, axis=0)
+            + np.roll(u, 1, axis=1) + np.roll(u, -1, axis=1))
+
+
+def _laplacian(u, h):
+    return (_neighbours(u) - 4 * u) / h**2
+
+
+def _restrict(r):
+    # Full weighting onto the even points
+    s = (4 * r
+         + 2 * (np.roll(r, 1, axis=0) + np.roll(r, -1, axis=0)
+                + np.roll(r, 1, axis=1) + np.roll(r, -1, axis=1))
+         + np.roll(r, (1, 1), axis=(0, 1)) + np.roll(r, (1, -1), axis=(0, 1))
+         + np.roll(r, (-1, 1), axis=(0, 1)) + np.roll(r, (-1, -1), axis=(0, 1)))
+    return s[::2, ::2] / 16
+
+
+def _prolong(e):
+    mc = e.shape[0]
+    u = np.empty((2 * mc, 2 * mc))
+    e_down = np.roll(e, -1, axis=0)
+    e_right = np.roll(e, -1, axis=1)
+    u[::2, ::2] = e
+    u[1::2, ::2] = (e + e_down) / 2
+    u[::2, 1::2] = (e + e_right) / 2
+    u[1::2, 1::2] = (e + e_down + e_right + np.roll(e_down, -1, axis=1)) / 4
+    return u
+
+
+class _Level:
+    def __init__(self, m, L):
+        self.m = m
+        self.h = L / m
+        red = (np.add.outer(np.arange(m), np.arange(m)) % 2) == 0
+        self.colours = (red, ~red)
+
+    def smooth(self, u, f, sweeps):
+        h2f = self.h**2 * f
+        for _ in range(sweeps):
+            for mask in self.colours:
+                u[mask] = ((_neighbours(u) - h2f) / 4)[mask]
+        return u
+
+
+class MultigridPoisson:
+    """Multigrid solve of ``A psi = w`` with ``A`` from :func:`periodic_fd_matrices`.
+
+    With ``pin=None`` this is the singular periodic problem: the mean of ``w``
+    is projected out and ``psi`` has zero mean.  With a pin value (``2.0`` in
+    the scripts) the result is the exact solution of the pinned system: that
+    system is the periodic one with ``sum(w)`` removed at node 0 and
+    ``psi[0] = sum(w) / (pin + 4 / dx**2)``.
+
+    ``cycle`` is ``'V'`` or ``'F'``.  Each :meth:`solve` starts from the
+    previous ``psi`` and appends the number of cycles it took to ``cycles``.
+    """
+
+    def __init__(self, m, L, pin=2.0, cycle='V', tol=1e-8, max_cycles=50,
+                 pre_sweeps=2, post_sweeps=2, coarsest=8):
+        if cycle not in ('V', 'F'):
+            raise ValueError(f"unknown cycle {cycle!r}")
+        self.m = m
+        self.L = L
+        self.pin = pin
+        self.cycle = cycle
+        self.tol = tol
+        self.max_cycles = max_cycles
+        self.pre_sweeps = pre_sweeps
+        self.post_sweeps = post_sweeps
+
+        self.levels = [_Level(m, L)]
+        mc = m
+        while mc % 2 == 0 and mc // 2 >= coarsest:
+            mc //= 2
+            self.levels.append(_Level(mc, L))
+
+        # Coarsest level: replace row 0 by psi[0] = 0 and fix the mean after
+        A = periodic_fd_matrices(mc, L, pin=None)[0].tolil()
+        A[0, :] = 0
+        A[0, 0] = 1
+        self._coarse_lu = splu(A.tocsc())
+
+        self.psi = None
+        self.cycles = []
+
+    def _coarse_solve(self, f):
+        rhs = f.ravel().copy()
+        rhs[0] = 0
+        u = self._coarse_lu.solve(rhs).reshape(f.shape)
+        return u - u.mean()
+
+    def _cycle(self, k, u, f, kind):
+        level = self.levels[k]
+        if k == len(self.levels) - 1:
+            return self._coarse_solve(f)
+        u = level.smooth(u, f, self.pre_sweeps)
+        r_c = _restrict(f - _laplacian(u, level.h))
+        e_c = self._cycle(k + 1, np.zeros_like(r_c), r_c, kind)
+        if kind == 'F':
+            e_c = self._cycle(k + 1, e_c, r_c, 'V')
+        u += _prolong(e_c)
+        return level.smooth(u, f, self.post_sweeps)
+
+    def _periodic_rhs(self, w):
+        f = np.array(np.reshape(w, (self.m, self.m)), dtype=float)
+        total = f.sum()
+        if self.pin is None:
+            f -= total / f.size
+        else:
+            f[0, 0] -= total
+        return f, total
+
+    def _finish(self, u, total):
+        u = u - u.mean()
+        if self.pin is not None:
+            h = self.L / self.m
+            u += total / (self.pin + 4 / h**2) - u[0, 0]
+        return u.ravel()
+
+    def solve(self, w):
+        f, total = self._periodic_rhs(w)
+        f_norm = np.linalg.norm(f) or 1.0
+        if self.psi is None:
+            u = np.zeros_like(f)
+        else:
+            u = np.reshape(self.psi, f.shape).copy()
+
+        h = self.levels[0].h
+        n_cycles = 0
+        while n_cycles < self.max_cycles:
+            if np.linalg.norm(f - _laplacian(u, h)) <= self.tol * f_norm:
+                break
+            u = self._cycle(0, u, f, self.cycle)
+            n_cycles += 1
+
+        self.cycles.append(n_cycles)
+        self.psi = self._finish(u, total)
+        return self.psi
+
+    def as_preconditioner(self):
+        """One cycle from zero as a ``LinearOperator``, for :class:`KrylovPoisson`."""
+        n = self.m * self.m
+
+        def apply(r):
+            f, total = self._periodic_rhs(r)
+            return self._finish(self._cycle(0, np.zeros_like(f), f, self.cycle), total)
+
+        return LinearOperator((n, n), matvec=apply, dtype=float)
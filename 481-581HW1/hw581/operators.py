@@ -0,0 +1,87 @@
+"""Periodic finite-difference operators from HW 4, kept sparse.
+
+``A`` is the 5-point Laplacian, ``B`` the central difference along the
+block index (rows of ``meshgrid(x, y)``, i.e. y) and ``C`` the central
+difference inside each block (x).  Vectors are the row-major flattening
+of an m x m field, exactly as in the homework scripts.
+"""
+import numpy as np
+from scipy.sparse import spdiags
+from scipy.sparse.linalg import LinearOperator
+
+
+def periodic_fd_matrices(m, L, pin=2.0):
+    """Return the HW 4 matrices ``A, B, C`` as CSR for an m x m grid.
+
+    ``pin`` overwrites ``A[0, 0]`` the same way the scripts do
+    (``A[0, 0] = 2``) so the Laplacian is invertible; pass ``None`` to keep
+    the singular periodic operator.
+    """
+    dx = L / m
+    n = m * m
+
+    e0 = np.zeros(n)
+    e1 = np.ones(n)
+    e2 = np.copy(e1)
+    e4 = np.copy(e0)
+    e2[m - 1::m] = 0
+    e4[m - 1::m] = 1
+
+    e3 = np.roll(e2, 1)
+    e5 = np.roll(e4, 1)
+
+    diagonals_A = [e1, e1, e5, e2, -4 * e1, e3, e4, e1, e1]
+    offsets_A = [-(n - m), -m, -m + 1, -1, 0, 1, m - 1, m, (n - m)]
+    A = (spdiags(diagonals_A, offsets_A, n, n) / (dx**2)).tocsr()
+
+    diagonals_B = [e1, -e1, e1, -e1]
+    offsets_B = [-(n - m), -m, m, (n - m)]
+    B = (spdiags(diagonals_B, offsets_B, n, n) / (2 * dx)).tocsr()
+
+    diagonals_C = [e5, -e2, e3, -e4]
+    offsets_C = [-m + 1, -1, 1, m - 1]
+    C = (spdiags(diagonals_C, offsets_C, n, n) / (2 * dx)).tocsr()
+
+    if pin is not None:
+        # Every row of A already stores its diagonal, so this only
+        # touches the data array and keeps the sparsity pattern.
+        A[0, 0] = pin
+    return A, B, C
+
+
+class PeriodicStencil:
+    """Matrix-free version of :func:`periodic_fd_matrices`.
+
+    The attributes ``A``, ``B`` and ``C`` are ``LinearOperator`` objects, so
+    ``A @ w`` works the same as with the sparse matrices but nothing of size
+    n x n is ever stored.
+    """
+
+    def __init__(self, m, L, pin=2.0):
+        self.m = m
+        self.L = L
+        self.dx = L / m
+        self.pin = pin
+        n = m * m
+        self.A = LinearOperator((n, n), matvec=self.laplacian, dtype=float)
+        self.B = LinearOperator((n, n), matvec=self.ddy, dtype=float)
+        self.C = LinearOperator((n, n), matvec=self.ddx, dtype=float)
+
+    def _field(self, w):
+        return np.asarray(w).reshape(self.m, self.m)
+
+    def laplacian(self, w):
+        W = self._field(w)
+        lap = (np.roll(W, 1, axis=0) + np.roll(W, -1, axis=0)
+               + np.roll(W, 1, axis=1) + np.roll(W, -1, axis=1) - 4 * W) / self.dx**2
+        if self.pin is not None:
+            lap[0, 0] += (self.pin + 4 / self.dx**2) * W[0, 0]
+        return lap.ravel()
+
+    def ddy(self, w):
+        W = self._field(w)
+        return ((np.roll(W, -1, axis=0) - np.roll(W, 1, axis=0)) / (2 * self.dx)).ravel()
+
+    def ddx(self, w):
+        W = self._field(w)
+        return ((np.roll(W, -1, axis=1) - np.roll(W, 1, axis=1)) / (2 * self.dx)).ravel()
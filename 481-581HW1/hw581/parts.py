@@ -0,0 +1,467 @@
+"""Homework parts as functions, shared by the scripts and ``python -m hw581``.
+
+Each part computes the answers of one section of its script and returns
+them as a dict ``{'A1': ..., ...}``.  The script passes its options
+(``batch_shooting``, ``use_rhs_kernel``...) and its
+:class:`hw581.cache.ResultCache` as keyword arguments and does the printing
+and plotting; the command line calls the same functions with the defaults,
+which are the script defaults, and without a cache.  Parts import what they
+need when they run, so ``python -m hw581 hw1 1`` loads neither matplotlib
+nor the PDE solvers:
+
+    python -m hw581 --list
+    python -m hw581 hw3 B C --out hw3_bc.npz
+
+Where a script needs more than the answers (grids for plotting, solve
+times, iteration counts), the part is split into a setup or solve function
+the script calls directly and a registered part that picks the answers.
+"""
+import time
+
+import numpy as np
+
+# (homework, part) -> (function, one-line description)
+PARTS = {}
+
+
+def part(homework, name, description):
+    def register(fun):
+        PARTS[(homework, name)] = (fun, description)
+        return fun
+    return register
+
+
+def run_part(homework, name, **options):
+    try:
+        fun, _ = PARTS[(homework, name)]
+    except KeyError:
+        raise KeyError(f"no part {name!r} in {homework!r}; see python -m hw581 --list") from None
+    return fun(**options)
+
+
+def _fetch(cache, name, compute, **inputs):
+    # cache=None computes without touching the disk
+    if cache is None:
+        return compute()
+    return cache.fetch(name, compute, **inputs)
+
+
+# ----------------------------------------------------------------- HW 1
+
+@part('hw1', '1', "Newton-Raphson and bisection on x sin(3x) - exp(x) (A1-A3)")
+def hw1_root_finding(x0=-1.6, x_left=-0.7, x_right=-0.4):
+    from hw581.rootfind import bisection, hw1_derivative, hw1_function, newton_raphson
+
+    A1, iterations_newton = newton_raphson(hw1_function, hw1_derivative, x0)
+    A2, iterations_bisection = bisection(hw1_function, x_left, x_right)
+    return {'A1': A1, 'A2': A2, 'A3': np.array([iterations_newton, iterations_bisection])}
+
+
+@part('hw1', '2', "Matrix and vector arithmetic (A4-A12)")
+def hw1_linear_algebra():
+    A = np.array([[1, 2], [-1, 1]])
+    B = np.array([[2, 0], [0, 2]])
+    C = np.array([[2, 0, -3], [0, 0, -1]])
+    D = np.array([[1, 2], [2, 3], [-1, 0]])
+    x = np.array([1, 0])
+    y = np.array([0, 1])
+    z = np.array([1, 2, -1])
+    return {'A4': A + B, 'A5': 3 * x - 4 * y, 'A6': A @ x, 'A7': B @ (x - y), 'A8': D @ x,
+            'A9': D @ y + z, 'A10': A @ B, 'A11': B @ C, 'A12': C @ D}
+
+
+# ------------------------------------------------------------ HW 2 and 3
+
+def harmonic_grid(L=4):
+    """The 81-point ``xspan`` of the HW 2 / HW 3 part A shooting."""
+    return np.linspace(-L, L, 81)
+
+
+def _shoot_harmonic_modes(n_modes, L, K, epsilon_n, d_epsilon):
+    # Each mode is bracketed by stepping d_epsilon up from the previous one
+    # and refined with Brent's method; every shot is kept, so no epsilon is
+    # integrated twice
+    from scipy.integrate import odeint
+
+    from hw581.shooting import CachedShot, find_eigenvalue, harmonic_shoot
+
+    xspan = harmonic_grid(L)
+
+    def shoot(epsilon):
+        return odeint(harmonic_shoot, [1, np.sqrt(L**2 - epsilon)], xspan, args=(epsilon, K))
+
+    def boundary_residual(y, epsilon):
+        return y[-1, 1] + np.sqrt(L**2 - epsilon) * y[-1, 0]
+
+    shots = CachedShot(shoot, boundary_residual)
+    eigenvalues = np.zeros(n_modes)
+    eigenfunctions = np.zeros((len(xspan), n_modes))
+    for n in range(n_modes):
+        eigenvalues[n] = find_eigenvalue(shots, epsilon_n, d_epsilon, max_step=1.0)
+        y = shots.solution(eigenvalues[n])
+        eigenfunctions[:, n] = abs(y[:, 0]) / np.sqrt(np.trapezoid(y[:, 0]**2, xspan))
+        epsilon_n = eigenvalues[n] + 0.1
+    return eigenfunctions, eigenvalues
+
+
+@part('hw3', 'A', "Harmonic oscillator eigenpairs by shooting (A1, A2)")
+@part('hw2', 'A', "Harmonic oscillator eigenpairs by shooting (A1, A2)")
+def harmonic_modes(n_modes=5, L=4, K=1, epsilon_n=0, d_epsilon=0.2, batch_shooting=False,
+                   cache=None):
+    """Part A of HW 2 and HW 3: ``A1`` the ``|phi_n|`` on :func:`harmonic_grid`, ``A2`` the eigenvalues.
+
+    ``batch_shooting`` shoots all modes together
+    (:func:`hw581.shooting.harmonic_eigenvalues`) instead of one odeint
+    search per mode.
+    """
+    def compute():
+        if batch_shooting:
+            from hw581.shooting import harmonic_eigenvalues
+
+            eigenvalues, eigenfunctions, _ = harmonic_eigenvalues(n_modes, L, K, harmonic_grid(L))
+            return eigenfunctions, eigenvalues
+        return _shoot_harmonic_modes(n_modes, L, K, epsilon_n, d_epsilon)
+
+    A1, A2 = _fetch(cache, 'hw3 part A', compute, L=L, K=K, x=harmonic_grid(L), epsilon_n=epsilon_n,
+                    d_epsilon=d_epsilon, n_max=n_modes, batch_shooting=batch_shooting)
+    return {'A1': A1, 'A2': A2}
+
+
+@part('hw3', 'B', "Finite-difference eigenpairs (A3, A4)")
+def hw3_finite_difference(n_modes=5, L=4, dx=0.1, cache=None):
+    from hw581.schrodinger import fd_eigenmodes
+
+    x = np.arange(-L, L + dx, dx)
+    eigenvals, eigenvecs, _ = _fetch(cache, 'fd_eigenmodes', lambda: fd_eigenmodes(n_modes, x=x),
+                                     n_modes=n_modes, x=x)
+    return {'A3': eigenvecs, 'A4': eigenvals}
+
+
+@part('hw3', 'C', "Nonlinear modes for gamma = +-0.05 (A5-A8)")
+def hw3_nonlinear(gamma=0.05, L=2, tol=1e-4, cache=None):
+    """Modes for ``+gamma`` (``A5``, ``A6``) and ``-gamma`` (``A7``, ``A8``) by Newton on ``(epsilon, A)``."""
+    from hw581.shooting import nonlinear_modes_newton
+
+    answers = {}
+    for sign, (vecs, vals) in ((1, ('A5', 'A6')), (-1, ('A7', 'A8'))):
+        eigenvals, eigenvecs, _ = _fetch(
+            cache, 'nonlinear_modes_newton', lambda: nonlinear_modes_newton(sign * gamma, L, tol=tol),
+            gamma=sign * gamma, L=L, tol=tol)
+        answers[vecs], answers[vals] = eigenvecs, eigenvals
+    return answers
+
+
+HW3_METHODS = ['RK45', 'RK23', 'Radau', 'BDF']
+HW3_TOLERANCES = [1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10]
+
+
+def hw3_step_sizes(methods=HW3_METHODS, tolerances=HW3_TOLERANCES, E=1, K=1, L=2, cache=None,
+                   log=None):
+    """Mean ``solve_ivp`` step of every method at every tolerance, ``{method: [steps]}``.
+
+    The cells come from :func:`hw581.convergence.convergence_study`, which
+    stores each one in ``cache`` (``None`` runs them all and stores nothing).
+    """
+    from hw581.cache import ResultCache
+    from hw581.convergence import convergence_study
+
+    if cache is None:
+        cache = ResultCache(enabled=False)
+    study = convergence_study([{'problem': 'harmonic', 'E': E, 'K': K, 'L': L}], methods, tolerances,
+                              cache, max_workers=1, log=log or (lambda message: None))
+    return {method: [study.get(problem='harmonic', E=E, K=K, L=L, method=method, tol=tol)['mean_step']
+                     for tol in tolerances]
+            for method in methods}
+
+
+def convergence_slopes(step_sizes, tolerances=HW3_TOLERANCES):
+    """Slope of ``log(tol)`` against ``log(mean step)`` for each method, in order."""
+    return [float(np.polyfit(np.log(steps), np.log(tolerances), 1)[0]) for steps in step_sizes.values()]
+
+
+@part('hw3', 'D', "Step size against tolerance for four solve_ivp methods (A9)")
+def hw3_convergence(methods=HW3_METHODS, tolerances=HW3_TOLERANCES, E=1, K=1, L=2, cache=None):
+    step_sizes = hw3_step_sizes(methods, tolerances, E, K, L, cache)
+    return {'A9': np.array(convergence_slopes(step_sizes, tolerances))}
+
+
+def hermite_errors(A1, A2, A3, A4, L=4, dx=0.1):
+    """Part E: errors of parts A (``A10``, ``A11``) and B (``A12``, ``A13``) against the Hermite functions."""
+    from scipy.special import eval_hermite, factorial
+
+    x = np.arange(-L, L + dx, dx)
+    n = A1.shape[1]
+    phi = np.column_stack([np.exp(-x**2 / 2) * eval_hermite(j, x)
+                           / np.sqrt(factorial(j) * 2**j * np.sqrt(np.pi)) for j in range(n)])
+    exact = 2 * np.arange(1, n + 1) - 1
+    return {'A10': np.trapezoid((np.abs(A1) - np.abs(phi))**2, x, axis=0),
+            'A11': 100 * np.abs(A2 - exact) / exact,
+            'A12': np.trapezoid((np.abs(A3) - np.abs(phi))**2, x, axis=0),
+            'A13': 100 * np.abs(A4 - exact) / exact}
+
+
+@part('hw3', 'E', "Errors of parts A and B against the Hermite functions (A10-A13)")
+def hw3_errors(cache=None):
+    shooting = harmonic_modes(cache=cache)
+    fd = hw3_finite_difference(cache=cache)
+    return hermite_errors(shooting['A1'], shooting['A2'], fd['A3'], fd['A4'])
+
+
+# ----------------------------------------------------------------- HW 4
+
+@part('hw4', 'A', "Periodic finite-difference matrices for m = 8 (A1-A3)")
+def hw4_matrices(m=8, L=20):
+    from hw581.operators import periodic_fd_matrices
+
+    A, B, C = periodic_fd_matrices(m, L, pin=None)
+    return {'A1': A.toarray(), 'A2': B.toarray(), 'A3': C.toarray()}
+
+
+# ----------------------------------------------------------------- HW 5
+
+def hw5_setup(nx=64, ny=64, Lx=20, Ly=20, nu=0.001):
+    """Times, grid, wavenumbers and Gaussian initial vorticity of 581_hw5.py."""
+    x = np.linspace(-Lx / 2, Lx / 2, nx + 1)[:nx]
+    y = np.linspace(-Ly / 2, Ly / 2, ny + 1)[:ny]
+    X, Y = np.meshgrid(x, y)
+    kx = (2 * np.pi / Lx) * np.concatenate((np.arange(0, nx / 2), np.arange(-nx / 2, 0)))
+    ky = (2 * np.pi / Ly) * np.concatenate((np.arange(0, ny / 2), np.arange(-ny / 2, 0)))
+    kx[0] = ky[0] = 1e-6
+    KX, KY = np.meshgrid(kx, ky)
+    return {'tspan': np.arange(0, 4.5, 0.5), 'nu': nu, 'nx': nx, 'ny': ny, 'Lx': Lx, 'Ly': Ly,
+            'x': x, 'y': y, 'X': X, 'Y': Y, 'K': KX**2 + KY**2,
+            'w0': np.exp(-X**2 - Y**2 / 20).flatten()}
+
+
+# Streamfunction solver options of the script
+HW5_OPTIONS = {'bicgstab': {'preconditioner': 'fft', 'rtol': 1e-4},
+               'gmres': {'preconditioner': 'fft', 'rtol': 1e-6},
+               'multigrid': {'cycle': 'V'}}
+
+
+def hw5_run(solver, setup=None, method='RK45', use_rhs_kernel=True, operator_mode='csr',
+            trajectory_dir=None, cache=None, **options):
+    """One timed vorticity solve of 581_hw5.py.
+
+    ``solver`` is ``'fft'`` (``spc_rhs``, or its preallocated kernel with
+    ``use_rhs_kernel``; ``method='BDF'`` or ``'Radau'`` integrate
+    :class:`hw581.vorticity.FDVorticity` with its sparse Jacobian),
+    ``'spectral'``, or a streamfunction solver of
+    :func:`hw581.poisson.make_psi_solver` (``'lu'`` is ``'direct'`` again)
+    with ``options`` on top of :data:`HW5_OPTIONS`.  ``operator_mode`` is
+    ``'csr'`` or ``'stencil'`` for ``A``, ``B`` and ``C``.  Returns
+    ``{'y': snapshots, 'solve_time': seconds}``, plus the Krylov
+    ``iterations`` or multigrid ``cycles`` of every streamfunction solve.
+    The time is measured inside the cached computation and stored with it.
+    ``trajectory_dir`` streams the RK45 ``'fft'`` solve to disk
+    (:mod:`hw581.trajectory`) and bypasses the cache.
+    """
+    from scipy.integrate import solve_ivp
+
+    s = hw5_setup() if setup is None else setup
+    tspan, w0, nu, m, L = s['tspan'], s['w0'], s['nu'], s['nx'], s['Lx']
+    options = dict(HW5_OPTIONS.get(solver, {}), **options)
+
+    def integrate(rhs, args=(), **solver_options):
+        return solve_ivp(rhs, (tspan[0], tspan[-1]), w0, t_eval=tspan, method=method, args=args,
+                         **solver_options).y
+
+    def fft_rhs():
+        if use_rhs_kernel:
+            from hw581.kernels import VorticityKernel
+
+            return VorticityKernel(s['K'], nu, L, copy_output=True), ()
+        from hw581.operators import PeriodicStencil, periodic_fd_matrices
+        from hw581.vorticity import spc_rhs
+
+        if operator_mode == 'stencil':
+            stencil = PeriodicStencil(m, L)
+            A, B, C = stencil.A, stencil.B, stencil.C
+        else:
+            A, B, C = periodic_fd_matrices(m, L)
+        return spc_rhs, (s['nx'], s['ny'], s['K'], nu, A, B, C)
+
+    def compute():
+        from hw581.vorticity import FDVorticity
+
+        run = {}
+        start = time.perf_counter()
+        if solver == 'fft' and method in ('BDF', 'Radau'):
+            vorticity = FDVorticity(m, L, nu, psi_solver='fft')
+            run['y'] = integrate(vorticity, jac=vorticity.jac)
+        elif solver == 'fft':
+            rhs, args = fft_rhs()
+            if trajectory_dir:
+                from hw581.trajectory import integrate_to_store
+
+                run['y'] = integrate_to_store(rhs, tspan, w0, trajectory_dir, method=method, args=args).y
+            else:
+                run['y'] = integrate(rhs, args)
+        elif solver == 'spectral':
+            from hw581.spectral import SpectralVorticity
+
+            run['y'] = integrate(SpectralVorticity(s['nx'], s['ny'], s['Lx'], s['Ly'], nu).rhs)
+        else:
+            psi_solver = 'direct' if solver == 'lu' else solver
+            vorticity = FDVorticity(m, L, nu, psi_solver, operators=operator_mode, **options)
+            run['y'] = integrate(vorticity.rhs)
+            if solver in ('bicgstab', 'gmres'):
+                run['iterations'] = np.array(vorticity.psi_solver.iterations)
+            elif solver == 'multigrid':
+                run['cycles'] = np.array(vorticity.psi_solver.cycles)
+        run['solve_time'] = time.perf_counter() - start
+        return run
+
+    if trajectory_dir and solver == 'fft' and method not in ('BDF', 'Radau'):
+        return compute()
+    return _fetch(cache, f'hw5 {solver}', compute, w0=w0, t=tspan, nu=nu, nx=s['nx'], ny=s['ny'],
+                  Lx=s['Lx'], Ly=s['Ly'], method=method, kernel=use_rhs_kernel,
+                  operator_mode=operator_mode, **options)
+
+
+@part('hw5', 'fft', "Vorticity with the FFT streamfunction (A1)")
+def hw5_fft(cache=None, **options):
+    return {'A1': hw5_run('fft', cache=cache, **options)['y']}
+
+
+@part('hw5', 'spectral', "Vorticity with every derivative spectral (A_sp)")
+def hw5_spectral(cache=None, **options):
+    return {'A_sp': hw5_run('spectral', cache=cache, **options)['y']}
+
+
+@part('hw5', 'direct', "Vorticity with the sparse LU streamfunction (A2; A3 is the same solve)")
+def hw5_direct(cache=None, **options):
+    return {'A2': hw5_run('direct', cache=cache, **options)['y']}
+
+
+@part('hw5', 'bicgstab', "Vorticity with FFT-preconditioned BiCGSTAB (A4)")
+def hw5_bicgstab(cache=None, **options):
+    return {'A4': hw5_run('bicgstab', cache=cache, **options)['y']}
+
+
+@part('hw5', 'gmres', "Vorticity with FFT-preconditioned GMRES (A5)")
+def hw5_gmres(cache=None, **options):
+    return {'A5': hw5_run('gmres', cache=cache, **options)['y']}
+
+
+@part('hw5', 'multigrid', "Vorticity with the multigrid streamfunction (A6)")
+def hw5_multigrid(cache=None, **options):
+    return {'A6': hw5_run('multigrid', cache=cache, **options)['y']}
+
+
+# ----------------------------------------------------------------- HW 6
+
+def _spiral(X, Y, m=1):
+    r = np.sqrt(X**2 + Y**2)
+    theta = np.arctan2(Y, X)
+    return np.tanh(r) * np.cos(m * theta - r), np.tanh(r) * np.sin(m * theta - r)
+
+
+def hw6_fourier_setup(nx=64, ny=64, Lx=20, Ly=20, m=1):
+    """Times, grid, wavenumbers and spiral initial state of the Fourier part of 581_hw6.py."""
+    from scipy.fft import fft2
+
+    x = np.linspace(-Lx / 2, Lx / 2, nx + 1)[:nx]
+    y = np.linspace(-Ly / 2, Ly / 2, ny + 1)[:ny]
+    X, Y = np.meshgrid(x, y)
+    kx = (2 * np.pi / Lx) * np.concatenate((np.arange(0, nx / 2), np.arange(-nx / 2, 0)))
+    ky = (2 * np.pi / Ly) * np.concatenate((np.arange(0, ny / 2), np.arange(-ny / 2, 0)))
+    kx[0] = ky[0] = 1e-6
+    KX, KY = np.meshgrid(kx, ky)
+    u, v = _spiral(X, Y, m)
+    return {'tspan': np.arange(0, 4.5, 0.5), 'nx': nx, 'ny': ny, 'Lx': Lx, 'Ly': Ly, 'N': nx * ny,
+            'x': x, 'y': y, 'X': X, 'Y': Y, 'K': KX**2 + KY**2, 'u': u, 'v': v,
+            'uv_hat0': np.hstack([fft2(u).ravel(), fft2(v).ravel()])}
+
+
+def hw6_fourier_solution(setup=None, integrator='RK45', use_rhs_kernel=True, trajectory_dir=None,
+                         D1=0.1, D2=0.1, beta=1):
+    """Complex Fourier snapshots ``hstack([u_hat, v_hat])`` at every time, shape ``(2N, T)``.
+
+    ``integrator`` is ``'RK45'`` (on ``rhs_fourier``, or its kernel with
+    ``use_rhs_kernel``; ``trajectory_dir`` streams it to disk),
+    ``'RK45-real'`` (the packed ``rfft2`` half spectra) or ``'ETDRK4'``.
+    """
+    from scipy.integrate import solve_ivp
+
+    from hw581.lambda_omega import LambdaOmegaFourier, rhs_fourier
+
+    s = hw6_fourier_setup() if setup is None else setup
+    tspan, uv_hat0 = s['tspan'], s['uv_hat0']
+    if integrator == 'ETDRK4':
+        return LambdaOmegaFourier(s['nx'], s['ny'], s['Lx'], s['Ly'], D1, D2, beta).etdrk4(
+            uv_hat0, tspan, dt=0.1)
+    if integrator == 'RK45-real':
+        lo = LambdaOmegaFourier(s['nx'], s['ny'], s['Lx'], s['Ly'], D1, D2, beta)
+        sol = solve_ivp(lo.rhs_real, (tspan[0], tspan[-1]), lo.pack(s['u'], s['v']), method='RK45',
+                        t_eval=tspan)
+        return np.column_stack([lo.full_state(y) for y in sol.y.T])
+    if use_rhs_kernel:
+        from hw581.kernels import FourierLambdaOmegaKernel
+
+        rhs, args = FourierLambdaOmegaKernel(s['K'], D1, D2, beta, copy_output=True), ()
+    else:
+        rhs, args = rhs_fourier, (s['K'], s['N'], s['nx'], s['ny'], D1, D2, beta)
+    if trajectory_dir:
+        from hw581.trajectory import integrate_to_store
+
+        return integrate_to_store(rhs, tspan, uv_hat0, trajectory_dir, args=args, method='RK45').y
+    return solve_ivp(rhs, (tspan[0], tspan[-1]), uv_hat0, args=args, method='RK45', t_eval=tspan).y
+
+
+@part('hw6', 'fft', "Lambda-omega spiral, Fourier spectral (A1)")
+def hw6_fourier(**options):
+    return {'A1': np.real(hw6_fourier_solution(**options))}
+
+
+def hw6_chebyshev_setup(N=30, L=20, m=1):
+    """Chebyshev ``Dxx``, grid and spiral initial state of the Chebyshev part of 581_hw6.py."""
+    from hw581.chebyshev import dirichlet_dxx
+
+    Dxx, x = dirichlet_dxx(N, L)
+    X, Y = np.meshgrid(x, x)
+    u, v = _spiral(X, Y, m)
+    return {'tspan': np.arange(0, 4.5, 0.5), 'N': N, 'L': L, 'N2': (N + 1)**2, 'Dxx': Dxx,
+            'x': x, 'y': x, 'X': X, 'Y': Y, 'uv0': np.hstack([u.ravel(), v.ravel()])}
+
+
+def hw6_chebyshev_solution(setup=None, integrator='RK45', method='matrix', use_rhs_kernel=True,
+                           trajectory_dir=None, D1=0.1, D2=0.1, beta=1):
+    """Chebyshev snapshots ``hstack([u, v])`` at every time, shape ``(2 N2, T)``.
+
+    ``method`` is the Laplacian of :func:`hw581.chebyshev.chebyshev_laplacian`.
+    ``integrator`` is ``'RK45'`` (on ``LRS_2D``, or its kernel with
+    ``use_rhs_kernel`` and ``method='matrix'``; ``trajectory_dir`` streams it
+    to disk), ``'SBDF2'`` or ``'IMEX-Euler'`` (fast diagonalization of
+    ``Dxx``), or ``'BDF'`` / ``'Radau'`` with the exact sparse Jacobian.
+    """
+    from scipy.integrate import solve_ivp
+
+    from hw581.chebyshev import chebyshev_laplacian
+    from hw581.lambda_omega import LRS_2D, LambdaOmegaChebyshev
+
+    s = hw6_chebyshev_setup() if setup is None else setup
+    tspan, uv0 = s['tspan'], s['uv0']
+    if integrator in ('SBDF2', 'IMEX-Euler'):
+        scheme = 'SBDF2' if integrator == 'SBDF2' else 'euler'
+        lo = LambdaOmegaChebyshev(s['N'], s['L'], D1, D2, beta, method)
+        return lo.imex(uv0, tspan, dt=0.025, scheme=scheme)
+    if integrator in ('BDF', 'Radau'):
+        lo = LambdaOmegaChebyshev(s['N'], s['L'], D1, D2, beta, method)
+        return solve_ivp(lo, (tspan[0], tspan[-1]), uv0, method=integrator, jac=lo.jac, t_eval=tspan).y
+    if use_rhs_kernel and method == 'matrix':
+        from hw581.kernels import ChebyshevLambdaOmegaKernel
+
+        rhs, args = ChebyshevLambdaOmegaKernel(s['Dxx'], D1, D2, beta, copy_output=True), ()
+    else:
+        rhs, args = LRS_2D, (chebyshev_laplacian(s['N'], s['L'], method).operator, s['N2'], D1, D2, beta)
+    if trajectory_dir:
+        from hw581.trajectory import integrate_to_store
+
+        return integrate_to_store(rhs, tspan, uv0, trajectory_dir, args=args, method='RK45').y
+    return solve_ivp(rhs, (tspan[0], tspan[-1]), uv0, args=args, method='RK45', t_eval=tspan).y
+
+
+@part('hw6', 'chebyshev', "Lambda-omega spiral, Chebyshev collocation (A2)")
+def hw6_chebyshev(**options):
+    return {'A2': hw6_chebyshev_solution(**options)}
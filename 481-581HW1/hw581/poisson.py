@@ -0,0 +1,173 @@
+"""Streamfunction solvers for ``A psi = w`` on the HW 4 grid."""
+import numpy as np
+from scipy.fft import fft2, ifft2, fftfreq, irfft2, rfft2, rfftfreq
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, spilu, splu
+
+from hw581.operators import periodic_fd_matrices
+
+_factor_cache = {}
+
+
+def poisson_factor(m, L, pin=2.0):
+    """Return a cached sparse LU (SuperLU) of the pinned Laplacian ``A``.
+
+    The factorization is computed once per ``(m, L, pin)`` and shared by
+    every later call in the process, so a Poisson solve inside an RHS is just
+    ``poisson_factor(m, L).solve(w)``.  Cholesky is not an option here:
+    with ``A[0, 0] = 2`` neither ``A`` nor ``-A`` is definite.
+    """
+    key = (m, float(L), pin)
+    lu = _factor_cache.get(key)
+    if lu is None:
+        A = periodic_fd_matrices(m, L, pin)[0]
+        # A has a symmetric pattern, so order on A + A^T
+        lu = splu(A.tocsc(), permc_spec='MMD_AT_PLUS_A')
+        _factor_cache[key] = lu
+    return lu
+
+
+def clear_poisson_cache():
+    _factor_cache.clear()
+
+
+def poisson_preconditioner(name, m, L, pin=2.0):
+    """Build a preconditioner ``M ~ A^-1`` for the Krylov solvers.
+
+    ``'ilu'`` is an incomplete LU of ``A``, ``'jacobi'`` the inverse diagonal,
+    ``'fft'`` the exact inverse of the periodic 5-point Laplacian applied
+    with FFTs and ``'mg'`` one multigrid V-cycle.  Pinning ``A[0, 0]`` adds
+    the rank-1 term ``(pin + 4/dx^2) e_0 e_0^T`` to the periodic operator,
+    which couples every Fourier mode; ``'fft'`` only approximates it, by
+    replacing the zero eigenvalue of the constant mode with the Rayleigh
+    quotient ``(pin + 4/dx^2) / m^2`` of ``A`` on the constant vector and
+    leaving the other modes as they are.
+    """
+    n = m * m
+    if name == 'ilu':
+        A = periodic_fd_matrices(m, L, pin)[0]
+        ilu = spilu(A.tocsc(), drop_tol=1e-4, fill_factor=10)
+        return LinearOperator((n, n), matvec=ilu.solve, dtype=float)
+    if name == 'jacobi':
+        A = periodic_fd_matrices(m, L, pin)[0]
+        inv_diag = 1 / A.diagonal()
+        return LinearOperator((n, n), matvec=lambda r: inv_diag * r, dtype=float)
+    if name == 'fft':
+        dx = L / m
+        k = 2 * np.pi * np.arange(m) / m
+        c = 2 * np.cos(k) - 2
+        eig = (c[:, np.newaxis] + c[np.newaxis, :]) / dx**2
+        eig[0, 0] = ((pin if pin is not None else 0) + 4 / dx**2) / n
+        inv_eig = 1 / eig
+
+        def apply(r):
+            r_hat = fft2(np.reshape(r, (m, m)))
+            return np.real(ifft2(inv_eig * r_hat)).ravel()
+
+        return LinearOperator((n, n), matvec=apply, dtype=float)
+    if name == 'mg':
+        from hw581.multigrid import MultigridPoisson
+        return MultigridPoisson(m, L, pin).as_preconditioner()
+    raise ValueError(f"unknown preconditioner {name!r}")
+
+
+class KrylovPoisson:
+    """Preconditioned, warm-started BiCGSTAB/GMRES solve of ``A psi = w``.
+
+    Each call to :meth:`solve` starts from the previous ``psi`` and appends
+    its iteration count to ``iterations``.  With ``record_residuals=True`` it
+    also appends its residual norms (relative to ``|w|``) to
+    ``residual_history``; for BiCGSTAB that costs an extra ``A @ x`` per
+    iteration, so it is off by default.  GMRES reports its preconditioned
+    residual norms instead.  ``preconditioner`` is a name accepted by
+    :func:`poisson_preconditioner`, a ready ``LinearOperator`` or ``None``.
+    """
+
+    def __init__(self, A, m, L, method='bicgstab', preconditioner='fft',
+                 rtol=1e-4, pin=2.0, warm_start=True, record_residuals=False):
+        if method not in ('bicgstab', 'gmres'):
+            raise ValueError(f"unknown Krylov method {method!r}")
+        self.A = A
+        self.method = method
+        self.rtol = rtol
+        self.warm_start = warm_start
+        self.record_residuals = record_residuals
+        if isinstance(preconditioner, str):
+            preconditioner = poisson_preconditioner(preconditioner, m, L, pin)
+        self.M = preconditioner
+        self.psi = None
+        self.iterations = []
+        self.residual_history = []
+        self.failures = 0
+
+    def solve(self, w):
+        residuals = []
+        count = [0]
+        w_norm = np.linalg.norm(w) or 1.0
+        x0 = self.psi if self.warm_start else None
+
+        if self.method == 'bicgstab':
+            def callback(xk):
+                count[0] += 1
+                if self.record_residuals:
+                    residuals.append(np.linalg.norm(w - self.A @ xk) / w_norm)
+
+            psi, info = bicgstab(self.A, w, x0=x0, rtol=self.rtol, M=self.M,
+                                 callback=callback)
+        else:
+            def callback(pr_norm):
+                count[0] += 1
+                if self.record_residuals:
+                    residuals.append(pr_norm)
+
+            psi, info = gmres(self.A, w, x0=x0, rtol=self.rtol, M=self.M,
+                              callback=callback, callback_type='pr_norm')
+
+        if info != 0:
+            self.failures += 1
+        self.iterations.append(count[0])
+        if self.record_residuals:
+            self.residual_history.append(residuals)
+        self.psi = psi
+        return psi
+
+
+class FFTPoisson:
+    """Spectral inverse of the continuous Laplacian, as in ``spc_rhs``.
+
+    ``psi_hat = -w_hat / K`` with the zero mode of ``psi`` set to zero rather
+    than regularising ``K[0, 0]``.
+    """
+
+    def __init__(self, m, L):
+        self.m = m
+        kx = 2 * np.pi / L * rfftfreq(m, 1 / m)
+        ky = 2 * np.pi / L * fftfreq(m, 1 / m)
+        KX, KY = np.meshgrid(kx, ky)
+        K = KX**2 + KY**2
+        K[0, 0] = np.inf
+        self.minus_K_inv = -1 / K
+
+    def solve(self, w):
+        w_hat = rfft2(np.reshape(w, (self.m, self.m)))
+        return irfft2(self.minus_K_inv * w_hat, s=(self.m, self.m)).ravel()
+
+
+def make_psi_solver(name, m, L, A=None, pin=2.0, **options):
+    """Return a streamfunction solver with a ``solve(w)`` method.
+
+    ``name`` is one of ``'fft'``, ``'direct'``, ``'bicgstab'``, ``'gmres'``
+    or ``'multigrid'``; ``options`` go to the solver class.  The Krylov
+    solvers need the operator ``A`` they iterate on.
+    """
+    if name == 'fft':
+        return FFTPoisson(m, L)
+    if name == 'direct':
+        return poisson_factor(m, L, pin)
+    if name in ('bicgstab', 'gmres'):
+        if A is None:
+            A = periodic_fd_matrices(m, L, pin)[0]
+        return KrylovPoisson(A, m, L, name, pin=pin, **options)
+    if name == 'multigrid':
+        from hw581.multigrid import MultigridPoisson
+        return MultigridPoisson(m, L, pin, **options)
+    raise ValueError(f"unknown psi solver {name!r}")
@@ -0,0 +1,160 @@
+"""Render a sequence of 2D fields to a GIF or MP4 without temporary files.
+
+Each worker process sets up one Agg figure and reads every frame's pixels
+straight from its canvas buffer.  With levels shared by all frames the
+axes, ticks and colour bar are drawn once and each frame only redraws the
+filled contours and the title.  Frames are handed to a process pool a few
+chunks at a time, come back in order and are appended to an incremental
+``imageio`` writer as they arrive, so neither PNG files nor more than a
+few chunks of frames are ever kept.
+
+MP4 (and the other ffmpeg formats) needs the optional ``imageio-ffmpeg``
+package; GIFs only need ``imageio`` and pillow.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+_figure = None
+
+
+def _setup_figure(x, y, levels, cmap, figsize, dpi):
+    # A bare Figure on an Agg canvas, so the caller's pyplot backend is untouched
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+    from matplotlib.figure import Figure
+
+    global _figure
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    shared = np.ndim(levels) > 0
+    norm = Normalize(levels[0], levels[-1]) if shared else Normalize(0, 1)
+    colorbar = fig.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax)
+    ax.set_xlim(x[0], x[-1])
+    ax.set_ylim(y[0], y[-1])
+    ax.set_autoscale_on(False)
+
+    # With shared levels the axes, ticks and colour bar never change: draw
+    # them once and blit
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox) if shared else None
+    _figure = {'fig': fig, 'ax': ax, 'canvas': canvas, 'background': background,
+               'colorbar': colorbar, 'x': x, 'y': y, 'levels': levels, 'cmap': cmap}
+
+
+def _draw_full(field, title):
+    # Levels of this frame only, as contourf(..., levels=n) picks them; the
+    # colour bar follows, so the whole figure is drawn
+    state = _figure
+    ax, canvas = state['ax'], state['canvas']
+    contours = ax.contourf(state['x'], state['y'], field, levels=state['levels'], cmap=state['cmap'])
+    state['colorbar'].update_normal(contours)
+    ax.set_title(title)
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba())[..., :3].copy()
+    contours.remove()
+    return image
+
+
+def _draw(item):
+    field, title = item
+    state = _figure
+    if state['background'] is None:
+        return _draw_full(field, title)
+    ax, canvas = state['ax'], state['canvas']
+    canvas.restore_region(state['background'])
+    contours = ax.contourf(state['x'], state['y'], field, levels=state['levels'],
+                           cmap=state['cmap'], extend='both')
+    ax.draw_artist(contours)
+    for spine in ax.spines.values():
+        ax.draw_artist(spine)
+    ax.title.set_text(title)
+    ax.draw_artist(ax.title)
+    image = np.asarray(canvas.buffer_rgba())[..., :3].copy()
+    contours.remove()
+    return image
+
+
+def _draw_chunk(items):
+    return [_draw(item) for item in items]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _open_writer(path, fps):
+    import imageio.v2 as imageio
+
+    if path.lower().endswith('.gif'):
+        # The pillow GIF writer takes the frame duration in milliseconds
+        return imageio.get_writer(path, mode='I', duration=1000 / fps, loop=0)
+    try:
+        import imageio_ffmpeg  # noqa: F401
+    except ImportError:
+        raise ImportError(f"writing {os.path.basename(path)!r} needs the optional imageio-ffmpeg "
+                          "package (pip install imageio-ffmpeg); .gif files do not") from None
+    return imageio.get_writer(path, fps=fps)
+
+
+def render_animation(frames, x, y, path, titles=None, fps=5, cmap='twilight', levels=100,
+                     shared_levels=False, workers=None, figsize=(6.4, 4.8), dpi=100, chunksize=4):
+    """Write ``frames`` (shape ``(T, ny, nx)``) as an animation to ``path``.
+
+    By default every frame gets its own contour levels and colour bar, as
+    ``contourf(..., levels=levels)`` per frame did in the notebook.  With
+    ``shared_levels=True`` (or an array of ``levels``) all frames use the
+    same levels (``levels`` equally spaced values over the global range),
+    so the colour bar is drawn once and stays fixed, and each frame is
+    quicker to draw.  ``fps`` sets the frame rate for both GIF and MP4 (MP4
+    needs ``imageio-ffmpeg``).  ``workers=1`` renders in this process;
+    otherwise chunks of ``chunksize`` frames are drawn by a process pool,
+    at most two chunks per worker in flight.
+    """
+    frames = np.asarray(frames)
+    if titles is None:
+        titles = [f'Frame: {j}' for j in range(len(frames))]
+    if np.ndim(levels) == 0 and shared_levels:
+        lo, hi = np.nanmin(frames), np.nanmax(frames)
+        if hi == lo:
+            hi = lo + 1
+        levels = np.linspace(lo, hi, int(levels))
+    elif np.ndim(levels) > 0:
+        levels = np.asarray(levels)
+    setup = (np.asarray(x), np.asarray(y), levels, cmap, figsize, dpi)
+
+    writer = _open_writer(path, fps)
+    items = zip(frames, titles)
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(frames))
+    try:
+        if workers <= 1:
+            _setup_figure(*setup)
+            for image in map(_draw, items):
+                writer.append_data(image)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_setup_figure, initargs=setup) as pool:
+                # Executor.map would submit every frame at once; keep a
+                # bounded window of chunks instead and write them in order
+                pending = deque()
+                for chunk in _chunks(items, chunksize):
+                    pending.append(pool.submit(_draw_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        for image in pending.popleft().result():
+                            writer.append_data(image)
+                while pending:
+                    for image in pending.popleft().result():
+                        writer.append_data(image)
+    finally:
+        writer.close()
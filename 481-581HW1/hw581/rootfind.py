@@ -0,0 +1,183 @@
+"""Root finders of HW 1.
+
+:func:`newton_raphson` and :func:`bisection` are the scalar iterations of
+``581 HW 1.py``, with the function (and derivative) passed in instead of
+read from the script's globals; both return the array of iterates and its
+length, which is what A1 to A3 record.  Each keeps the last function
+value instead of evaluating it twice.
+
+:func:`newton_batch` and :func:`bisection_batch` run the same iterations
+on arrays of starts or brackets at once, masking out the roots that have
+converged, and count the function evaluations of every root.
+"""
+import numpy as np
+
+
+def hw1_function(x):
+    return x * np.sin(3 * x) - np.exp(x)
+
+
+def hw1_derivative(x):
+    return np.sin(3 * x) + 3 * x * np.cos(3 * x) - np.exp(x)
+
+
+def newton_raphson(f, f_prime, x0, tol=1e-6, max_iter=1000):
+    x_values = [x0]
+    f0 = f(x0)
+    for _ in range(max_iter):
+        x_new = x0 - f0 / f_prime(x0)
+        x_values.append(x_new)
+        f0 = f(x_new)  # reused as f(x0) by the next step
+        if abs(f0) < tol:
+            break
+        x0 = x_new
+    return np.array(x_values), len(x_values)
+
+
+def bisection(f, x_left, x_right, tol=1e-6, max_iter=1000):
+    x_mid_values = []
+    f_left = f(x_left)
+    for j in range(max_iter):
+        x_mid = (x_left + x_right) / 2
+        x_mid_values.append(x_mid)
+        f_mid = f(x_mid)
+        if abs(f_mid) < tol:
+            break
+        if f_left * f_mid < 0:
+            x_right = x_mid
+        else:
+            x_left, f_left = x_mid, f_mid
+    return np.array(x_mid_values), len(x_mid_values)
+
+
+def sign_change_brackets(f, x):
+    """Brackets ``(x_left, x_right)`` of the sign changes of ``f`` on the grid ``x``.
+
+    One vectorized call of ``f``; feeds :func:`bisection_batch` or the
+    safeguarded :func:`newton_batch` when many roots are wanted at once.
+    """
+    x = np.asarray(x, dtype=float)
+    fx = f(x)
+    i = np.flatnonzero(np.sign(fx[:-1]) * np.sign(fx[1:]) <= 0)
+    return x[i], x[i + 1]
+
+
+def newton_batch(f, f_prime, x0, tol=1e-6, max_iter=1000, bracket=None):
+    """Newton-Raphson from every entry of ``x0`` at once.
+
+    ``f`` and ``f_prime`` must act elementwise on arrays; each iteration
+    calls them once, on the roots still running.  ``f`` at the current
+    iterate is kept from the previous iteration, so a start costs one
+    ``f`` and one ``f_prime`` evaluation per step, plus the first ``f``.
+    Each root stops on its own when ``|f| < tol``, as in
+    :func:`newton_raphson`, whose iterates a single unbracketed start
+    reproduces.
+
+    With ``bracket=(x_left, x_right)`` around every start the iteration is
+    safeguarded: the bracket keeps a sign change of ``f`` and shrinks
+    with every iterate, and a Newton step that leaves it (or divides by a
+    zero derivative) is replaced by the bracket midpoint, so each root
+    converges at least as fast as bisection.  Both ends are evaluated once
+    (counted in ``nfev``), and a start whose bracket has no sign change
+    stops unconverged before its first step.  Without a bracket a start
+    whose step is not finite stops unconverged.
+
+    Returns a dict of arrays shaped like ``x0``: ``root``, ``converged``,
+    ``n_iter`` (Newton or bisection steps), ``nfev`` and ``njev`` (calls
+    of ``f`` and ``f_prime`` per root).
+    """
+    x = np.array(x0, dtype=float)
+    shape = x.shape
+    x = x.ravel()
+    n = len(x)
+    fx = f(x)
+    nfev = np.ones(n, dtype=int)
+    njev = np.zeros(n, dtype=int)
+    n_iter = np.zeros(n, dtype=int)
+    converged = np.abs(fx) < tol
+    running = ~converged & np.isfinite(fx)
+    if bracket is not None:
+        left = np.broadcast_to(np.asarray(bracket[0], dtype=float), shape).ravel().copy()
+        right = np.broadcast_to(np.asarray(bracket[1], dtype=float), shape).ravel().copy()
+        f_left = f(left)
+        f_right = f(right)
+        nfev += 2
+        running &= np.sign(f_left) != np.sign(f_right)
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(running)
+        if not active.size:
+            break
+        xa = x[active]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = fx[active] / f_prime(xa)
+        njev[active] += 1
+        x_new = xa - step
+        if bracket is not None:
+            a, b = left[active], right[active]
+            outside = ~((x_new - a) * (x_new - b) < 0)
+            x_new[outside] = (a[outside] + b[outside]) / 2
+        else:
+            stuck = ~np.isfinite(x_new)
+            running[active[stuck]] = False
+            active, x_new = active[~stuck], x_new[~stuck]
+        f_new = f(x_new)
+        nfev[active] += 1
+        n_iter[active] += 1
+        x[active] = x_new
+        fx[active] = f_new
+        if bracket is not None:
+            same = np.sign(f_new) == np.sign(f_left[active])
+            left[active[same]] = x_new[same]
+            f_left[active[same]] = f_new[same]
+            right[active[~same]] = x_new[~same]
+        done = np.abs(f_new) < tol
+        converged[active[done]] = True
+        running[active[done]] = False
+
+    return {'root': x.reshape(shape), 'converged': converged.reshape(shape),
+            'n_iter': n_iter.reshape(shape), 'nfev': nfev.reshape(shape),
+            'njev': njev.reshape(shape)}
+
+
+def bisection_batch(f, x_left, x_right, tol=1e-6, max_iter=1000):
+    """Bisection on every bracket ``[x_left, x_right]`` at once.
+
+    Same midpoints and stopping rule (``|f(mid)| < tol``) as
+    :func:`bisection`, but ``f`` at the left end is kept instead of being
+    re-evaluated, so each step costs one call of ``f`` (vectorized over
+    the brackets still running) plus one at the start.  Returns a dict
+    like :func:`newton_batch`'s, without ``njev``.
+    """
+    left, right = np.broadcast_arrays(np.array(x_left, dtype=float), np.array(x_right, dtype=float))
+    shape = left.shape
+    left, right = left.ravel().copy(), right.ravel().copy()
+    n = len(left)
+    f_left = f(left)
+    nfev = np.ones(n, dtype=int)
+    n_iter = np.zeros(n, dtype=int)
+    mid = (left + right) / 2
+    converged = np.zeros(n, dtype=bool)
+    running = np.ones(n, dtype=bool)
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(running)
+        if not active.size:
+            break
+        a, b = left[active], right[active]
+        m = (a + b) / 2
+        f_mid = f(m)
+        nfev[active] += 1
+        n_iter[active] += 1
+        mid[active] = m
+        done = np.abs(f_mid) < tol
+        converged[active[done]] = True
+        running[active[done]] = False
+        go_left = f_left[active] * f_mid < 0
+        right[active[go_left]] = m[go_left]
+        moved = active[~go_left]
+        left[moved] = m[~go_left]
+        f_left[moved] = f_mid[~go_left]
+
+    return {'root': mid.reshape(shape), 'converged': converged.reshape(shape),
+            'n_iter': n_iter.reshape(shape), 'nfev': nfev.reshape(shape)}
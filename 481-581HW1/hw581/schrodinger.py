@@ -0,0 +1,68 @@
+"""Finite-difference eigenmodes of the harmonic oscillator (HW 3 part B).
+
+The script discretises ``-phi'' + K x^2 phi = eps phi`` on the interior
+points of ``x`` and eliminates the two end values with the one-sided
+conditions ``phi_0 = 4/3 phi_1 - 1/3 phi_2`` (and the mirror image at the
+right end), which leaves a tridiagonal ``-H`` whose first and last
+off-diagonal pairs are ``(-2/3, -1)`` instead of ``(-1, -1)``.  The
+diagonal similarity ``S = diag(sqrt(3/2), 1, ..., 1, sqrt(3/2))`` turns
+both pairs into ``-sqrt(2/3)``, so ``S (-H) S^-1`` is symmetric with the
+same eigenvalues and eigenvectors ``S v``.  Only its two diagonals are
+stored, so grids of 10^5 to 10^6 points take O(n) memory.
+"""
+import numpy as np
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse import diags
+from scipy.sparse.linalg import eigsh
+
+
+def symmetric_diagonals(x, K=1):
+    """Diagonal and off-diagonal of the symmetrised ``-H`` on the interior of ``x``.
+
+    ``x`` must be uniform; the eigenvalues of the matrix are ``dx**2 eps``.
+    """
+    dx = x[1] - x[0]
+    d = 2 + dx**2 * K * x[1:-1]**2
+    d[0] -= 4 / 3
+    d[-1] -= 4 / 3
+    e = -np.ones(len(d) - 1)
+    e[0] = e[-1] = -np.sqrt(2 / 3)
+    return d, e
+
+
+def fd_eigenmodes(n_modes, L=4, K=1, x=None, dx=0.1, method='tridiagonal', sigma=0.0):
+    """Lowest ``n_modes`` eigenvalues and ``|phi|`` of the part B operator.
+
+    ``method='tridiagonal'`` computes only the wanted eigenpairs with
+    LAPACK's symmetric tridiagonal bisection and inverse iteration
+    (``eigh_tridiagonal``, O(n) per mode).  ``method='shift-invert'`` runs
+    ARPACK's ``eigsh`` on the sparse matrix around ``sigma``, which finds
+    the modes nearest ``sigma`` instead of the lowest ones.  Eigenfunctions
+    get their end values back from the boundary conditions and are
+    normalised with ``trapezoid`` as in the script.  Returns
+    ``(eigenvalues, eigenfunctions, x)`` with eigenfunctions as columns.
+
+    The matrix eigenvalues are ``dx**2 eps`` against entries near 2, so
+    bisection resolves ``eps`` only to about ``1e-16 / dx**2`` (5e-7 at
+    10^6 points); shift-invert keeps a few more digits on such grids.
+    """
+    if x is None:
+        x = np.arange(-L, L + dx, dx)
+    dx = x[1] - x[0]
+    d, e = symmetric_diagonals(x, K)
+    if method == 'tridiagonal':
+        lam, W = eigh_tridiagonal(d, e, select='i', select_range=(0, n_modes - 1))
+    elif method == 'shift-invert':
+        T = diags([e, d, e], [-1, 0, 1], format='csc')
+        lam, W = eigsh(T, k=n_modes, sigma=sigma * dx**2, which='LM')
+        order = np.argsort(lam)
+        lam, W = lam[order], W[:, order]
+    else:
+        raise ValueError(f"unknown eigensolver {method!r}")
+
+    # Undo the similarity: v = S^-1 w
+    W[0] /= np.sqrt(3 / 2)
+    W[-1] /= np.sqrt(3 / 2)
+    phi = np.vstack([4 / 3 * W[0] - 1 / 3 * W[1], W, 4 / 3 * W[-1] - 1 / 3 * W[-2]])
+    phi /= np.sqrt(np.trapezoid(phi**2, x, axis=0))
+    return lam / dx**2, np.abs(phi), x
@@ -0,0 +1,331 @@
+"""Shooting solvers for the eigenvalue problems of HW 2 and HW 3."""
+import numpy as np
+from scipy.integrate import solve_ivp
+
+
+def _mul(P, Q):
+    # 2 x 2 matrix product on (a, b, c, d) component arrays, [[a, b], [c, d]]
+    a, b, c, d = P
+    e, f, g, h = Q
+    return (a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h)
+
+
+def _rk4_propagators(x, epsilon, K, substeps):
+    # phi'' = (K x^2 - eps) phi is linear, y' = [[0, 1], [q(x), 0]] y, so one
+    # RK4 step is a 2 x 2 matrix.  Its entries are polynomials in h and the
+    # three q values of the step; build them for every substep and every eps
+    # at once, as component arrays, and multiply them over each interval.
+    h = (np.diff(x) / substeps)[:, np.newaxis, np.newaxis]
+    x0 = x[:-1, np.newaxis, np.newaxis] + h * np.arange(substeps)[:, np.newaxis]
+    q0 = K * x0**2 - epsilon
+    qh = K * (x0 + h / 2)**2 - epsilon
+    q1 = K * (x0 + h)**2 - epsilon
+
+    # k1 = A0, k2 = Ah (I + h/2 k1), k3 = Ah (I + h/2 k2), k4 = A1 (I + h k3),
+    # written out for A = [[0, 1], [q, 0]]
+    one = np.ones_like(q0)
+    k1 = (0 * one, one, q0, 0 * one)
+    k2 = (h / 2 * q0, one, qh, h / 2 * qh)
+    k3 = (h / 2 * qh, one + h**2 / 4 * qh, qh + h**2 / 4 * qh * q0, h / 2 * qh)
+    k4 = (h * k3[2], one + h * k3[3], q1 * (one + h * k3[0]), q1 * h * k3[1])
+    step = tuple((i + h / 6 * (w1 + 2 * w2 + 2 * w3 + w4))
+                 for i, w1, w2, w3, w4 in zip((one, 0 * one, 0 * one, one), k1, k2, k3, k4))
+
+    P = tuple(m[:, 0] for m in step)
+    for j in range(1, substeps):
+        P = _mul(tuple(m[:, j] for m in step), P)
+    return P
+
+
+def _product(P):
+    # P[n-1] ... P[1] P[0] by pairwise products, log2(n) batched rounds
+    while len(P[0]) > 1:
+        if len(P[0]) % 2:
+            P = tuple(np.concatenate([m, np.eye(2).ravel()[i] + 0 * m[:1]])
+                      for i, m in enumerate(P))
+        P = _mul(tuple(m[1::2] for m in P), tuple(m[0::2] for m in P))
+    return tuple(m[0] for m in P)
+
+
+def harmonic_shoot_batch(epsilon, x, K=1, substeps=10):
+    """Shoot ``phi'' = (K x^2 - eps) phi`` from ``x[0]`` for an array of ``eps`` at once.
+
+    Starts from ``phi = 1, phi' = sqrt(K L^2 - eps)`` like the HW 2 loop and
+    uses fixed RK4 steps, ``substeps`` per interval of ``x``, for all
+    ``eps`` together.  Returns ``phi`` and ``phi'`` of shape ``(len(x), M)``.
+    """
+    epsilon = np.atleast_1d(np.asarray(epsilon, dtype=float))
+    x = np.asarray(x, dtype=float)
+    L = -x[0]
+    a, b, c, d = _rk4_propagators(x, epsilon, K, substeps)
+    phi = np.empty((len(x), len(epsilon)))
+    dphi = np.empty_like(phi)
+    phi[0] = 1
+    dphi[0] = np.sqrt(K * L**2 - epsilon)
+    for i in range(len(x) - 1):
+        phi[i + 1] = a[i] * phi[i] + b[i] * dphi[i]
+        dphi[i + 1] = c[i] * phi[i] + d[i] * dphi[i]
+    return phi, dphi
+
+
+def harmonic_residual(epsilon, x, K=1, substeps=10):
+    """Boundary residual ``phi'(L) + sqrt(K L^2 - eps) phi(L)`` for every ``eps``."""
+    epsilon = np.atleast_1d(np.asarray(epsilon, dtype=float))
+    x = np.asarray(x, dtype=float)
+    L = x[-1]
+    # Only the end state is needed: multiply the interval propagators
+    a, b, c, d = _product(_rk4_propagators(x, epsilon, K, substeps))
+    slope = np.sqrt(K * L**2 - epsilon)
+    return (c + d * slope) + slope * (a + b * slope)
+
+
+def harmonic_eigenvalues(n_modes, L=4, K=1, x=None, tol=1e-12, substeps=10, scan_step=0.25,
+                         max_iter=100):
+    """First ``n_modes`` shooting eigenvalues of HW 2 / HW 3 part A, all modes at once.
+
+    One batched shot over an ``eps`` grid (spacing ``scan_step``, below the
+    ``K L^2`` where the boundary condition stops being real) brackets every
+    sign change of the residual; all brackets are then refined together by
+    the Illinois variant of false position, one batched shot per iteration.
+    Returns ``(eigenvalues, eigenfunctions, x)`` with the eigenfunctions as in
+    the scripts: ``|phi| / sqrt(trapezoid(phi**2, x))``.
+    """
+    if x is None:
+        x = np.linspace(-L, L, 81)
+    x = np.asarray(x, dtype=float)
+    scan = np.arange(0, K * L**2, scan_step)
+    residual = harmonic_residual(scan, x, K, substeps)
+    sign_change = np.nonzero(np.sign(residual[:-1]) * np.sign(residual[1:]) <= 0)[0]
+    if len(sign_change) < n_modes:
+        raise ValueError(f"only {len(sign_change)} eigenvalues below K L^2 = {K * L**2:g}; "
+                         "increase L")
+    sign_change = sign_change[:n_modes]
+
+    a, b = scan[sign_change], scan[sign_change + 1]
+    fa, fb = residual[sign_change], residual[sign_change + 1]
+    side = np.zeros(n_modes, dtype=int)
+    c = a
+    for _ in range(max_iter):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            c = np.where(fb != fa, b - fb * (b - a) / (fb - fa), (a + b) / 2)
+        fc = harmonic_residual(c, x, K, substeps)
+        done = (np.abs(fc) < tol) | (np.abs(b - a) < tol * np.maximum(1, np.abs(c)))
+        if done.all():
+            break
+        # Keep the bracket; halve the residual of an end that stays twice
+        left = np.sign(fc) == np.sign(fa)
+        a, fa = np.where(left, c, a), np.where(left, fc, fa)
+        b, fb = np.where(left, b, c), np.where(left, fb, fc)
+        fb = np.where(left & (side == 1), fb / 2, fb)
+        fa = np.where(~left & (side == -1), fa / 2, fa)
+        side = np.where(left, 1, -1)
+
+    phi, _ = harmonic_shoot_batch(c, x, K, substeps)
+    norm = np.trapezoid(phi**2, x, axis=0)
+    return c, np.abs(phi) / np.sqrt(norm), x
+
+
+def harmonic_shoot(y, x, epsilon, K=1):
+    """``odeint`` RHS of HW 2: ``phi'' = (K x^2 - epsilon) phi``."""
+    return [y[1], (K * x**2 - epsilon) * y[0]]
+
+
+class CachedShot:
+    """Boundary residual of a shooting problem with every shot memoised.
+
+    ``shoot(eps)`` integrates the ODE and ``residual(solution, eps)`` reads
+    the boundary mismatch off the result.  Each distinct ``eps`` is
+    integrated once, so bracketing and root finding never repeat a shot,
+    and ``solution(eps)`` hands back the integrated eigenfunction at the root.
+    """
+
+    def __init__(self, shoot, residual):
+        self.shoot = shoot
+        self.residual = residual
+        self.solutions = {}
+
+    def solution(self, epsilon):
+        key = float(epsilon)
+        if key not in self.solutions:
+            self.solutions[key] = self.shoot(key)
+        return self.solutions[key]
+
+    def __call__(self, epsilon):
+        return self.residual(self.solution(epsilon), float(epsilon))
+
+    @property
+    def n_shots(self):
+        return len(self.solutions)
+
+
+def find_eigenvalue(residual, start, step=0.2, max_step=None, xtol=1e-12, max_steps=1000):
+    """First root of ``residual`` above ``start``, by bracketing and Brent's method.
+
+    Walks up from ``start`` (the previous eigenvalue plus a margin, as in the
+    scripts) until the residual changes sign, then refines the bracket with
+    ``scipy.optimize.brentq``, which converges superlinearly instead of
+    halving ``d_epsilon`` one shot at a time.  The walk starts at ``step``
+    and doubles it up to ``max_step`` (default: no growth); ``max_step``
+    must stay below the gap between neighbouring eigenvalues.
+    """
+    from scipy.optimize import brentq
+
+    if max_step is None:
+        max_step = step
+    a, fa = start, residual(start)
+    for _ in range(max_steps):
+        if fa == 0:
+            return a
+        b = a + step
+        fb = residual(b)
+        if np.sign(fa) != np.sign(fb):
+            return brentq(residual, a, b, xtol=xtol)
+        a, fa = b, fb
+        step = min(2 * step, max_step)
+    raise RuntimeError(f"no sign change within {max_steps} steps from {start}")
+
+
+def hw3_rhs_c(x, y, epsilon, gamma):
+    return [y[1], (gamma * y[0]**2 + x**2 - epsilon) * y[0]]
+
+
+def nonlinear_modes(gamma, L=2, n_modes=2, tol=1e-4, dx=0.1):
+    """Part C of HW 3: modes of ``phi'' = (gamma phi^2 + x^2 - eps) phi`` on [-L, L].
+
+    Same search as the script: the inner search shoots on ``epsilon`` (here
+    with :func:`find_eigenvalue`, starting just above the previous mode) and
+    the outer loop adjusts the amplitude ``A`` until the mode has unit norm.
+    Returns ``(eigenvalues, |eigenfunctions|, x)``.
+    """
+    x = np.arange(-L, L + dx, dx)
+    eigenvals = np.zeros(n_modes)
+    eigenvecs = np.zeros((len(x), n_modes))
+
+    def residual(sol, epsilon):
+        return sol.y[1, -1] + np.sqrt(L**2 - epsilon) * sol.y[0, -1]
+
+    epsilon0, A = 0.1, 1e-6
+    for jmodes in range(n_modes):
+        dA = 0.01
+        for jj in range(100):
+            def shoot(epsilon, A=A):
+                y0 = [A, np.sqrt(L**2 - epsilon) * A]
+                return solve_ivp(hw3_rhs_c, [x[0], x[-1]], y0, t_eval=x, args=(epsilon, gamma))
+
+            shots = CachedShot(shoot, residual)
+            epsilon = find_eigenvalue(shots, epsilon0, 0.2, xtol=tol * 1e-4)
+            sol = shots.solution(epsilon)
+            y_sol = sol.y.T
+            x_sol = sol.t
+
+            area = np.trapezoid(y_sol[:, 0]**2, x_sol)
+            if abs(area - 1) < tol:
+                break
+            if area < 1:
+                A += dA
+            else:
+                A -= dA
+                dA /= 2
+
+        epsilon0 = epsilon + 0.2
+        eigenvals[jmodes] = epsilon
+        eigenvecs[:, jmodes] = np.abs(y_sol[:, 0])
+
+    return eigenvals, eigenvecs, x
+
+
+def hw3_variational_rhs(x, y, epsilon, gamma):
+    """``hw3_rhs_c`` with the sensitivities of ``(phi, phi')`` to ``epsilon`` and ``A``.
+
+    ``y = [phi, phi', phi_eps, phi_eps', phi_A, phi_A']``; both sensitivities
+    obey the linearised equation ``u'' = (3 gamma phi^2 + x^2 - eps) u``, the
+    ``epsilon`` one with the extra forcing ``-phi``.
+    """
+    phi, dphi, phi_e, dphi_e, phi_a, dphi_a = y
+    q = x**2 - epsilon
+    q_lin = 3 * gamma * phi**2 + q
+    return [dphi, (gamma * phi**2 + q) * phi,
+            dphi_e, q_lin * phi_e - phi,
+            dphi_a, q_lin * phi_a]
+
+
+def _hermite_guess(n, L):
+    # Harmonic-oscillator eigenvalue 2n + 1 and |psi_n(-L)| as the amplitude
+    from scipy.special import eval_hermite, factorial
+
+    psi = eval_hermite(n, L) * np.exp(-L**2 / 2) / np.sqrt(2**n * factorial(n) * np.sqrt(np.pi))
+    return 2 * n + 1.0, abs(psi)
+
+
+def newton_mode(gamma, epsilon, A, x, tol=1e-4, max_iter=20, **options):
+    """Newton's method on ``(epsilon, A)`` for one part C mode.
+
+    The residuals are the script's: the boundary condition
+    ``phi'(L) + sqrt(L^2 - eps) phi(L)`` and ``trapezoid(phi^2, x) - 1``.
+    Their Jacobian comes from the same ``solve_ivp`` call through
+    :func:`hw3_variational_rhs` (the norm derivatives are ``trapezoid`` of
+    ``2 phi phi_eps`` and ``2 phi phi_A``), so each iteration is one
+    integration.  ``options`` go to ``solve_ivp``.  Returns
+    ``(epsilon, A, phi, n_solves)``.
+    """
+    L = x[-1]
+    for n_solves in range(1, max_iter + 1):
+        s = np.sqrt(L**2 - epsilon)
+        y0 = [A, s * A, 0, -A / (2 * s), 1, s]
+        sol = solve_ivp(hw3_variational_rhs, [x[0], x[-1]], y0, t_eval=x,
+                        args=(epsilon, gamma), **options)
+        phi, dphi, phi_e, dphi_e, phi_a, dphi_a = sol.y
+        F = np.array([dphi[-1] + s * phi[-1], np.trapezoid(phi**2, x) - 1])
+        if np.all(np.abs(F) < tol):
+            return epsilon, A, phi, n_solves
+        J = np.array([[dphi_e[-1] + s * phi_e[-1] - phi[-1] / (2 * s), dphi_a[-1] + s * phi_a[-1]],
+                      [2 * np.trapezoid(phi * phi_e, x), 2 * np.trapezoid(phi * phi_a, x)]])
+        d_epsilon, dA = np.linalg.solve(J, -F)
+        epsilon += d_epsilon
+        A += dA
+    raise RuntimeError(f"Newton did not converge in {max_iter} solves (gamma={gamma})")
+
+
+def nonlinear_modes_newton(gamma, L=2, n_modes=2, tol=1e-4, dx=0.1, guess=None,
+                           full_output=False, **options):
+    """:func:`nonlinear_modes` with :func:`newton_mode` in place of the nested searches.
+
+    Each mode starts from the linear oscillator (eigenvalue ``2n + 1``,
+    amplitude ``|psi_n(-L)|``), or from ``guess = (eigenvalues,
+    eigenfunctions)`` of a nearby ``gamma`` -- the amplitude is the first
+    row of the eigenfunctions -- which is what :func:`gamma_continuation`
+    passes.  With ``full_output`` the integrations per mode are returned
+    as a fourth item.
+    """
+    x = np.arange(-L, L + dx, dx)
+    eigenvals = np.zeros(n_modes)
+    eigenvecs = np.zeros((len(x), n_modes))
+    n_solves = np.zeros(n_modes, dtype=int)
+    for n in range(n_modes):
+        if guess is None:
+            epsilon, A = _hermite_guess(n, L)
+        else:
+            epsilon, A = guess[0][n], guess[1][0, n]
+        epsilon, A, phi, n_solves[n] = newton_mode(gamma, epsilon, A, x, tol, **options)
+        eigenvals[n] = epsilon
+        eigenvecs[:, n] = np.abs(phi)
+    if full_output:
+        return eigenvals, eigenvecs, x, n_solves
+    return eigenvals, eigenvecs, x
+
+
+def gamma_continuation(gammas, L=2, n_modes=2, tol=1e-4, dx=0.1, **options):
+    """Part C modes along ``gammas``, each solve started from the previous ``gamma``.
+
+    Returns ``(eigenvalues, eigenfunctions, x, n_solves)`` with a leading
+    axis over ``gammas``.
+    """
+    results = []
+    guess = None
+    for gamma in gammas:
+        result = nonlinear_modes_newton(gamma, L, n_modes, tol, dx, guess, full_output=True, **options)
+        guess = result[:2]
+        results.append(result)
+    x = results[0][2]
+    return (np.array([r[0] for r in results]), np.array([r[1] for r in results]), x,
+            np.array([r[3] for r in results]))
@@ -0,0 +1,214 @@
+"""Run independent simulations over a parameter grid on a process pool.
+
+A task is a module-level function taking one parameter dictionary and
+returning a dictionary of arrays and scalars.  :func:`run_sweep` runs it for
+every point of the grid and gathers the results into a :class:`SweepStore`.
+Call it from under ``if __name__ == '__main__':``, since the workers are
+spawned fresh and re-import the calling script.
+"""
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+
+BLAS_THREAD_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                    'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+
+def parameter_grid(**axes):
+    """Cartesian product of the given value lists, as a list of dicts."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def _key(params):
+    # Numbers compare by value, so m=64 and m=64.0 name the same point
+    canonical = {k: float(v) if isinstance(v, (int, float, np.number)) and not isinstance(v, bool)
+                 else v for k, v in params.items()}
+    return json.dumps(canonical, sort_keys=True, default=str)
+
+
+class SweepStore:
+    """Results of a sweep, indexed by their parameter dictionaries."""
+
+    def __init__(self):
+        self.params = []
+        self.results = []
+        self.status = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.params)
+
+    def add(self, params, result, status='ok'):
+        self._index[_key(params)] = len(self.params)
+        self.params.append(dict(params))
+        self.results.append(result)
+        self.status.append(status)
+
+    def get(self, **params):
+        return self.results[self._index[_key(params)]]
+
+    def select(self, **fixed):
+        """``(params, result)`` pairs whose parameters match ``fixed``."""
+        return [(p, r) for p, r in zip(self.params, self.results)
+                if all(p.get(k) == v for k, v in fixed.items())]
+
+    def save(self, path):
+        """Write every result array and a JSON index to one ``.npz`` file."""
+        arrays = {}
+        entries = []
+        for i, (params, result, status) in enumerate(zip(self.params, self.results, self.status)):
+            scalars = {}
+            for name, value in (result or {}).items():
+                if isinstance(value, np.ndarray):
+                    arrays[f'{i}/{name}'] = value
+                else:
+                    scalars[name] = value
+            entries.append({'params': params, 'status': status, 'scalars': scalars})
+        arrays['index'] = np.array(json.dumps(entries, default=str))
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with np.load(path) as data:
+            entries = json.loads(str(data['index']))
+            for i, entry in enumerate(entries):
+                result = dict(entry['scalars'])
+                prefix = f'{i}/'
+                for name in data.files:
+                    if name.startswith(prefix):
+                        result[name[len(prefix):]] = data[name]
+                store.add(entry['params'], result, entry['status'])
+        return store
+
+
+def _run_task(task, params):
+    start = time.perf_counter()
+    try:
+        result = task(params)
+        status = 'ok'
+    except Exception:
+        result = {'error': traceback.format_exc()}
+        status = 'error'
+    result['wall_time'] = time.perf_counter() - start
+    return params, result, status
+
+
+def run_sweep(task, grid, max_workers=None, blas_threads=1, log=print):
+    """Run ``task`` for every parameter dict in ``grid`` and return a :class:`SweepStore`.
+
+    Workers are spawned with the BLAS/OpenMP thread variables set to
+    ``blas_threads`` so that ``max_workers`` processes do not oversubscribe
+    the cores.  A task that raises is stored with status ``'error'`` and its
+    traceback instead of stopping the sweep.
+    """
+    grid = list(grid)
+    store = SweepStore()
+    if max_workers is None:
+        max_workers = min(len(grid), os.cpu_count() or 1)
+
+    # Spawned workers read the environment when they import numpy
+    saved = {var: os.environ.get(var) for var in BLAS_THREAD_VARS}
+    os.environ.update({var: str(blas_threads) for var in BLAS_THREAD_VARS})
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn')) as pool:
+            futures = [pool.submit(_run_task, task, params) for params in grid]
+            for done, future in enumerate(as_completed(futures), start=1):
+                params, result, status = future.result()
+                store.add(params, result, status)
+                log(f"[{done}/{len(grid)}] {status} {params} ({result['wall_time']:.2f} s)")
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+    return store
+
+
+def vorticity_task(params):
+    """One HW 5 vorticity run.
+
+    Keys: ``nu``, ``ic`` (see :func:`hw581.vorticity.initial_vorticity`),
+    ``backend`` (a psi solver name or ``'spectral'``), ``m``, and optionally
+    ``L`` (20), ``t_end`` (4), ``dt_out`` (0.5) and ``method`` (``'RK45'``;
+    ``'BDF'``/``'Radau'`` get the sparse Jacobian of the finite-difference RHS).
+    """
+    from scipy.integrate import solve_ivp
+
+    from hw581.spectral import SpectralVorticity
+    from hw581.vorticity import FDVorticity, grid, initial_vorticity
+
+    m, L, nu = params['m'], params.get('L', 20), params['nu']
+    t_end, dt_out = params.get('t_end', 4), params.get('dt_out', 0.5)
+    X, Y = grid(m, L)
+    w0 = initial_vorticity(params['ic'], X, Y)
+    if params['backend'] == 'spectral':
+        rhs = SpectralVorticity(m, m, L, L, nu)
+    else:
+        rhs = FDVorticity(m, L, nu, psi_solver=params['backend'])
+    tspan = np.arange(0, t_end + dt_out / 2, dt_out)
+    method = params.get('method', 'RK45')
+    options = {'jac': rhs.jac} if method in ('BDF', 'Radau') and hasattr(rhs, 'jac') else {}
+    sol = solve_ivp(rhs, (tspan[0], tspan[-1]), w0, t_eval=tspan, method=method, **options)
+    return {'t': sol.t, 'w': sol.y, 'nfev': int(sol.nfev), 'njev': int(sol.njev),
+            'nlu': int(sol.nlu), 'success': bool(sol.success)}
+
+
+def nonlinear_mode_task(params):
+    """HW 3 part C for one ``gamma`` (optional keys ``L``, ``n_modes``, ``tol``).
+
+    ``solver`` is ``'shooting'`` (the nested search, default) or
+    ``'newton'``; the Newton solver also reports its integrations per mode.
+    """
+    from hw581.shooting import nonlinear_modes, nonlinear_modes_newton
+
+    args = (params['gamma'], params.get('L', 2), params.get('n_modes', 2), params.get('tol', 1e-4))
+    if params.get('solver', 'shooting') == 'newton':
+        eigenvals, eigenvecs, x, n_solves = nonlinear_modes_newton(*args, full_output=True)
+        return {'eigenvalues': eigenvals, 'eigenfunctions': eigenvecs, 'x': x, 'n_solves': n_solves}
+    eigenvals, eigenvecs, x = nonlinear_modes(*args)
+    return {'eigenvalues': eigenvals, 'eigenfunctions': eigenvecs, 'x': x}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a parameter sweep on a process pool.")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--blas-threads', type=int, default=1)
+    parser.add_argument('--out', default='sweep.npz')
+    sub = parser.add_subparsers(dest='task', required=True)
+
+    vort = sub.add_parser('vorticity', help='HW 5 vorticity runs')
+    vort.add_argument('--nu', type=float, nargs='+', default=[0.001])
+    vort.add_argument('--ic', nargs='+', default=['gaussian'])
+    vort.add_argument('--backend', nargs='+', default=['fft'])
+    vort.add_argument('--m', type=int, nargs='+', default=[64])
+    vort.add_argument('--t-end', type=float, default=4.0)
+    vort.add_argument('--method', nargs='+', default=['RK45'])
+
+    modes = sub.add_parser('modes', help='HW 3 part C nonlinear modes')
+    modes.add_argument('--gamma', type=float, nargs='+', default=[0.05, -0.05])
+    modes.add_argument('--solver', nargs='+', default=['shooting'], choices=['shooting', 'newton'])
+
+    args = parser.parse_args(argv)
+    if args.task == 'vorticity':
+        points = parameter_grid(nu=args.nu, ic=args.ic, backend=args.backend, m=args.m,
+                                t_end=[args.t_end], method=args.method)
+        store = run_sweep(vorticity_task, points, args.workers, args.blas_threads)
+    else:
+        store = run_sweep(nonlinear_mode_task, parameter_grid(gamma=args.gamma, solver=args.solver),
+                          args.workers, args.blas_threads)
+    store.save(args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from hw581.benchmark import main, run_benchmark
+
+
+def test_report_records_every_backend_against_the_fft_reference():
+    report = run_benchmark([16], ['fft', 'direct', 'spectral'], repeat=2, t_end=0.1,
+                           measure_memory=False, log=lambda message: None)
+    assert 'FFTPoisson' in report['config']['reference']
+    rows = {row['backend']: row for row in report['results']}
+    assert set(rows) == {'fft', 'direct', 'spectral'}
+    for row in rows.values():
+        assert row['success'] and len(row['solve_time']) == 2 and row['nfev'] > 0
+    assert rows['fft']['error_vs_fft'] == 0
+    # Same finite differences, psi differs only in how the mean is fixed
+    assert rows['direct']['error_vs_fft'] < 1e-2
+
+
+def test_repeat_must_be_positive():
+    with pytest.raises(ValueError):
+        run_benchmark([16], ['fft'], repeat=0, measure_memory=False)
+    with pytest.raises(SystemExit):
+        main(['--repeat', '0'])
+
+
+def test_main_writes_json(tmp_path):
+    out = tmp_path / 'bench.json'
+    main(['--sizes', '16', '--backends', 'multigrid', '--repeat', '1', '--t-end', '0.1',
+          '--out', str(out)])
+    report = json.loads(out.read_text())
+    assert report['config']['sizes'] == [16]
+    assert report['config']['reference'] is None
+    assert report['results'][0]['peak_memory'] > 0
@@ -0,0 +1,116 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from hw581 import cache as cache_module
+from hw581.cache import MISS, ResultCache
+from hw581.convergence import convergence_study
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / 'results')
+
+
+class Counter:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_fetch_computes_once_then_hits(cache):
+    compute = Counter({'y': np.arange(6.0).reshape(2, 3), 'n': 3, 'parts': (1.5, [np.ones(2)])})
+    first = cache.fetch('solve', compute, m=64, w0=np.zeros(4))
+    second = cache.fetch('solve', compute, m=64.0, w0=np.zeros(4))
+    assert compute.calls == 1
+    np.testing.assert_array_equal(second['y'], first['y'])
+    assert second['n'] == 3 and isinstance(second['parts'], tuple)
+    np.testing.assert_array_equal(second['parts'][1][0], np.ones(2))
+
+    cache.fetch('solve', compute, m=64, w0=np.ones(4))
+    assert compute.calls == 2
+
+
+def test_miss_is_not_none(cache):
+    key = cache.key('nothing')
+    assert cache.get(key) is MISS
+    compute = Counter(None)
+    assert cache.fetch('nothing', compute) is None
+    assert cache.fetch('nothing', compute) is None
+    assert compute.calls == 1
+
+
+@pytest.mark.parametrize('content', [b'', b'not a zip file', b'PK\x03\x04 truncated'])
+def test_corrupt_entry_is_removed_and_recomputed(cache, content):
+    compute = Counter(np.arange(3))
+    key = cache.key('solve')
+    path = cache._path(key)
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(content)
+    assert cache.get(key) is MISS
+    assert not os.path.exists(path)
+    np.testing.assert_array_equal(cache.fetch('solve', compute), np.arange(3))
+    assert compute.calls == 1 and os.path.exists(path)
+
+
+def test_entry_evicted_while_reading_is_a_miss(cache, monkeypatch):
+    key = cache.key('solve')
+    cache.put(key, 1.0)
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(cache_module.os, 'utime', evicted)
+    assert cache.get(key) is MISS
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    small = ResultCache(tmp_path, max_bytes=10**9)
+    keys = [small.key('entry', i=i) for i in range(3)]
+    for i, key in enumerate(keys):
+        small.put(key, np.random.default_rng(i).standard_normal(2000))
+        # mtimes a second apart, so the order does not depend on clock resolution
+        os.utime(small._path(key), (time.time() + i - 10,) * 2)
+    small.get(keys[0])  # now the most recently used
+
+    entry = os.path.getsize(small._path(keys[0]))
+    small.max_bytes = int(2.5 * entry)
+    small._evict()
+    assert small.get(keys[1]) is MISS
+    assert small.get(keys[0]) is not MISS and small.get(keys[2]) is not MISS
+    assert small.size <= small.max_bytes
+
+
+def test_disabled_cache_never_touches_the_disk(tmp_path):
+    disabled = ResultCache(tmp_path / 'off', enabled=False)
+    compute = Counter(np.ones(3))
+    disabled.fetch('solve', compute)
+    disabled.fetch('solve', compute)
+    key = disabled.key('solve')
+    disabled.put(key, np.ones(3))
+    assert compute.calls == 2
+    assert disabled.get(key) is MISS
+    assert not os.path.exists(tmp_path / 'off')
+
+
+def test_convergence_study_uses_the_cache_it_is_given(tmp_path):
+    problems = [{'problem': 'harmonic'}]
+    disabled = ResultCache(tmp_path / 'off', enabled=False)
+    for _ in range(2):
+        store = convergence_study(problems, ['RK45'], [1e-4], disabled, max_workers=1,
+                                  log=lambda message: None)
+        assert store.status == ['ok']
+    assert not os.path.exists(tmp_path / 'off')
+
+    enabled = ResultCache(tmp_path / 'on')
+    convergence_study(problems, ['RK45'], [1e-4], enabled, max_workers=1, log=lambda message: None)
+    store = convergence_study(problems, ['RK45'], [1e-4], enabled, max_workers=1,
+                              log=lambda message: None)
+    assert store.status == ['cached']
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from scipy.sparse import kron
+
+from hw581.chebyshev import (FastDiagonalization, cheb, chebyshev_laplacian, dct_dxx,
+                             dirichlet_dxx)
+
+N, LENGTH = 24, 20
+
+
+def kron_laplacian(N, length):
+    # L exactly as built in the original 581_hw6.py
+    D, _ = cheb(N)
+    D[N, :] = 0
+    D[0, :] = 0
+    Dxx = np.dot(D, D) / ((length / 2) ** 2)
+    I = np.eye(len(Dxx))
+    return kron(I, Dxx) + kron(Dxx, I)
+
+
+@pytest.fixture(scope='module')
+def field():
+    return np.random.default_rng(0).standard_normal((N + 1, N + 1))
+
+
+def test_dirichlet_dxx_is_the_script_matrix():
+    D, x = cheb(N)
+    D[N, :] = 0
+    D[0, :] = 0
+    Dxx, x_scaled = dirichlet_dxx(N, LENGTH)
+    np.testing.assert_allclose(Dxx, D @ D / (LENGTH / 2) ** 2)
+    np.testing.assert_allclose(x_scaled, x * LENGTH / 2)
+    assert dirichlet_dxx(N, LENGTH)[0] is Dxx
+
+
+def test_tensor_laplacian_matches_kron(field):
+    lap = chebyshev_laplacian(N, LENGTH)
+    expected = kron_laplacian(N, LENGTH) @ field.ravel()
+    np.testing.assert_allclose(lap.apply(field).ravel(), expected, rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(lap.operator @ field.ravel(), expected, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize('axis', [0, 1])
+def test_dct_dxx_matches_the_matrix(field, axis):
+    Dxx, _ = dirichlet_dxx(N, LENGTH)
+    expected = Dxx @ field if axis == 0 else field @ Dxx.T
+    np.testing.assert_allclose(dct_dxx(field, LENGTH, axis=axis), expected,
+                               rtol=1e-9, atol=1e-9 * np.max(np.abs(expected)))
+
+
+def test_dct_laplacian_matches_kron(field):
+    lap = chebyshev_laplacian(N, LENGTH, method='dct')
+    expected = kron_laplacian(N, LENGTH) @ field.ravel()
+    np.testing.assert_allclose(lap.operator @ field.ravel(), expected,
+                               rtol=1e-9, atol=1e-9 * np.max(np.abs(expected)))
+
+
+@pytest.mark.parametrize('method', ['matrix', 'dct'])
+def test_apply_broadcasts_over_leading_axes(field, method):
+    lap = chebyshev_laplacian(N, LENGTH, method)
+    batch = np.stack([field, 2 * field])
+    out = lap.apply(batch)
+    np.testing.assert_allclose(out[1], lap.apply(2 * field), rtol=1e-12, atol=1e-12)
+
+
+def test_laplacian_is_cached_per_method():
+    assert chebyshev_laplacian(N, LENGTH) is chebyshev_laplacian(N, LENGTH)
+    assert chebyshev_laplacian(N, LENGTH, 'dct') is not chebyshev_laplacian(N, LENGTH)
+    with pytest.raises(ValueError):
+        chebyshev_laplacian(N, LENGTH, method='fft')
+
+
+
+def test_sparse_laplacian_stores_only_its_rows_and_columns():
+    lap = chebyshev_laplacian(N, LENGTH)
+    L = lap.sparse()
+    assert L.format == 'csr' and L.nnz <= 2 * (N + 1)**3
+    np.testing.assert_allclose(L.toarray(), kron_laplacian(N, LENGTH).toarray(), rtol=1e-12, atol=1e-12)
+    assert lap.sparse() is L
+
+@pytest.mark.parametrize('a, b', [(1.0, 0.05), (3.0, 0.1)])
+def test_fast_diagonalization_residual(field, a, b):
+    lap = chebyshev_laplacian(N, LENGTH)
+    U = FastDiagonalization(lap.Dxx).solve(field, a, b)
+    assert not np.iscomplexobj(U)
+    residual = a * U - b * lap.apply(U) - field
+    assert np.max(np.abs(residual)) < 1e-9 * np.max(np.abs(field))
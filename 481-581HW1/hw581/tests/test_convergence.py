@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from hw581.convergence import convergence_study, convergence_task, harmonic_problem
+
+PROBLEMS = [{'problem': 'harmonic', 'E': 1}]
+
+
+def test_task_matches_a_direct_solve():
+    params = {'problem': 'harmonic', 'E': 1, 'K': 1, 'L': 2, 'method': 'RK45', 'tol': 1e-6}
+    problem = harmonic_problem()
+    sol = solve_ivp(problem['fun'], problem['t_span'], problem['y0'], args=problem['args'],
+                    rtol=1e-6, atol=1e-6, dense_output=True)
+    values = sol.sol(np.linspace(-2, 2, 41)).T
+    assert np.array_equal(convergence_task(params)['values'], values)
+
+    result = convergence_task(params, reference=values + 1e-3)
+    assert result['nfev'] == sol.nfev and result['n_steps'] == len(sol.t) - 1
+    assert result['error'] == pytest.approx(1e-3)
+
+
+def test_study_caches_every_cell(tmp_path):
+    log = []
+    first = convergence_study(PROBLEMS, ['RK45', 'BDF'], [1e-4, 1e-6], tmp_path,
+                              max_workers=1, log=log.append)
+    assert first.status == ['ok'] * 4
+    assert '0 cached, 4 to run' in log[-1]
+
+    errors = {(p['method'], p['tol']): r['error'] for p, r in zip(first.params, first.results)}
+    assert errors['RK45', 1e-6] < errors['RK45', 1e-4]
+    assert errors['BDF', 1e-6] < errors['BDF', 1e-4]
+
+    second = convergence_study(PROBLEMS, ['RK45', 'BDF'], [1e-4, 1e-6, 1e-8], tmp_path,
+                               max_workers=1, log=log.append)
+    assert '4 cached, 2 to run' in log[-1]
+    assert second.status.count('cached') == 4
+    cached = [r for r, s in zip(second.results, second.status) if s == 'cached']
+    assert sorted(r['nfev'] for r in cached) == sorted(r['nfev'] for r in first.results)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from hw581.ensemble import integrate_ensemble
+from hw581.spectral import SpectralVorticity
+from hw581.vorticity import grid, initial_vorticity
+
+
+@pytest.fixture(scope='module')
+def problem():
+    m = 32
+    X, Y = grid(m, 20)
+    W0 = np.stack([initial_vorticity(name, X, Y) for name in ('opposite', 'same', 'pairs', 'random')])
+    return SpectralVorticity(m, m, 20, 20, 0.001), W0, np.arange(0, 2.5, 0.5)
+
+
+def test_rk45_members_take_the_steps_of_solve_ivp(problem):
+    rhs, W0, t_eval = problem
+    ensemble = integrate_ensemble(rhs, W0, [0, 2])
+    for k, w0 in enumerate(W0):
+        sol = solve_ivp(rhs, (0, 2), w0, method='RK45')
+        np.testing.assert_allclose(ensemble.y[k, :, -1], sol.y[:, -1], rtol=1e-9, atol=1e-11)
+        # nfev is per member and counts the same evaluations as solve_ivp
+        assert ensemble.nfev[k] == sol.nfev
+    assert ensemble.n_calls < ensemble.nfev.sum()
+
+
+def test_rk45_outputs_agree_with_solve_ivp(problem):
+    rhs, W0, t_eval = problem
+    ensemble = integrate_ensemble(rhs, W0, t_eval)
+    assert ensemble.y.shape == W0.shape + (len(t_eval),)
+    for k, w0 in enumerate(W0):
+        sol = solve_ivp(rhs, (t_eval[0], t_eval[-1]), w0, t_eval=t_eval, method='RK45')
+        exact = solve_ivp(rhs, (t_eval[0], t_eval[-1]), w0, t_eval=t_eval, rtol=1e-10, atol=1e-12).y
+        # Landing on the outputs instead of interpolating is at least as accurate
+        error = np.max(np.abs(ensemble.y[k] - exact))
+        assert error <= 2 * np.max(np.abs(sol.y - exact)) + 1e-9
+
+
+def test_max_batch_splits_calls_without_changing_results(problem):
+    rhs, W0, t_eval = problem
+    whole = integrate_ensemble(rhs, W0, t_eval)
+    split = integrate_ensemble(rhs, W0, t_eval, max_batch=1)
+    np.testing.assert_array_equal(whole.y, split.y)
+    np.testing.assert_array_equal(whole.nfev, split.nfev)
+    assert split.n_calls > whole.n_calls
+
+
+def test_default_batch_is_the_whole_ensemble_on_large_grids():
+    # 256^2 values per member used to fall back to one call per member
+    calls = []
+
+    def fun(t, W):
+        calls.append(len(W))
+        return -W
+
+    W0 = np.ones((3, 256 * 256))
+    result = integrate_ensemble(fun, W0, [0, 0.1], method='RK4', dt=0.05)
+    assert set(calls) == {3}
+    np.testing.assert_allclose(result.y[..., -1], np.exp(-0.1), rtol=1e-6)
+    np.testing.assert_array_equal(result.nfev, 8)
+
+
+def test_rk4_needs_dt(problem):
+    rhs, W0, t_eval = problem
+    with pytest.raises(ValueError):
+        integrate_ensemble(rhs, W0, t_eval, method='RK4')
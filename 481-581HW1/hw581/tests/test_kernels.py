@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from scipy.sparse import identity, kron
+
+from hw581.chebyshev import dirichlet_dxx
+from hw581.kernels import (ChebyshevLambdaOmegaKernel, FourierLambdaOmegaKernel,
+                           VorticityKernel, allocated_bytes)
+from hw581.lambda_omega import LRS_2D, rhs_fourier
+from hw581.operators import periodic_fd_matrices
+from hw581.vorticity import spc_rhs
+
+N, L, NU = 32, 20, 0.001
+
+
+def script_K(n, length):
+    # K as built in 581_hw5.py / 581_hw6.py, with kx[0] regularized for spc_rhs
+    kx = (2 * np.pi / length) * np.concatenate((np.arange(0, n / 2), np.arange(-n / 2, 0)))
+    kx[0] = 1e-6
+    KX, KY = np.meshgrid(kx, kx)
+    return KX**2 + KY**2
+
+
+@pytest.fixture(scope='module')
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(scope='module')
+def fourier_case(rng):
+    K = script_K(N, L)
+    uv_hat = rng.standard_normal(2 * N * N) + 1j * rng.standard_normal(2 * N * N)
+    return K, uv_hat
+
+
+@pytest.fixture(scope='module')
+def chebyshev_case(rng):
+    Dxx, _ = dirichlet_dxx(20, L)
+    n2 = Dxx.shape[0]**2
+    lap = kron(identity(Dxx.shape[0]), Dxx) + kron(Dxx, identity(Dxx.shape[0]))
+    return Dxx, lap, n2, rng.standard_normal(2 * n2)
+
+
+@pytest.fixture(scope='module')
+def vorticity_case(rng):
+    K = script_K(N, L)
+    A, B, C = periodic_fd_matrices(N, L)
+    # zero mean: otherwise the 1e-12 in K[0, 0] gives psi a huge constant and
+    # the two difference stencils only agree to its rounding error
+    w = rng.standard_normal(N * N)
+    return K, (A, B, C), w - w.mean()
+
+
+def test_fourier_kernel_matches_rhs_fourier(fourier_case):
+    K, uv_hat = fourier_case
+    kernel = FourierLambdaOmegaKernel(K, D1=0.1, D2=0.2, beta=1.5)
+    expected = rhs_fourier(0, uv_hat, K, N * N, N, N, D1=0.1, D2=0.2, beta=1.5)
+    np.testing.assert_allclose(kernel(0, uv_hat), expected, rtol=1e-10, atol=1e-8)
+
+
+def test_chebyshev_kernel_matches_lrs_2d(chebyshev_case):
+    Dxx, lap, n2, uv = chebyshev_case
+    kernel = ChebyshevLambdaOmegaKernel(Dxx, D1=0.1, D2=0.2, beta=1.5)
+    expected = LRS_2D(0, uv, lap, n2, 0.1, 0.2, beta=1.5)
+    np.testing.assert_allclose(kernel(0, uv), expected, rtol=1e-10, atol=1e-9)
+
+
+def test_vorticity_kernel_matches_spc_rhs(vorticity_case):
+    K, (A, B, C), w = vorticity_case
+    kernel = VorticityKernel(K, NU, L)
+    expected = spc_rhs(0, w, N, N, K, NU, A, B, C)
+    np.testing.assert_allclose(kernel(0, w), expected, rtol=1e-9, atol=1e-9)
+
+
+def test_output_buffer_is_reused_unless_copied(vorticity_case):
+    K, _, w = vorticity_case
+    reused = VorticityKernel(K, NU, L)
+    first = reused(0, w)
+    second = reused(0, 2 * w)
+    assert np.shares_memory(first, second)
+
+    copied = VorticityKernel(K, NU, L, copy_output=True)
+    first = copied(0, w)
+    expected = first.copy()
+    copied(0, 2 * w)
+    np.testing.assert_array_equal(first, expected)
+
+    out = np.empty_like(w)
+    assert reused(0, w, out=out) is out
+    np.testing.assert_allclose(out, expected)
+
+
+def test_steady_state_calls_allocate_no_grid_sized_arrays(fourier_case, chebyshev_case,
+                                                          vorticity_case):
+    K, uv_hat = fourier_case
+    field_bytes = N * N * 8
+    kernel_bytes = allocated_bytes(FourierLambdaOmegaKernel(K), 0, uv_hat)
+    script_bytes = allocated_bytes(rhs_fourier, 0, uv_hat, K, N * N, N, N)
+    assert kernel_bytes < field_bytes / 2
+    assert script_bytes > 10 * field_bytes
+
+    K, (A, B, C), w = vorticity_case
+    kernel_bytes = allocated_bytes(VorticityKernel(K, NU, L), 0, w)
+    script_bytes = allocated_bytes(spc_rhs, 0, w, N, N, K, NU, A, B, C)
+    assert kernel_bytes < field_bytes / 2
+    assert script_bytes > 5 * field_bytes
+
+    Dxx, _, _, uv = chebyshev_case
+    assert allocated_bytes(ChebyshevLambdaOmegaKernel(Dxx), 0, uv) < uv.nbytes / 4
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from scipy.fft import fft2
+from scipy.integrate import solve_ivp
+
+from hw581.lambda_omega import LambdaOmegaChebyshev, LambdaOmegaFourier, rhs_fourier
+
+NX, L = 32, 20
+
+
+def spiral(n, length):
+    x = np.linspace(-length / 2, length / 2, n + 1)[:n]
+    X, Y = np.meshgrid(x, x)
+    r = np.sqrt(X**2 + Y**2)
+    theta = np.arctan2(Y, X)
+    return np.tanh(r) * np.cos(theta - r), np.tanh(r) * np.sin(theta - r)
+
+
+@pytest.fixture(scope='module')
+def fourier():
+    lo = LambdaOmegaFourier(NX, NX, L, L)
+    u, v = spiral(NX, L)
+    uv_hat0 = np.hstack([fft2(u).ravel(), fft2(v).ravel()])
+    t_eval = np.array([0, 0.5, 1])
+    reference = solve_ivp(lo.rhs, (0, 1), uv_hat0, t_eval=t_eval, rtol=1e-10, atol=1e-10).y
+    return lo, u, v, uv_hat0, t_eval, reference
+
+
+def relative_error(y, reference):
+    return np.max(np.abs(y - reference)) / np.max(np.abs(reference))
+
+
+def test_rhs_matches_the_script_rhs(fourier):
+    lo, _, _, uv_hat0, _, _ = fourier
+    expected = rhs_fourier(0, uv_hat0, lo.K, NX * NX, NX, NX)
+    np.testing.assert_allclose(lo.rhs(0, uv_hat0), expected, rtol=1e-12, atol=1e-10)
+
+
+def test_etdrk4_matches_rk45_and_is_fourth_order(fourier):
+    lo, _, _, uv_hat0, t_eval, reference = fourier
+    coarse = relative_error(lo.etdrk4(uv_hat0, t_eval, dt=0.1), reference)
+    fine = relative_error(lo.etdrk4(uv_hat0, t_eval, dt=0.05), reference)
+    assert fine < 1e-5
+    assert coarse / fine > 10
+
+
+def test_etdrk4_lands_on_every_output(fourier):
+    lo, _, _, uv_hat0, _, _ = fourier
+    t_eval = [0, 0.3, 0.35, 1]
+    out = lo.etdrk4(uv_hat0, t_eval, dt=0.2)
+    assert out.shape == (2 * NX * NX, 4)
+    reference = solve_ivp(lo.rhs, (0, 1), uv_hat0, t_eval=t_eval, rtol=1e-10, atol=1e-10).y
+    assert relative_error(out, reference) < 1e-3
+
+
+def test_packed_real_state_round_trips(fourier):
+    lo, u, v, uv_hat0, _, _ = fourier
+    y = lo.pack(u, v)
+    assert y.dtype == float and y.size == 2 * 2 * NX * (NX // 2 + 1)
+    np.testing.assert_allclose(lo.unpack(y), np.stack([u, v]), atol=1e-14)
+    np.testing.assert_allclose(lo.full_state(y), uv_hat0, atol=1e-10)
+
+
+def test_real_half_spectrum_rhs_matches_complex_rhs(fourier):
+    lo, u, v, uv_hat0, _, _ = fourier
+    rhs_full = lo.full_state(lo.rhs_real(0, lo.pack(u, v)))
+    np.testing.assert_allclose(rhs_full, lo.rhs(0, uv_hat0), rtol=1e-10, atol=1e-9)
+
+
+def test_real_rk45_matches_complex_rk45(fourier):
+    lo, u, v, _, t_eval, reference = fourier
+    sol = solve_ivp(lo.rhs_real, (0, 1), lo.pack(u, v), t_eval=t_eval, rtol=1e-10, atol=1e-10)
+    full = np.column_stack([lo.full_state(y) for y in sol.y.T])
+    assert relative_error(full, reference) < 1e-8
+
+
+@pytest.fixture(scope='module')
+def chebyshev():
+    lo = LambdaOmegaChebyshev(16, L)
+    X, Y = np.meshgrid(lo.x, lo.x)
+    r = np.sqrt(X**2 + Y**2)
+    theta = np.arctan2(Y, X)
+    uv0 = np.hstack([(np.tanh(r) * np.cos(theta - r)).ravel(),
+                     (np.tanh(r) * np.sin(theta - r)).ravel()])
+    t_eval = np.array([0, 0.5, 1])
+    reference = solve_ivp(lo.rhs, (0, 1), uv0, t_eval=t_eval, rtol=1e-10, atol=1e-10).y
+    return lo, uv0, t_eval, reference
+
+
+@pytest.mark.parametrize('scheme, order', [('euler', 1), ('SBDF2', 2)])
+def test_imex_matches_rk45_at_its_order(chebyshev, scheme, order):
+    lo, uv0, t_eval, reference = chebyshev
+    coarse = relative_error(lo.imex(uv0, t_eval, 0.02, scheme), reference)
+    fine = relative_error(lo.imex(uv0, t_eval, 0.01, scheme), reference)
+    assert fine < (1e-2 if order == 1 else 5e-4)
+    assert coarse / fine == pytest.approx(2**order, rel=0.2)
+
+
+def test_imex_rejects_unknown_scheme(chebyshev):
+    lo, uv0, t_eval, _ = chebyshev
+    with pytest.raises(ValueError):
+        lo.imex(uv0, t_eval, 0.1, scheme='rk4')
+
+
+def test_chebyshev_jac_matches_finite_differences():
+    lo = LambdaOmegaChebyshev(8, L, D1=0.1, D2=0.2, beta=1.5)
+    uv = np.random.default_rng(1).standard_normal(2 * lo.N2)
+    J = lo.jac(0, uv).toarray()
+    eps = 1e-6
+    fd = np.empty_like(J)
+    for j in range(uv.size):
+        e = np.zeros_like(uv)
+        e[j] = eps
+        fd[:, j] = (lo.rhs(0, uv + e) - lo.rhs(0, uv - e)) / (2 * eps)
+    np.testing.assert_allclose(J, fd, atol=1e-6 * np.max(np.abs(fd)))
+
+    pattern = lo.jac_sparsity.toarray()
+    assert np.all(pattern[J != 0])
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from hw581.multigrid import MultigridPoisson
+from hw581.operators import periodic_fd_matrices
+from hw581.poisson import KrylovPoisson, poisson_factor
+
+L = 20
+
+
+@pytest.mark.parametrize('cycle', ['V', 'F'])
+@pytest.mark.parametrize('m', [16, 32])
+def test_pinned_solve_matches_lu(m, cycle):
+    w = np.random.default_rng(3).standard_normal(m * m)
+    multigrid = MultigridPoisson(m, L, cycle=cycle, tol=1e-10)
+    psi = multigrid.solve(w)
+    np.testing.assert_allclose(psi, poisson_factor(m, L).solve(w), rtol=1e-7, atol=1e-7)
+    assert 0 < multigrid.cycles[0] < multigrid.max_cycles
+
+
+def test_singular_solve_has_zero_mean():
+    m = 32
+    w = np.random.default_rng(4).standard_normal(m * m)
+    w -= w.mean()
+    psi = MultigridPoisson(m, L, pin=None, tol=1e-10).solve(w)
+    A = periodic_fd_matrices(m, L, pin=None)[0]
+    assert abs(psi.mean()) < 1e-12
+    np.testing.assert_allclose(A @ psi, w, atol=1e-8)
+
+
+def test_warm_start_converges_immediately():
+    m = 32
+    w = np.random.default_rng(5).standard_normal(m * m)
+    multigrid = MultigridPoisson(m, L)
+    multigrid.solve(w)
+    multigrid.solve(w)
+    assert multigrid.cycles[1] == 0
+
+
+def test_v_cycle_preconditions_krylov():
+    m = 32
+    A = periodic_fd_matrices(m, L)[0]
+    w = np.random.default_rng(6).standard_normal(m * m)
+    plain = KrylovPoisson(A, m, L, 'gmres', preconditioner=None, rtol=1e-8)
+    mg = KrylovPoisson(A, m, L, 'gmres', preconditioner='mg', rtol=1e-8)
+    psi = mg.solve(w)
+    plain.solve(w)
+    np.testing.assert_allclose(psi, poisson_factor(m, L).solve(w), rtol=1e-5, atol=1e-5)
+    assert mg.iterations[0] < plain.iterations[0]
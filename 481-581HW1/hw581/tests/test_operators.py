@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.sparse import issparse, spdiags
+
+from hw581.operators import PeriodicStencil, periodic_fd_matrices
+
+
+def baseline_matrices(m, L):
+    # Dense A, B, C exactly as built in the original 581_hw5.py
+    dx = L / m
+    n = m * m
+    e0 = np.zeros(n)
+    e1 = np.ones(n)
+    e2 = np.copy(e1)
+    e4 = np.copy(e0)
+    for j in range(1, m + 1):
+        e2[m * j - 1] = 0
+        e4[m * j - 1] = 1
+    e3 = np.zeros_like(e2)
+    e3[1:n] = e2[0:n - 1]
+    e3[0] = e2[n - 1]
+    e5 = np.zeros_like(e4)
+    e5[1:n] = e4[0:n - 1]
+    e5[0] = e4[n - 1]
+
+    A = (spdiags([e1, e1, e5, e2, -4 * e1, e3, e4, e1, e1],
+                 [-(n - m), -m, -m + 1, -1, 0, 1, m - 1, m, (n - m)], n, n) / dx**2).toarray()
+    B = (spdiags([e1, -e1, e1, -e1], [-(n - m), -m, m, (n - m)], n, n) / (2 * dx)).toarray()
+    C = (spdiags([e5, -e2, e3, -e4], [-m + 1, -1, 1, m - 1], n, n) / (2 * dx)).toarray()
+    A[0, 0] = 2
+    return A, B, C
+
+
+@pytest.mark.parametrize('m', [4, 8, 16])
+def test_matrices_match_baseline(m):
+    A, B, C = periodic_fd_matrices(m, 20)
+    for sparse, dense in zip((A, B, C), baseline_matrices(m, 20)):
+        assert issparse(sparse) and sparse.format == 'csr'
+        np.testing.assert_array_equal(sparse.toarray(), dense)
+
+
+def test_unpinned_laplacian_annihilates_constants():
+    A = periodic_fd_matrices(8, 20, pin=None)[0]
+    np.testing.assert_allclose(A @ np.ones(64), 0, atol=1e-12)
+
+
+@pytest.mark.parametrize('pin', [2.0, None])
+def test_stencil_matches_matrices(pin):
+    m = 16
+    rng = np.random.default_rng(0)
+    w = rng.standard_normal(m * m)
+    stencil = PeriodicStencil(m, 20, pin)
+    for operator, matrix in zip((stencil.A, stencil.B, stencil.C), periodic_fd_matrices(m, 20, pin)):
+        np.testing.assert_allclose(operator @ w, matrix @ w, rtol=1e-13, atol=1e-13)
@@ -0,0 +1,102 @@
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+from hw581 import cache as cache_module
+from hw581.__main__ import main
+from hw581.cache import ResultCache
+from hw581.parts import PARTS, harmonic_modes, hw3_step_sizes, run_part
+
+HERE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS = ['581 HW 1.py', '581 HW 2.py', '581_hw3.py', '581_hw4.py', '581_hw5.py', '581_hw6.py']
+
+
+@pytest.fixture(autouse=True)
+def no_default_cache(tmp_path, monkeypatch):
+    # Anything written to the default cache lands in tmp_path/cache; the cwd is empty
+    monkeypatch.setenv('HW581_CACHE_DIR', str(tmp_path / 'cache'))
+    workdir = tmp_path / 'cwd'
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    return workdir
+
+
+def test_default_directory(monkeypatch, tmp_path):
+    assert cache_module.default_directory() == str(tmp_path / 'cache')
+    monkeypatch.delenv('HW581_CACHE_DIR')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    assert cache_module.default_directory() == str(tmp_path / 'xdg' / 'hw581')
+    assert ResultCache().directory == str(tmp_path / 'xdg' / 'hw581')
+    monkeypatch.delenv('XDG_CACHE_HOME')
+    assert cache_module.default_directory() == os.path.join(os.path.expanduser('~'), '.cache', 'hw581')
+
+
+def test_hw1_answers():
+    answers = run_part('hw1', '1')
+    root = answers['A1'][-1]
+    assert abs(root * np.sin(3 * root) - np.exp(root)) < 1e-6
+    assert abs(answers['A2'][-1] - root) < 1e-5       # bisection in [-0.7, -0.4] finds the same root
+    assert list(answers['A3']) == [len(answers['A1']), len(answers['A2'])]
+
+    answers = run_part('hw1', '2')
+    np.testing.assert_array_equal(answers['A4'], [[3, 2], [-1, 3]])
+    np.testing.assert_array_equal(answers['A12'], [[5, 4], [1, 0]])
+
+
+def test_hw4_matrices_are_periodic_stencils():
+    answers = run_part('hw4', 'A', m=4, L=4)
+    A, B, C = answers['A1'], answers['A2'], answers['A3']
+    assert A.shape == (16, 16) and np.all(np.diag(A) == -4)
+    np.testing.assert_array_equal(A, A.T)
+    np.testing.assert_array_equal(B, -B.T)
+    np.testing.assert_array_equal(C, -C.T)
+    np.testing.assert_allclose(A.sum(axis=1), 0)
+
+
+def test_harmonic_modes_are_shared_and_cached(tmp_path):
+    assert PARTS[('hw2', 'A')][0] is PARTS[('hw3', 'A')][0]
+    cache = ResultCache(tmp_path / 'results')
+    first = harmonic_modes(n_modes=2, cache=cache)
+    np.testing.assert_allclose(first['A2'], [1, 3], rtol=1e-2)
+    assert first['A1'].shape == (81, 2)
+    assert len(os.listdir(tmp_path / 'results')) == 1
+    second = harmonic_modes(n_modes=2, cache=cache)
+    np.testing.assert_array_equal(second['A1'], first['A1'])
+    np.testing.assert_array_equal(harmonic_modes(n_modes=2)['A2'], first['A2'])
+
+
+def test_step_sizes_without_a_cache_write_nothing(tmp_path, no_default_cache):
+    sizes = hw3_step_sizes(['RK45'], [1e-4, 1e-6], E=1, K=1, L=2)
+    assert np.all(np.diff(sizes['RK45']) < 0)
+    assert not (tmp_path / 'cache').exists()
+    assert os.listdir(no_default_cache) == []
+
+
+def test_cli_runs_parts_and_saves(no_default_cache, capsys):
+    assert main(['hw1', '1', '2', '--quiet', '--out', 'hw1.npz']) == 0
+    saved = np.load(no_default_cache / 'hw1.npz')
+    assert sorted(saved.files, key=lambda k: int(k[1:])) == [f'A{j}' for j in range(1, 13)]
+    np.testing.assert_array_equal(saved['A1'], run_part('hw1', '1')['A1'])
+    assert capsys.readouterr().out == ''
+    assert os.listdir(no_default_cache) == ['hw1.npz']
+
+
+def test_cli_lists_and_rejects(capsys):
+    assert main(['--list']) == 0
+    listing = capsys.readouterr().out.splitlines()
+    assert len(listing) == len(PARTS) and listing[0].split()[:2] == ['hw1', '1']
+    with pytest.raises(SystemExit):
+        main(['hw1', '9'])
+    with pytest.raises(SystemExit):
+        main(['hw7'])
+
+
+@pytest.mark.parametrize('script', SCRIPTS)
+def test_scripts_compute_only_as_main(script, monkeypatch):
+    # Importing a script defines main() and its options but runs nothing
+    monkeypatch.syspath_prepend(HERE)
+    namespace = runpy.run_path(os.path.join(HERE, script), run_name='script')
+    assert callable(namespace['main'])
+    assert not any(name.startswith('A') and name[1:].isdigit() for name in namespace)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from scipy.sparse.linalg import spsolve
+
+from hw581.operators import periodic_fd_matrices
+from hw581.poisson import KrylovPoisson, clear_poisson_cache, poisson_factor
+
+M, L = 16, 20
+
+
+@pytest.fixture
+def system():
+    A = periodic_fd_matrices(M, L)[0]
+    w = np.random.default_rng(2).standard_normal(M * M)
+    return A, w
+
+
+def test_factor_solves_pinned_system(system):
+    A, w = system
+    psi = poisson_factor(M, L).solve(w)
+    np.testing.assert_allclose(psi, spsolve(A.tocsc(), w), rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(A @ psi, w, rtol=1e-10, atol=1e-10)
+
+
+def test_factor_is_cached_per_grid():
+    clear_poisson_cache()
+    lu = poisson_factor(M, L)
+    assert poisson_factor(M, float(L)) is lu
+    assert poisson_factor(2 * M, L) is not lu
+    clear_poisson_cache()
+    assert poisson_factor(M, L) is not lu
+
+
+@pytest.mark.parametrize('method', ['bicgstab', 'gmres'])
+@pytest.mark.parametrize('preconditioner', ['fft', 'ilu', 'jacobi', None])
+def test_krylov_agrees_with_lu(system, method, preconditioner):
+    A, w = system
+    krylov = KrylovPoisson(A, M, L, method, preconditioner=preconditioner, rtol=1e-10)
+    psi = krylov.solve(w)
+    np.testing.assert_allclose(psi, poisson_factor(M, L).solve(w), rtol=1e-6, atol=1e-6)
+    assert krylov.failures == 0
+    assert len(krylov.iterations) == 1 and krylov.iterations[0] > 0
+    assert krylov.residual_history == []
+
+
+@pytest.mark.parametrize('method', ['bicgstab', 'gmres'])
+def test_krylov_records_residuals_on_request(system, method):
+    A, w = system
+    krylov = KrylovPoisson(A, M, L, method, rtol=1e-8, record_residuals=True)
+    psi = krylov.solve(w)
+    history, = krylov.residual_history
+    assert len(history) == krylov.iterations[0] > 0
+    assert np.all(np.isfinite(history))
+    assert np.linalg.norm(w - A @ psi) < 1e-6 * np.linalg.norm(w)
+
+
+def test_warm_start_reuses_previous_psi(system):
+    A, w = system
+    krylov = KrylovPoisson(A, M, L, 'bicgstab', preconditioner='jacobi', rtol=1e-8)
+    krylov.solve(w)
+    krylov.solve(w + 1e-6 * np.ones_like(w))
+    cold = KrylovPoisson(A, M, L, 'bicgstab', preconditioner='jacobi', rtol=1e-8, warm_start=False)
+    cold.solve(w + 1e-6 * np.ones_like(w))
+    assert krylov.iterations[1] < cold.iterations[0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+imageio = pytest.importorskip('imageio.v2')
+pytest.importorskip('matplotlib')
+
+from hw581.render import _chunks, render_animation  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def frames():
+    x = np.linspace(-10, 10, 32)
+    X, Y = np.meshgrid(x, x)
+    return x, np.stack([(1 + t) * np.exp(-(X - t)**2 - Y**2 / 5) for t in np.linspace(0, 3, 5)])
+
+
+def read(path):
+    return [np.asarray(frame) for frame in imageio.mimread(path)]
+
+
+@pytest.mark.parametrize('shared_levels', [False, True])
+def test_pool_writes_the_same_frames_in_order(tmp_path, frames, shared_levels):
+    x, fields = frames
+    serial, pooled = tmp_path / 'serial.gif', tmp_path / 'pooled.gif'
+    render_animation(fields, x, x, str(serial), shared_levels=shared_levels, workers=1)
+    render_animation(fields, x, x, str(pooled), shared_levels=shared_levels, workers=2, chunksize=2)
+    a, b = read(serial), read(pooled)
+    assert len(a) == len(fields)
+    for p, q in zip(a, b):
+        np.testing.assert_array_equal(p, q)
+
+
+def test_per_frame_levels_change_the_colour_bar(tmp_path, frames):
+    # Frames that differ only by a factor look the same with their own levels
+    x, fields = frames
+    scaled = np.stack([fields[0], 3 * fields[0]])
+    path = tmp_path / 'scaled.gif'
+    render_animation(scaled, x, x, str(path), titles=['t', 't'], workers=1)
+    plot = (slice(60, 420), slice(90, 470))
+
+    def plot_difference():
+        first, second = read(path)
+        return np.mean(np.abs(first[plot].astype(float) - second[plot]))
+
+    own_levels = plot_difference()
+    render_animation(scaled, x, x, str(path), titles=['t', 't'], shared_levels=True, workers=1)
+    assert own_levels < plot_difference() / 10
+
+
+def test_chunks_cover_every_item_once():
+    assert list(_chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_video_without_ffmpeg_plugin_fails_clearly(tmp_path, frames):
+    try:
+        import imageio_ffmpeg  # noqa: F401
+        pytest.skip("imageio-ffmpeg is installed")
+    except ImportError:
+        pass
+    x, fields = frames
+    with pytest.raises(ImportError, match='imageio-ffmpeg'):
+        render_animation(fields, x, x, str(tmp_path / 'movie.mp4'), workers=1)
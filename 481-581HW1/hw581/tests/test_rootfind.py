@@ -0,0 +1,99 @@
+import numpy as np
+
+from hw581.rootfind import (bisection, bisection_batch, hw1_derivative, hw1_function,
+                            newton_batch, newton_raphson, sign_change_brackets)
+
+
+class Counted:
+    """``fun`` that records how many points it was evaluated at."""
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.points = 0
+
+    def __call__(self, x):
+        self.points += np.size(x)
+        return self.fun(x)
+
+
+def test_newton_batch_reproduces_the_scalar_iteration():
+    iterates, count = newton_raphson(hw1_function, hw1_derivative, -1.6)
+    f, f_prime = Counted(hw1_function), Counted(hw1_derivative)
+    result = newton_batch(f, f_prime, [-1.6])
+    assert result['root'][0] == iterates[-1]
+    assert result['converged'][0]
+    assert result['n_iter'][0] == count - 1
+    assert result['nfev'][0] == count and result['njev'][0] == count - 1
+    assert (f.points, f_prime.points) == (count, count - 1)
+
+
+def test_bisection_batch_reproduces_the_scalar_iteration():
+    midpoints, count = bisection(hw1_function, -0.7, -0.4)
+    f = Counted(hw1_function)
+    result = bisection_batch(f, [-0.7], [-0.4])
+    assert result['root'][0] == midpoints[-1]
+    assert result['converged'][0]
+    assert result['n_iter'][0] == count
+    assert result['nfev'][0] == count + 1 == f.points
+
+
+def test_batches_solve_every_start_independently():
+    x0 = np.array([[-1.6, -0.5], [-0.6, 0.2]])
+    result = newton_batch(hw1_function, hw1_derivative, x0)
+    assert result['root'].shape == x0.shape
+    for start, root, n_iter in zip(x0.ravel(), result['root'].ravel(), result['n_iter'].ravel()):
+        iterates, count = newton_raphson(hw1_function, hw1_derivative, start)
+        assert root == iterates[-1] and n_iter == count - 1
+
+    left, right = [-0.7, -0.7, -3.5], [-0.4, -0.6, -2.5]
+    result = bisection_batch(hw1_function, left, right)
+    for a, b, root, nfev in zip(left, right, result['root'], result['nfev']):
+        midpoints, count = bisection(hw1_function, a, b)
+        assert root == midpoints[-1] and nfev == count + 1
+
+
+def test_bracketed_newton_stays_in_its_bracket():
+    left, right = sign_change_brackets(hw1_function, np.linspace(-10, 0, 41))
+    assert len(left) > 3
+    assert np.all(np.sign(hw1_function(left)) != np.sign(hw1_function(right)))
+
+    # Start every root at the left end, where plain Newton can jump to another root
+    result = newton_batch(hw1_function, hw1_derivative, left, tol=1e-10, bracket=(left, right))
+    assert np.all(result['converged'])
+    assert np.all((left <= result['root']) & (result['root'] <= right))
+    np.testing.assert_allclose(hw1_function(result['root']), 0, atol=1e-10)
+    bisect = bisection_batch(hw1_function, left, right, tol=1e-10)
+    np.testing.assert_allclose(result['root'], bisect['root'], atol=1e-8)
+    assert np.all(result['n_iter'] <= bisect['n_iter'])
+
+
+
+def test_bracket_without_a_sign_change_stops_unconverged():
+    f, f_prime = Counted(lambda x: x**2 - 4), Counted(lambda x: 2 * x)
+    result = newton_batch(f, f_prime, [0.5, 1.5], bracket=([0.0, 1.0], [1.0, 3.0]))
+    np.testing.assert_array_equal(result['converged'], [False, True])
+    assert result['n_iter'][0] == 0 and result['njev'][0] == 0
+    assert result['root'][0] == 0.5 and abs(result['root'][1] - 2) < 1e-6
+    np.testing.assert_array_equal(result['nfev'], [3, 3 + result['n_iter'][1]])
+
+def test_unbracketed_newton_stops_on_a_zero_derivative():
+    # x**2 + 1 has no real root; from 1 the first step lands on the zero of f'
+    result = newton_batch(lambda x: x**2 + 1, lambda x: 2 * x, [0.0, 1.0, 0.3], max_iter=50)
+    assert not result['converged'].any()
+    np.testing.assert_array_equal(result['n_iter'], [0, 1, 50])
+    np.testing.assert_array_equal(result['njev'], [1, 2, 50])
+    assert result['root'][1] == 0
+
+
+def test_sign_change_brackets():
+    left, right = sign_change_brackets(np.sin, np.linspace(0.5, 10, 20))
+    np.testing.assert_allclose(bisection_batch(np.sin, left, right, tol=1e-12)['root'],
+                               [np.pi, 2 * np.pi, 3 * np.pi], rtol=1e-10)
+    assert sign_change_brackets(np.exp, np.linspace(-1, 1, 5))[0].size == 0
+
+
+def test_hw1_derivative():
+    x = np.linspace(-3, 1, 9)
+    h = 1e-6
+    np.testing.assert_allclose(hw1_derivative(x), (hw1_function(x + h) - hw1_function(x - h)) / (2 * h),
+                               rtol=1e-6, atol=1e-8)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from hw581.schrodinger import fd_eigenmodes, symmetric_diagonals
+
+L = 4
+
+
+def baseline_modes(n_modes, x):
+    # The part B matrix of the original 581_hw3.py, solved densely
+    n = len(x)
+    dx = x[1] - x[0]
+    H = np.zeros((n - 2, n - 2))
+    for j in range(n - 2):
+        H[j, j] = -2 - dx**2 * x[j + 1]**2
+        if j < n - 3:
+            H[j + 1, j] = 1
+            H[j, j + 1] = 1
+    H[0, 0] += 4 / 3
+    H[0, 1] -= 1 / 3
+    H[-1, -1] += 4 / 3
+    H[-1, -2] -= 1 / 3
+
+    eigvals, eigvecs = np.linalg.eig(-H)
+    order = np.argsort(eigvals.real)[:n_modes]
+    V = eigvecs[:, order].real
+    phi = np.vstack([4 / 3 * V[0] - 1 / 3 * V[1], V, 4 / 3 * V[-1] - 1 / 3 * V[-2]])
+    phi /= np.sqrt(np.trapezoid(phi**2, x, axis=0))
+    return eigvals[order].real / dx**2, np.abs(phi)
+
+
+@pytest.fixture(scope='module')
+def x():
+    return np.arange(-L, L + 0.1, 0.1)
+
+
+@pytest.mark.parametrize('method', ['tridiagonal', 'shift-invert'])
+def test_fd_eigenmodes_match_a_dense_eigensolve(x, method):
+    expected_values, expected_functions = baseline_modes(5, x)
+    eigenvalues, eigenfunctions, x_out = fd_eigenmodes(5, L, x=x, method=method)
+    np.testing.assert_array_equal(x_out, x)
+    np.testing.assert_allclose(eigenvalues, expected_values, rtol=1e-10)
+    np.testing.assert_allclose(eigenfunctions, expected_functions, atol=1e-8)
+
+
+def test_symmetrised_matrix_has_the_same_spectrum(x):
+    d, e = symmetric_diagonals(x)
+    T = np.diag(d) + np.diag(e, 1) + np.diag(e, -1)
+    assert np.allclose(T, T.T)
+    dx = x[1] - x[0]
+    np.testing.assert_allclose(np.linalg.eigvalsh(T)[:5] / dx**2, baseline_modes(5, x)[0],
+                               rtol=1e-10)
+
+
+def test_shift_invert_finds_modes_near_sigma():
+    eigenvalues, _, _ = fd_eigenmodes(2, L, method='shift-invert', sigma=6.0)
+    np.testing.assert_allclose(eigenvalues, [5, 7], atol=0.1)
+
+
+def test_fine_grid_converges_to_odd_integers():
+    eigenvalues, _, _ = fd_eigenmodes(5, L=8, dx=1e-3)
+    np.testing.assert_allclose(eigenvalues, [1, 3, 5, 7, 9], atol=1e-5)
+    with pytest.raises(ValueError):
+        fd_eigenmodes(5, method='dense')
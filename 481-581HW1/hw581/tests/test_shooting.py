@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+from hw581.shooting import (CachedShot, find_eigenvalue, gamma_continuation, harmonic_eigenvalues,
+                            harmonic_residual, harmonic_shoot, harmonic_shoot_batch, hw3_rhs_c,
+                            hw3_variational_rhs, nonlinear_modes, nonlinear_modes_newton)
+
+L, K = 4, 1
+X = np.linspace(-L, L, 81)
+
+
+def shoot(epsilon, **options):
+    return odeint(harmonic_shoot, [1, np.sqrt(L**2 - epsilon)], X, args=(epsilon, K), **options)
+
+
+def boundary_residual(y, epsilon):
+    return y[-1, 1] + np.sqrt(L**2 - epsilon) * y[-1, 0]
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    # Part A exactly as in the original 581_hw3.py: step epsilon by d_epsilon
+    # and halve it on every overshoot
+    eigenvalues, eigenfunctions = [], []
+    epsilon_n = 0
+    for n in range(5):
+        epsilon, d_epsilon = epsilon_n, 0.2
+        for _ in range(1000):
+            y = shoot(epsilon)
+            residual = boundary_residual(y, epsilon)
+            if abs(residual) < 1e-6:
+                eigenvalues.append(epsilon)
+                break
+            if (-1)**n * residual > 0:
+                epsilon += d_epsilon
+            else:
+                epsilon -= d_epsilon / 2
+                d_epsilon /= 2
+        eigenfunctions.append(abs(y[:, 0]) / np.sqrt(np.trapezoid(y[:, 0]**2, X)))
+        epsilon_n = epsilon + 0.1
+    return np.array(eigenvalues), np.column_stack(eigenfunctions)
+
+
+def test_batch_shot_matches_odeint_for_every_epsilon():
+    epsilon = np.array([0.5, 1.0, 3.3, 7.0])
+    phi, dphi = harmonic_shoot_batch(epsilon, X, K, substeps=20)
+    assert phi.shape == (len(X), len(epsilon))
+    for j, e in enumerate(epsilon):
+        y = shoot(e, rtol=1e-12, atol=1e-12)
+        scale = np.max(np.abs(y))
+        np.testing.assert_allclose(phi[:, j], y[:, 0], atol=1e-6 * scale)
+        np.testing.assert_allclose(dphi[:, j], y[:, 1], atol=1e-6 * scale)
+
+
+def test_residual_is_the_end_of_the_batch_shot():
+    epsilon = np.linspace(0.1, 12, 7)
+    phi, dphi = harmonic_shoot_batch(epsilon, X, K)
+    expected = dphi[-1] + np.sqrt(L**2 - epsilon) * phi[-1]
+    np.testing.assert_allclose(harmonic_residual(epsilon, X, K), expected,
+                               rtol=1e-9, atol=1e-9 * np.max(np.abs(expected)))
+
+
+def test_batch_eigenvalues_match_the_baseline(baseline):
+    eigenvalues, eigenfunctions, x = harmonic_eigenvalues(5, L, K, X)
+    np.testing.assert_array_equal(x, X)
+    np.testing.assert_allclose(eigenvalues, baseline[0], atol=1e-6)
+    np.testing.assert_allclose(eigenfunctions, baseline[1], atol=1e-6)
+    np.testing.assert_allclose(eigenvalues, [1, 3, 5, 7, 9], atol=1e-2)
+
+
+def test_batch_eigenvalues_need_enough_room():
+    with pytest.raises(ValueError):
+        harmonic_eigenvalues(5, L=2)
+
+
+def test_cached_shot_integrates_each_epsilon_once():
+    calls = []
+
+    def counting_shoot(epsilon):
+        calls.append(epsilon)
+        return shoot(epsilon)
+
+    shots = CachedShot(counting_shoot, boundary_residual)
+    first = shots(1.5)
+    assert shots(1.5) == first and shots(np.float64(1.5)) == first
+    assert shots.n_shots == 1 and calls == [1.5]
+    assert shots.solution(1.5) is shots.solutions[1.5]
+
+
+def test_brent_eigenvalues_match_the_baseline(baseline):
+    shots = CachedShot(shoot, boundary_residual)
+    eigenvalues, eigenfunctions = [], []
+    epsilon = 0
+    for _ in range(5):
+        epsilon = find_eigenvalue(shots, epsilon, 0.2, max_step=1.0)
+        y = shots.solution(epsilon)
+        eigenvalues.append(epsilon)
+        eigenfunctions.append(abs(y[:, 0]) / np.sqrt(np.trapezoid(y[:, 0]**2, X)))
+        epsilon += 0.1
+    np.testing.assert_allclose(eigenvalues, baseline[0], atol=1e-6)
+    np.testing.assert_allclose(np.column_stack(eigenfunctions), baseline[1], atol=1e-6)
+    # the halving search of the original script takes 321 shots
+    assert shots.n_shots < 100
+
+
+def test_find_eigenvalue_without_a_sign_change():
+    with pytest.raises(RuntimeError):
+        find_eigenvalue(lambda e: 1 + e**2, 0, max_steps=10)
+    assert find_eigenvalue(lambda e: e - 2, 2.0) == 2.0
+
+
+def test_variational_rhs_carries_the_sensitivities():
+    y = np.array([0.3, -0.2, 0.5, 0.1, -0.4, 0.7])
+    x, epsilon, gamma, h = 0.4, 1.2, 0.05, 1e-6
+    rhs = np.array(hw3_variational_rhs(x, y, epsilon, gamma))
+    np.testing.assert_allclose(rhs[:2], hw3_rhs_c(x, y[:2], epsilon, gamma))
+
+    # directional derivatives of hw3_rhs_c along the sensitivities
+    def f(state, eps):
+        return np.array(hw3_rhs_c(x, state, eps, gamma))
+
+    d_eps = (f(y[:2] + h * y[2:4], epsilon + h) - f(y[:2] - h * y[2:4], epsilon - h)) / (2 * h)
+    d_A = (f(y[:2] + h * y[4:], epsilon) - f(y[:2] - h * y[4:], epsilon)) / (2 * h)
+    np.testing.assert_allclose(rhs[2:4], d_eps, rtol=1e-8)
+    np.testing.assert_allclose(rhs[4:], d_A, rtol=1e-8)
+
+
+@pytest.mark.parametrize('gamma', [0.05, -0.05])
+def test_newton_modes_match_the_nested_search(gamma):
+    eigenvalues, eigenfunctions, x = nonlinear_modes(gamma)
+    newton_values, newton_functions, newton_x, n_solves = nonlinear_modes_newton(
+        gamma, full_output=True)
+    np.testing.assert_array_equal(newton_x, x)
+    # both stop at tol = 1e-4 on the residuals, from different sides
+    np.testing.assert_allclose(newton_values, eigenvalues, atol=1e-3)
+    np.testing.assert_allclose(newton_functions, eigenfunctions, atol=1e-3)
+    assert np.all(n_solves <= 5)
+    np.testing.assert_allclose(np.trapezoid(newton_functions**2, x, axis=0), 1, atol=1e-4)
+
+
+def test_gamma_continuation_starts_each_solve_from_the_last():
+    eigenvalues, eigenfunctions, x, n_solves = gamma_continuation([0.05, 0.1])
+    assert eigenvalues.shape == (2, 2) and eigenfunctions.shape == (2, len(x), 2)
+    np.testing.assert_allclose(eigenvalues[0], nonlinear_modes_newton(0.05)[0])
+    np.testing.assert_allclose(eigenvalues[1], nonlinear_modes_newton(0.1)[0], atol=1e-4)
+    assert np.all(n_solves[1] <= n_solves[0])
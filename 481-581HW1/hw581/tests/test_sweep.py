@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from hw581.sweep import (BLAS_THREAD_VARS, SweepStore, nonlinear_mode_task, parameter_grid,
+                         run_sweep, vorticity_task)
+
+
+def square_task(params):
+    if params['x'] < 0:
+        raise ValueError("negative x")
+    return {'square': np.full(3, params['x']**2), 'threads': os.environ.get('OMP_NUM_THREADS')}
+
+
+def quiet(message):
+    pass
+
+
+def test_parameter_grid_is_the_cartesian_product():
+    grid = parameter_grid(a=[1, 2], b=['x', 'y', 'z'])
+    assert len(grid) == 6
+    assert grid[0] == {'a': 1, 'b': 'x'} and grid[-1] == {'a': 2, 'b': 'z'}
+
+
+def test_store_lookup_and_round_trip(tmp_path):
+    store = SweepStore()
+    store.add({'m': 64, 'ic': 'gaussian'}, {'w': np.arange(4.0), 'nfev': 12})
+    store.add({'m': 128, 'ic': 'gaussian'}, {'error': 'boom'}, 'error')
+    # Numbers compare by value
+    assert store.get(m=64.0, ic='gaussian')['nfev'] == 12
+    assert [p['m'] for p, _ in store.select(ic='gaussian')] == [64, 128]
+
+    store.save(tmp_path / 'sweep.npz')
+    loaded = SweepStore.load(tmp_path / 'sweep.npz')
+    assert len(loaded) == 2 and loaded.status == ['ok', 'error']
+    np.testing.assert_array_equal(loaded.get(m=64, ic='gaussian')['w'], np.arange(4.0))
+    assert loaded.get(m=128, ic='gaussian')['error'] == 'boom'
+
+
+def test_run_sweep_keeps_failures_and_restores_the_environment():
+    before = {var: os.environ.get(var) for var in BLAS_THREAD_VARS}
+    store = run_sweep(square_task, parameter_grid(x=[1, 2, -1]), max_workers=2, log=quiet)
+    assert {p['x']: s for p, s in zip(store.params, store.status)} == {1: 'ok', 2: 'ok', -1: 'error'}
+    np.testing.assert_array_equal(store.get(x=2)['square'], 4)
+    assert store.get(x=1)['threads'] == '1'
+    assert 'negative x' in store.get(x=-1)['error']
+    assert {var: os.environ.get(var) for var in BLAS_THREAD_VARS} == before
+
+
+@pytest.mark.parametrize('backend', ['spectral', 'direct'])
+def test_vorticity_task_samples_every_output(backend):
+    result = vorticity_task({'nu': 0.001, 'ic': 'gaussian', 'backend': backend, 'm': 16,
+                             't_end': 1, 'dt_out': 0.5})
+    assert result['success']
+    np.testing.assert_allclose(result['t'], [0, 0.5, 1])
+    assert result['w'].shape == (256, 3)
+
+
+def test_nonlinear_mode_solvers_agree():
+    shooting = nonlinear_mode_task({'gamma': 0.05})
+    newton = nonlinear_mode_task({'gamma': 0.05, 'solver': 'newton'})
+    np.testing.assert_allclose(newton['eigenvalues'], shooting['eigenvalues'], rtol=1e-3)
+    assert newton['n_solves'].sum() < 20
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from hw581.trajectory import TrajectoryStore, integrate_to_store
+
+
+def decay(t, y, rate):
+    return -rate * y
+
+
+@pytest.mark.parametrize('method', ['RK45', 'BDF'])
+def test_stream_matches_solve_ivp(tmp_path, method):
+    y0 = np.linspace(1, 2, 6)
+    t_eval = np.arange(0, 2.5, 0.5)
+    store = integrate_to_store(decay, t_eval, y0, tmp_path / 'run', method=method, args=(0.7,))
+    sol = solve_ivp(decay, (0, 2), y0, method=method, t_eval=t_eval, args=(0.7,))
+    assert store.meta['status'] == 0 and store.n_written == len(t_eval)
+    assert store.meta['nfev'] == sol.nfev
+    np.testing.assert_allclose(store.y, sol.y, rtol=1e-12, atol=1e-12)
+
+
+def test_reopened_store_is_memory_mapped(tmp_path):
+    path = tmp_path / 'field'
+    store = TrajectoryStore.create(path, [0, 1, 2], (4, 4), meta={'case': 'unit'})
+    for i in range(2):
+        store.write(i, np.full(16, i + 1.0))
+    store.flush()
+
+    reopened = TrajectoryStore.open(path)
+    assert isinstance(reopened.frames, np.memmap)
+    assert reopened.frames.shape == (3, 4, 4) and reopened.y.shape == (16, 3)
+    assert reopened.n_written == 2 and reopened.meta['user']['case'] == 'unit'
+    np.testing.assert_array_equal(reopened[1], 2.0)
+    np.testing.assert_array_equal(reopened.t, [0, 1, 2])
+
+
+def test_complex_states_keep_their_dtype(tmp_path):
+    y0 = np.array([1 + 1j, 2 - 1j])
+    store = integrate_to_store(decay, [0, 1], y0, tmp_path / 'complex', args=(1.0,))
+    assert np.iscomplexobj(store.frames)
+    np.testing.assert_allclose(store[1], y0 * np.exp(-1), rtol=1e-3)
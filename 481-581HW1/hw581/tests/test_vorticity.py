@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from hw581.vorticity import FDVorticity, grid, initial_vorticity
+
+M, L, NU = 16, 20, 0.001
+
+
+@pytest.fixture
+def w():
+    X, Y = grid(M, L)
+    return initial_vorticity('opposite', X, Y)
+
+
+def test_jac_is_the_frozen_psi_linearization(w):
+    vorticity = FDVorticity(M, L, NU)
+    vorticity.rhs(0, w)
+    psi = vorticity.psi
+    A, B, C = vorticity.A, vorticity.B, vorticity.C
+
+    def frozen(v):
+        return NU * (A @ v) - (B @ psi) * (C @ v) + (C @ psi) * (B @ v)
+
+    v = np.random.default_rng(0).standard_normal(w.size)
+    eps = 1e-6
+    difference = (frozen(w + eps * v) - frozen(w)) / eps
+    np.testing.assert_allclose(vorticity.jac(0, w) @ v, difference, rtol=1e-6, atol=1e-8)
+
+
+def test_jac_leaves_the_krylov_solver_alone(w):
+    vorticity = FDVorticity(M, L, NU, psi_solver='bicgstab', rtol=1e-10)
+    vorticity.rhs(0, w)
+    solver = vorticity.psi_solver
+    iterations, psi = list(solver.iterations), solver.psi.copy()
+    vorticity.jac(0, 2 * w)
+    assert solver.iterations == iterations
+    np.testing.assert_array_equal(solver.psi, psi)
+
+
+def test_jac_before_any_rhs_call(w):
+    fresh = FDVorticity(M, L, NU, psi_solver='bicgstab', rtol=1e-10)
+    J = fresh.jac(0, w)
+    assert fresh.psi_solver.iterations == []
+    primed = FDVorticity(M, L, NU)
+    primed.rhs(0, w)
+    assert abs(J - primed.jac(0, w)).max() < 1e-8
@@ -0,0 +1,117 @@
+"""On-disk trajectories written snapshot by snapshot.
+
+A trajectory is a directory holding ``frames.npy`` (shape ``(T, *state)``,
+one row per requested time, opened as a memory map) and ``meta.json`` (the
+times, how many frames are complete and any user metadata).  Integrating
+with :func:`integrate_to_store` writes each ``t_eval`` snapshot as soon as the
+solver passes it, so the full ``solve_ivp(...).y`` matrix is never held in
+RAM, and readers only page in the frames they touch.
+"""
+import json
+import os
+
+import numpy as np
+from scipy.integrate import BDF, DOP853, LSODA, RK23, RK45, Radau
+
+METHODS = {'RK23': RK23, 'RK45': RK45, 'DOP853': DOP853,
+           'Radau': Radau, 'BDF': BDF, 'LSODA': LSODA}
+
+
+class TrajectoryStore:
+    """Memory-mapped snapshots ``frames[i]`` at times ``t[i]``."""
+
+    def __init__(self, path, frames, t, meta):
+        self.path = path
+        self.frames = frames
+        self.t = t
+        self.meta = meta
+
+    @classmethod
+    def create(cls, path, t, state_shape, dtype=float, meta=None):
+        os.makedirs(path, exist_ok=True)
+        t = np.asarray(t, dtype=float)
+        frames = np.lib.format.open_memmap(os.path.join(path, 'frames.npy'), mode='w+',
+                                           dtype=dtype, shape=(len(t),) + tuple(state_shape))
+        store = cls(path, frames, t, {'t': t.tolist(), 'n_written': 0, 'user': meta or {}})
+        store._write_meta()
+        return store
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        frames = np.load(os.path.join(path, 'frames.npy'), mmap_mode=mode)
+        return cls(path, frames, np.array(meta['t']), meta)
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f, indent=1, default=str)
+
+    def write(self, i, y):
+        self.frames[i] = np.reshape(y, self.frames.shape[1:])
+        self.meta['n_written'] = max(self.meta['n_written'], i + 1)
+
+    def flush(self):
+        self.frames.flush()
+        self._write_meta()
+
+    def __len__(self):
+        return len(self.t)
+
+    def __getitem__(self, i):
+        return self.frames[i]
+
+    @property
+    def n_written(self):
+        return self.meta['n_written']
+
+    @property
+    def y(self):
+        """Flattened frames as columns, the layout of ``solve_ivp(...).y`` (a view)."""
+        return self.frames.reshape(len(self.t), -1).T
+
+
+def integrate_to_store(fun, t_eval, y0, path, method='RK45', args=(), meta=None,
+                       flush_every=1, **options):
+    """Integrate like ``solve_ivp`` but stream the ``t_eval`` snapshots to ``path``.
+
+    The solver is stepped directly; whenever a step passes one or more output
+    times they are filled from its dense output and written to the memory
+    map.  ``options`` (``rtol``, ``atol``, ``max_step``, ``jac``...) go to the
+    ``scipy.integrate`` solver class.  Returns the :class:`TrajectoryStore`,
+    with ``meta['nfev']``, ``meta['status']`` and ``meta['message']`` set.
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    y0 = np.asarray(y0)
+    if args:
+        def rhs(t, y, fun=fun):
+            return fun(t, y, *args)
+    else:
+        rhs = fun
+
+    dtype = np.result_type(y0.dtype, float)
+    store = TrajectoryStore.create(path, t_eval, y0.shape, dtype,
+                                   dict(meta or {}, method=method, options=options))
+    solver = METHODS[method](rhs, t_eval[0], y0.astype(dtype), t_eval[-1], **options)
+
+    store.write(0, y0)
+    next_out = 1
+    status = None
+    while status is None:
+        message = solver.step()
+        if solver.status == 'failed':
+            status = -1
+        elif solver.status == 'finished':
+            status = 0
+        if next_out < len(t_eval) and solver.t >= t_eval[next_out]:
+            dense = solver.dense_output()
+            while next_out < len(t_eval) and t_eval[next_out] <= solver.t:
+                store.write(next_out, dense(t_eval[next_out]))
+                next_out += 1
+                if next_out % flush_every == 0:
+                    store.flush()
+
+    store.meta.update(nfev=solver.nfev, njev=solver.njev, nlu=solver.nlu,
+                      status=status, message=message or 'The solver successfully reached the end.')
+    store.flush()
+    return store
@@ -0,0 +1,101 @@
+"""Finite-difference vorticity RHS with a pluggable streamfunction solver."""
+import numpy as np
+from scipy.fft import fft2, ifft2
+from scipy.sparse import diags
+
+from hw581.operators import PeriodicStencil, periodic_fd_matrices
+from hw581.poisson import make_psi_solver, poisson_factor
+
+
+def spc_rhs(t, w, nx, ny, K, nu, A, B, C):
+    """``spc_rhs`` of 581_hw5.py with ``A``, ``B``, ``C`` passed in instead of read as globals."""
+    wt = fft2(w.reshape((nx, ny)))
+    psi = np.real(ifft2(-wt / K)).flatten()
+    return nu * (A @ w) - (B @ psi) * (C @ w) + (C @ psi) * (B @ w)
+
+
+class FDVorticity:
+    """``nu * A w - (B psi) * (C w) + (C psi) * (B w)`` on an m x m periodic grid.
+
+    This is ``spc_rhs`` from 581_hw5.py with the operators built by
+    :mod:`hw581.operators` (``operators='csr'`` or ``'stencil'``) and ``psi``
+    from :func:`hw581.poisson.make_psi_solver`.
+    """
+
+    def __init__(self, m, L, nu, psi_solver='direct', operators='csr', **solver_options):
+        self.m = m
+        self.L = L
+        self.nu = nu
+        if operators == 'stencil':
+            stencil = PeriodicStencil(m, L)
+            self.A, self.B, self.C = stencil.A, stencil.B, stencil.C
+        else:
+            self.A, self.B, self.C = periodic_fd_matrices(m, L)
+        self.psi_solver = make_psi_solver(psi_solver, m, L, A=self.A, **solver_options)
+        self._matrices = None
+        self.psi = None
+
+    def rhs(self, t, w):
+        A, B, C = self.A, self.B, self.C
+        psi = self.psi_solver.solve(w)
+        self.psi = psi
+        return self.nu * (A @ w) - (B @ psi) * (C @ w) + (C @ psi) * (B @ w)
+
+    __call__ = rhs
+
+    def _sparse_operators(self):
+        # The stencil mode has no matrices to scale, build them once here
+        if self._matrices is None:
+            if hasattr(self.A, 'tocsr'):
+                self._matrices = (self.A, self.B, self.C)
+            else:
+                self._matrices = periodic_fd_matrices(self.m, self.L)
+        return self._matrices
+
+    def jac(self, t, w):
+        """Sparse Jacobian with ``psi`` frozen: ``nu A - diag(B psi) C + diag(C psi) B``.
+
+        The exact Jacobian also has ``diag(B w) C A^-1 - diag(C w) B A^-1``
+        through the streamfunction, which is dense.  Implicit solvers only
+        need the Jacobian for their Newton iterations, so this 5-point
+        approximation is enough for ``solve_ivp(..., method='BDF', jac=rhs.jac)``
+        and its LU stays sparse.  ``psi`` is the one from the last :meth:`rhs`
+        call, so the streamfunction solver (its warm start and iteration
+        counts) is left alone; before any RHS call it comes from the cached LU.
+        """
+        A, B, C = self._sparse_operators()
+        psi = self.psi if self.psi is not None else poisson_factor(self.m, self.L).solve(w)
+        return (self.nu * A - diags(B @ psi) @ C + diags(C @ psi) @ B).tocsc()
+
+
+def grid(m, L):
+    x = np.linspace(-L / 2, L / 2, m + 1)[:m]
+    return np.meshgrid(x, x)
+
+
+def initial_vorticity(name, X, Y, seed=50):
+    """The HW 5 initial conditions, flattened.
+
+    ``'gaussian'`` is part A; ``'opposite'``, ``'same'``, ``'pairs'`` and
+    ``'random'`` are w1..w4 of the part C/D notebook (``seed`` only matters
+    for ``'random'``).
+    """
+    if name == 'gaussian':
+        w = np.exp(-X**2 - Y**2 / 20)
+    elif name == 'opposite':
+        w = np.exp(-(X - 5)**2 - Y**2 / 10) - np.exp(-(X + 5)**2 - Y**2 / 10)
+    elif name == 'same':
+        w = np.exp(-(X - 5)**2 - Y**2 / 10) + np.exp(-(X + 5)**2 - Y**2 / 10)
+    elif name == 'pairs':
+        w = (np.exp(-((X - 3)**2 + (Y - 3)**2) / 4) - np.exp(-((X + 3)**2 + (Y - 3)**2) / 4)
+             - np.exp(-((X - 3)**2 + (Y + 3)**2) / 4) + np.exp(-((X + 3)**2 + (Y + 3)**2) / 4))
+    elif name == 'random':
+        rng = np.random.RandomState(seed)
+        w = np.zeros_like(X)
+        for _ in range(12):
+            x0, y0 = rng.uniform(-6, 6, size=2)
+            strength = rng.choice([1, -1]) * rng.uniform(1, 3)
+            w += strength * np.exp(-((X - x0)**2 + (Y - y0)**2) / 4)
+    else:
+        raise ValueError(f"unknown initial condition {name!r}")
+    return w.flatten()